@@ -0,0 +1,201 @@
+"""
+ANN Index - Inverted-file (IVF) approximate nearest-neighbour search in pure NumPy
+Normalized vectors are clustered with spherical k-means; a query scores the n_probe
+closest centroids' lists only. n_lists / n_probe trade recall for latency, vectors can
+be inserted after training, and the whole index persists to a single .npz file.
+Corpora smaller than exact_threshold are scanned exactly. Section-filtered searches probe
+extra lists (closest first) until the probed lists hold top_k rows of those sections.
+"""
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from tech_embeddings import l2_normalize
+from vector_index import SearchHit
+
+IVF_N_PROBE = int(os.getenv("IVF_N_PROBE", "8"))
+IVF_EXACT_THRESHOLD = int(os.getenv("IVF_EXACT_THRESHOLD", "2048"))
+KMEANS_ITERATIONS = 15
+KMEANS_MAX_TRAINING_POINTS = 256  # per list
+
+
+def default_n_lists(n_items: int) -> int:
+    """~sqrt(n) lists, the usual IVF starting point"""
+    return max(1, int(round(np.sqrt(max(n_items, 1)))))
+
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Unit-norm centroids maximizing cosine to their members (empty lists are re-seeded)"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > n_lists * KMEANS_MAX_TRAINING_POINTS:
+        vectors = vectors[rng.choice(len(vectors), n_lists * KMEANS_MAX_TRAINING_POINTS, replace=False)]
+    n_lists = min(n_lists, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=n_lists)
+        empty = np.flatnonzero(counts == 0)
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = l2_normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Approximate cosine search with the VectorIndex search_batch interface"""
+
+    def __init__(self, dim: int, n_lists: Optional[int] = None, n_probe: int = IVF_N_PROBE,
+                 exact_threshold: int = IVF_EXACT_THRESHOLD, seed: int = 0):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.exact_threshold = exact_threshold
+        self.seed = seed
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.sections: List[str] = []
+        self.section_codes = np.zeros(0, dtype=np.int32)
+        self._section_code: Dict[str, int] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._lists: List[np.ndarray] = []  # row ids per list
+        self._list_vectors: List[np.ndarray] = []  # contiguous copy of those rows
+        self._section_counts = np.zeros((0, 0), dtype=np.int64)  # rows per (list, section code)
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, sections: List[str], **params) -> "IVFIndex":
+        """Index embeddings[i] (belonging to sections[i]) and train the lists"""
+        index = cls(np.asarray(embeddings).shape[1], **params)
+        index.add(embeddings, sections, retrain=True)
+        return index
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
+
+    def _codes(self, sections: List[str]) -> np.ndarray:
+        return np.asarray([self._section_code.setdefault(name, len(self._section_code)) for name in sections], dtype=np.int32)
+
+    def add(self, embeddings: np.ndarray, sections: List[str], retrain: bool = False):
+        """Insert vectors (row ids continue from len(self)); trains on first use or when asked"""
+        vectors = l2_normalize(np.atleast_2d(embeddings))
+        if len(vectors) != len(sections):
+            raise ValueError(f"Expected one section per vector, got {len(sections)} for {len(vectors)}")
+        start = len(self)
+        self.vectors = np.ascontiguousarray(np.vstack([self.vectors, vectors]))
+        self.sections.extend(sections)
+        self.section_codes = np.concatenate([self.section_codes, self._codes(sections)])
+
+        if retrain or self.centroids is None:
+            self.train()
+            return
+        new_assignments = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+        self.assignments = np.concatenate([self.assignments, new_assignments])
+        for list_id in np.unique(new_assignments):
+            rows = start + np.flatnonzero(new_assignments == list_id)
+            self._lists[list_id] = np.concatenate([self._lists[list_id], rows])
+            self._list_vectors[list_id] = np.ascontiguousarray(np.vstack([self._list_vectors[list_id], self.vectors[rows]]))
+        self._count_sections()
+
+    def train(self):
+        """(Re)cluster every stored vector and rebuild the inverted lists"""
+        if len(self) == 0:
+            return
+        n_lists = self.n_lists or default_n_lists(len(self))
+        self.centroids = spherical_kmeans(self.vectors, n_lists, seed=self.seed)
+        self.assignments = np.argmax(self.vectors @ self.centroids.T, axis=1).astype(np.int32)
+        self._rebuild_lists()
+
+    def _rebuild_lists(self):
+        order = np.argsort(self.assignments, kind="stable")
+        bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        self._list_vectors = [np.ascontiguousarray(self.vectors[rows]) for rows in self._lists]
+        self._count_sections()
+
+    def _count_sections(self):
+        """Rows per (list, section), so a filtered search knows how many lists it has to probe"""
+        counts = np.zeros((len(self.centroids), len(self._section_code)), dtype=np.int64)
+        np.add.at(counts, (self.assignments, self.section_codes), 1)
+        self._section_counts = counts
+
+    def _candidates(self, query: np.ndarray, n_probe: int, wanted: Optional[np.ndarray] = None, top_k: int = 0):
+        """Row ids + vectors of the n_probe lists closest to the query; with wanted section codes,
+        more lists (next closest first) until they hold top_k rows of those sections"""
+        if self.centroids is None or len(self) <= self.exact_threshold or n_probe >= len(self.centroids):
+            return np.arange(len(self)), self.vectors
+        if wanted is None:
+            probe = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        else:
+            order = np.argsort(-(self.centroids @ query), kind="stable")
+            in_sections = np.cumsum(self._section_counts[order][:, wanted].sum(axis=1))
+            needed = int(np.searchsorted(in_sections, min(top_k, in_sections[-1]))) + 1
+            probe = order[:max(n_probe, needed)]
+        return (np.concatenate([self._lists[i] for i in probe]),
+                np.concatenate([self._list_vectors[i] for i in probe]))
+
+    def search(self, query: np.ndarray, top_k: int = 10, min_score: float = 0.3,
+               sections: Optional[Iterable[str]] = None, n_probe: Optional[int] = None) -> List[SearchHit]:
+        return self.search_batch(np.asarray(query)[None, :], top_k, min_score, sections, n_probe)[0]
+
+    def search_batch(self, queries: np.ndarray, top_k: int = 10, min_score: float = 0.3,
+                     sections: Optional[Iterable[str]] = None, n_probe: Optional[int] = None) -> List[List[SearchHit]]:
+        """Approximate top-k rows per query, best first (same contract as VectorIndex.search_batch)"""
+        queries = l2_normalize(np.atleast_2d(queries))
+        n_probe = max(1, n_probe or self.n_probe)
+        wanted = None
+        if sections:
+            wanted = np.asarray([self._section_code[name] for name in set(sections) if name in self._section_code], dtype=np.int32)
+        results = []
+        for query in queries:
+            if top_k <= 0 or len(self) == 0 or (wanted is not None and len(wanted) == 0):
+                results.append([])
+                continue
+            rows, vectors = self._candidates(query, n_probe, wanted, top_k)
+            if wanted is not None:
+                keep = np.isin(self.section_codes[rows], wanted)
+                rows, vectors = rows[keep], vectors[keep]
+            if len(rows) == 0:
+                results.append([])
+                continue
+            scores = vectors @ query
+            k = min(top_k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.lexsort((rows[top], -scores[top]))]
+            results.append([(int(rows[i]), float(scores[i])) for i in top if scores[i] >= min_score])
+        return results
+
+    def save(self, path: str):
+        """Persist vectors, sections, centroids and assignments (temp file + rename)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f, vectors=self.vectors, sections=np.asarray(self.sections, dtype=str),
+                    centroids=self.centroids if self.centroids is not None else np.zeros((0, self.dim), dtype=np.float32),
+                    assignments=self.assignments,
+                    params=np.asarray([self.n_lists or 0, self.n_probe, self.exact_threshold, self.seed], dtype=np.int64),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        """Index saved by save() - no re-clustering"""
+        with np.load(path) as data:
+            n_lists, n_probe, exact_threshold, seed = (int(value) for value in data["params"])
+            index = cls(data["vectors"].shape[1], n_lists or None, n_probe, exact_threshold, seed)
+            index.vectors = np.ascontiguousarray(data["vectors"], dtype=np.float32)
+            index.sections = [str(name) for name in data["sections"]]
+            index.section_codes = index._codes(index.sections)
+            if len(data["centroids"]):
+                index.centroids = data["centroids"]
+                index.assignments = data["assignments"].astype(np.int32)
+                index._rebuild_lists()
+        return index
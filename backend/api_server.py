@@ -3,7 +3,7 @@ import os
 import tempfile
 import numpy as np
 import soundfile as sf
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 import uvicorn
@@ -11,6 +11,7 @@ from pydantic import BaseModel
 import uuid
 import time
 import re
+import json
 import asyncio
 
 # Import your existing components
@@ -18,34 +19,26 @@ import asyncio
 from audio_cleanup import init_cleanup_service, cleanup_audio_file, mark_audio_active, mark_audio_inactive
 from transcribe_service import transcribe_audio
 from llm_service import ConversationManager
+from llm_gateway import close_llm_gateway
+from session_store import SessionStore
+from rate_limiter import rate_limiter, rate_limit_keys, client_ip, LLMBudgetExceeded
 from tts_service import generate_speech_async  # Use the async version directly
-from resume_query_processor import ResumeQueryProcessor
+from resume_query_processor import get_query_processor, reload_query_processor
+from diversity import get_diversity_selector, select_diverse_items
 
 # Import new database services
 from guestbook_api import router as guestbook_router
 from ai_session_logger import start_ai_session, log_ai_interaction, get_ai_session_stats, end_ai_session, ai_logger
 from database_service import db_service
+from model_registry import get_model_stats
+from embedding_service import get_query_embedding_cache
+from embedding_batcher import enable_embedding_batching, disable_embedding_batching, get_batcher_stats
 
 app = FastAPI(title="AI Assistant API")
 
 # Include guestbook router
 app.include_router(guestbook_router, prefix="/api", tags=["guestbook"])
 
-# Enable CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",  # Development
-        "https://localhost:3000",
-        "https://*.vercel.app",   # Your Vercel frontend
-        "https://vercel.app",
-        "*"  # Fallback - you can remove this once you know your exact Vercel URL
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 # Initialize audio cleanup service
 @app.on_event("startup")
 async def startup_event():
@@ -60,9 +53,35 @@ async def startup_event():
         print(f"🔍 AI logger current session: {ai_logger.current_session_id}")
     except Exception as e:
         print(f"⚠️ AI session logging not available: {e}")
+    
+    session_store.start_background_reaper()
+    print("🗂️ Session reaper started")
+    
+    # Build the shared query engine once, before the first request needs it
+    processor = get_query_processor()
+    print("🧠 Resume query engine ready")
+    
+    # Item vectors + similarity matrix for MMR card selection (reuses the RAG embedding cache)
+    get_diversity_selector(processor)
+    print("🎴 Diversity selector ready")
+    
+    # Embeddings requested from worker threads are micro-batched on this loop
+    enable_embedding_batching()
+    print("📦 Embedding micro-batching enabled")
 
-# Store conversations by session ID
-conversations = {}
+@app.on_event("shutdown")
+async def shutdown_event():
+    session_store.stop_background_reaper()
+    await disable_embedding_batching()
+    
+    # Release pooled LLM connections
+    try:
+        await close_llm_gateway()
+    except Exception as e:
+        print(f"⚠️ Failed to close LLM gateway: {e}")
+
+# Store conversations by session ID (idle TTL + LRU under entry/byte budget)
+session_store = SessionStore(ConversationManager)
 
 class TextRequest(BaseModel):
     text: str
@@ -83,8 +102,7 @@ async def root():
 @app.post("/session/create")
 async def create_session():
     """Create a new conversation session"""
-    session_id = str(uuid.uuid4())
-    conversations[session_id] = ConversationManager()
+    session_id, _ = session_store.create()
     
     # Create session in database for AI interaction logging
     try:
@@ -127,26 +145,20 @@ async def test_transcribe(audio_file: UploadFile = File(...)):
 async def test_llm(request: TextRequest):
     """Test LLM with a text prompt - returns structured response"""
     # Use existing session or create a new one
-    session_id = request.session_id
-    if not session_id or session_id not in conversations:
-        session_id = str(uuid.uuid4())
-        conversations[session_id] = ConversationManager()
-    
-    conversation = conversations[session_id]
+    session_id, conversation = session_store.get_or_create(request.session_id, keep_unknown_id=False)
     
     # Process with LLM using structured response with conversation context
     start_time = time.time()
     try:
-        structured_response = conversation.generate_structured_response(
+        structured_response = await conversation.generate_structured_response_async(
             request.text, 
             conversation_history=request.conversation_history
         )
         processing_time = time.time() - start_time
     except Exception as e:
         print(f"⚠️  LLM failed: {e}")
-        # Fallback to basic NLP processor
-        processor = ResumeQueryProcessor()
-        result = processor.query(request.text)
+        # Fallback to basic NLP processor (in a worker thread: its embeddings go through the micro-batcher)
+        result = await asyncio.to_thread(get_query_processor().query, request.text)
         
         # Format result to match expected structure
         fallback_text = "LLM is busy right now, but I was smart while designing this, so here you go:"
@@ -174,10 +186,88 @@ async def test_llm(request: TextRequest):
         "processing_time_ms": round(processing_time * 1000, 2)
     }
 
-# Store for tracking user requests and background tasks
-user_request_counts = {}
+# Store for background tasks
 background_tasks = {}
 
+# Rate-limited routes and the budget each one draws from
+RATE_LIMITED_ROUTES = {
+    "/smart/query": "text",
+    "/process": "voice",
+    "/test/transcribe": "voice",  # Voice mode in the frontend transcribes here first
+}
+
+RATE_LIMIT_MESSAGE = "Hey there! 👋 This is a completely free product and I want to keep it that way, so let's not exhaust my LLM credits please 😅 If you like what you see, check out my resume and let's connect! You can find my contact info in the header."
+
+@app.middleware("http")
+async def rate_limit_middleware(request: Request, call_next):
+    """Token-bucket limits per IP / user / session, checked before the endpoint runs"""
+    budget = RATE_LIMITED_ROUTES.get(request.url.path)
+    if budget is None or request.method != "POST":
+        return await call_next(request)
+    
+    user_id = request.headers.get("x-user-id")
+    session_id = request.headers.get("x-session-id")
+    if budget == "text" and not user_id:
+        # The frontend sends its ids in the JSON body
+        try:
+            body = json.loads(await request.body() or b"{}")
+            user_id = body.get("user_id")
+            session_id = session_id or body.get("session_id")
+        except (ValueError, AttributeError):
+            pass
+    
+    result = rate_limiter.check(budget, rate_limit_keys(client_ip(request), user_id, session_id))
+    if result.allowed:
+        return await call_next(request)
+    
+    print(f"🚫 Rate limited {result.limited_key} on '{budget}' budget (retry in {result.retry_after_s:.0f}s)")
+    headers = {"Retry-After": str(max(1, int(result.retry_after_s + 0.5)))}
+    if budget == "text":
+        # Keep the normal response shape - the frontend renders item_type "rate_limit" specially
+        return JSONResponse(
+            status_code=200,
+            headers=headers,
+            content={
+                "session_id": session_id or str(uuid.uuid4()),
+                "response": RATE_LIMIT_MESSAGE,
+                "items": [],
+                "item_type": "rate_limit",
+                "metadata": {
+                    "rate_limited": True,
+                    "budget": budget,
+                    "retry_after_s": result.retry_after_s,
+                    "message": "Rate limit reached - please view resume and connect!"
+                },
+                "processing_time_ms": 0,
+                "user_id": user_id,
+                "llm_enhancement": None
+            }
+        )
+    return JSONResponse(
+        status_code=429,
+        headers=headers,
+        content={
+            "status": "error",
+            "message": "Too many voice requests - please slow down a little",
+            "retry_after_s": result.retry_after_s
+        }
+    )
+
+# Enable CORS (added after rate_limit_middleware so it is the outer layer and 429s carry CORS headers too)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[
+        "http://localhost:3000",  # Development
+        "https://localhost:3000",
+        "https://*.vercel.app",   # Your Vercel frontend
+        "https://vercel.app",
+        "*"  # Fallback - you can remove this once you know your exact Vercel URL
+    ],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 class SmartRequest(BaseModel):
     text: str
     session_id: str = None
@@ -185,34 +275,19 @@ class SmartRequest(BaseModel):
     user_id: str = None  # For rate limiting
 
 @app.post("/smart/query")
-async def smart_query(request: SmartRequest):
+async def smart_query(request: SmartRequest, http_request: Request = None):
     """Smart query with immediate NLP response and optional background LLM enhancement"""
     start_time = time.time()
     
-    # Generate user_id for rate limiting if not provided
+    # Request rate is limited by rate_limit_middleware; user_id is just echoed back
     user_id = request.user_id or str(uuid.uuid4())
     
-    # Track request count for rate limiting
-    if user_id not in user_request_counts:
-        user_request_counts[user_id] = 0
-    user_request_counts[user_id] += 1
-    
-    # Check if user exceeded rate limit (3 requests)
-    if user_request_counts[user_id] > 3:
-        return {
-            "session_id": request.session_id or str(uuid.uuid4()),
-            "response": "Hey there! 👋 This is a completely free product and I want to keep it that way, so let's not exhaust my LLM credits please 😅 If you like what you see, check out my resume and let's connect! You can find my contact info in the header.",
-            "items": [],
-            "item_type": "rate_limit",
-            "metadata": {
-                "rate_limited": True,
-                "request_count": user_request_counts[user_id],
-                "message": "Rate limit reached - please view resume and connect!"
-            },
-            "processing_time_ms": round((time.time() - start_time) * 1000, 2),
-            "user_id": user_id,
-            "llm_enhancement": None
-        }
+    # LLM token spend has its own budget per caller
+    llm_keys = rate_limit_keys(
+        client_ip(http_request) if http_request is not None else None,
+        request.user_id,
+        request.session_id
+    )
     
     # For first 2 queries: Try LLM with 5-second timeout (premium experience)
     # For subsequent queries: Immediate NLP + background enhancement (fast experience)
@@ -221,39 +296,12 @@ async def smart_query(request: SmartRequest):
     
     # NEW ARCHITECTURE: NLP First (cards), LLM Second (response text only)
     # Step 1: NLP gets cards FAST
-    processor = ResumeQueryProcessor()
+    processor = get_query_processor()
     print(f"🔍 API DEBUG - Query: '{request.text}', Conversation history length: {len(request.conversation_history) if request.conversation_history else 0}")
     if request.conversation_history:
         print(f"🔍 API DEBUG - Last conversation entry: {request.conversation_history[-1] if request.conversation_history else 'None'}")
-    nlp_result = processor.query(request.text, conversation_history=request.conversation_history)
-    
-    # Apply basic intelligent selection to limit results (similar to LLM service)
-    def _select_diverse_items(items: list, max_items: int) -> list:
-        """Select diverse items across different content types and categories"""
-        if len(items) <= max_items:
-            return items
-        
-        # Group items by content source (projects, experience, publications)
-        grouped = {}
-        for item in items:
-            source = item.get("content_source", "unknown")
-            if source not in grouped:
-                grouped[source] = []
-            grouped[source].append(item)
-        
-        # Select items with diversity
-        selected = []
-        content_types = list(grouped.keys())
-        
-        # Round-robin selection across content types
-        while len(selected) < max_items and any(grouped.values()):
-            for content_type in content_types:
-                if len(selected) >= max_items:
-                    break
-                if grouped[content_type]:
-                    selected.append(grouped[content_type].pop(0))
-        
-        return selected
+    # Off the event loop: other requests keep being served and query embeddings get micro-batched
+    nlp_result = await asyncio.to_thread(processor.query, request.text, conversation_history=request.conversation_history)
     
     # Ensure all items have content_source set (fix diversity issue)
     for item in nlp_result.items:
@@ -275,7 +323,7 @@ async def smart_query(request: SmartRequest):
     # Limit fast NLP results to 4 items maximum with diversity
     max_fast_items = 4
     if len(nlp_result.items) > max_fast_items:
-        selected_items = _select_diverse_items(nlp_result.items, max_fast_items)
+        selected_items = select_diverse_items(nlp_result.items, max_fast_items, processor)
         print(f"🎯 Fast NLP: Limited {len(nlp_result.items)} items to {len(selected_items)} diverse items")
     else:
         selected_items = nlp_result.items
@@ -285,12 +333,13 @@ async def smart_query(request: SmartRequest):
     llm_generated = False
     
     try:
-        print(f"🎯 Calling LLM for quirky response (Query {user_request_counts[user_id]})")
+        llm_budget = rate_limiter.peek("llm_tokens", llm_keys)
+        if not llm_budget.allowed:
+            raise LLMBudgetExceeded(f"rate_limit: LLM token budget spent, retry in {llm_budget.retry_after_s:.0f}s")
+        print(f"🎯 Calling LLM for quirky response ({llm_budget.remaining:.0f} LLM tokens left)")
         
         # Use existing session or create new one
-        if session_id not in conversations:
-            conversations[session_id] = ConversationManager()
-        conversation = conversations[session_id]
+        _, conversation = session_store.get_or_create(session_id)
         
         # Build MINIMAL context for LLM (no resume data, just query context)
         llm_context = {
@@ -357,20 +406,10 @@ CRITICAL: Generate a SHORT, QUIRKY response (max 30 words).
 - Mention specific project/company names when relevant."""
         
         # Call LLM with short timeout (it's just generating one sentence!)
-        async def get_llm_response():
-            # Simple completion call (not the full structured response)
-            response = conversation.client.chat.completions.create(
-                model=conversation.model,
-                messages=[
-                    {"role": "system", "content": conversation.system_prompt},
-                    {"role": "user", "content": llm_prompt}
-                ],
-                temperature=0.9,  # Higher temp for more creativity
-                max_tokens=100  # Just one sentence!
-            )
-            return response.choices[0].message.content.strip()
-        
-        llm_response_text = await asyncio.wait_for(get_llm_response(), timeout=5.0)
+        # The gateway is async, so the timeout really cancels the request
+        llm_reply = await conversation.generate_quirky_line(llm_prompt, timeout=5.0)
+        llm_response_text = llm_reply.text
+        rate_limiter.charge("llm_tokens", llm_keys, llm_reply.tokens_used or 0)
         llm_generated = True
         print(f"✅ LLM response: {llm_response_text}")
         
@@ -381,7 +420,7 @@ CRITICAL: Generate a SHORT, QUIRKY response (max 30 words).
                 prompt=request.text,
                 response=llm_response_text,
                 model_used="gpt-4",
-                tokens_used=None,
+                tokens_used=llm_reply.tokens_used,
                 session_id=session_id
             )
             print(f"🔍 AI interaction logging result: {log_result}")
@@ -529,7 +568,6 @@ CRITICAL: Generate a SHORT, QUIRKY response (max 30 words).
             "item_type": nlp_result.item_type,  # Add item_type to metadata for follow-ups!
             "llm_generated": llm_generated,  # Track if LLM was used
             "nlp_cards": True,  # Cards always from NLP
-            "request_count": user_request_counts[user_id],
             "intelligent_selection_applied": len(selected_items) < len(nlp_result.items) if nlp_result.items else False
         },
         "processing_time_ms": round((time.time() - start_time) * 1000, 2),
@@ -544,10 +582,7 @@ async def enhance_with_llm(task_id: str, request: SmartRequest, session_id: str)
     """Background task to enhance response with LLM"""
     try:
         # Use existing session or create a new one
-        if session_id not in conversations:
-            conversations[session_id] = ConversationManager()
-        
-        conversation = conversations[session_id]
+        _, conversation = session_store.get_or_create(session_id)
         
         # Try LLM with timeout
         try:
@@ -625,17 +660,12 @@ async def test_llm_stream(request: TextRequest):
     from fastapi.responses import StreamingResponse
     
     # Use existing session or create a new one
-    session_id = request.session_id
-    if not session_id or session_id not in conversations:
-        session_id = str(uuid.uuid4())
-        conversations[session_id] = ConversationManager()
-    
-    conversation = conversations[session_id]
+    session_id, conversation = session_store.get_or_create(request.session_id, keep_unknown_id=False)
     conversation.add_user_message(request.text)
     
     async def stream_generator():
         buffer = ""
-        for token in conversation.stream_response():
+        async for token in conversation.stream_response_async():
             buffer += token
             yield f"data: {token}\n\n"
     
@@ -673,15 +703,13 @@ async def process_audio(
     print(f"Processing audio file: {audio_file.filename}, size: {audio_file.size if hasattr(audio_file, 'size') else 'unknown'}")
     
     # Use existing session or create a new one
-    if not session_id or session_id not in conversations:
-        session_id = str(uuid.uuid4())
-        conversations[session_id] = ConversationManager()
+    conversation = session_store.get(session_id)
+    if conversation is None:
+        session_id, conversation = session_store.create()
         print(f"Created new session: {session_id}")
     else:
         print(f"Using existing session: {session_id}")
     
-    conversation = conversations[session_id]
-    
     # Create a temporary file
     with tempfile.NamedTemporaryFile(delete=True, suffix=".wav") as temp_file:
         # Save uploaded file
@@ -898,6 +926,20 @@ async def mark_inactive_after_delay(filename: str, delay_seconds: int):
     await asyncio.sleep(delay_seconds)
     mark_audio_inactive(filename)
 
+@app.post("/admin/reload-index")
+async def reload_index(x_admin_key: str = Header(None)):
+    """Rebuild the shared resume query engine from resume_data.json without a restart"""
+    admin_key = os.getenv("ADMIN_API_KEY")
+    if not admin_key or x_admin_key != admin_key:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    
+    start_time = time.time()
+    await asyncio.to_thread(reload_query_processor)
+    return {
+        "status": "reloaded",
+        "reload_time_ms": round((time.time() - start_time) * 1000, 2)
+    }
+
 # AI Session Management Endpoints
 @app.get("/api/session/stats")
 async def get_session_stats():
@@ -923,6 +965,26 @@ async def end_current_session():
             content={"error": f"Failed to end session: {str(e)}"}
         )
 
+@app.get("/api/sessions/stats")
+async def get_session_store_stats():
+    """Conversation session cache: size, hit/miss and eviction counters"""
+    return session_store.stats()
+
+@app.get("/api/rate-limits/stats")
+async def get_rate_limit_stats():
+    """Rate limiter budgets and allowed/limited counters"""
+    return rate_limiter.stats()
+
+@app.get("/api/embeddings/stats")
+async def get_embedding_cache_stats():
+    """Query embedding LRU (size, memory, hit/miss) and micro-batcher counters"""
+    return {"query_cache": get_query_embedding_cache().stats(), "batchers": get_batcher_stats()}
+
+@app.get("/api/models")
+async def get_models():
+    """Get memory and load time for every model loaded in this process"""
+    return JSONResponse(content={"models": get_model_stats()})
+
 # Debug endpoints for AI interactions
 @app.get("/api/ai-interactions")
 async def get_ai_interactions():
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: RAG retrieval - exact VectorIndex scan vs the IVF approximate index, reporting
+recall@k and latency for several n_probe settings on a synthetic clustered corpus
+(MiniLM-sized 384-dim vectors, shaped like a multi-portfolio / blog archive load).
+
+Usage: python bench_ann_index.py [n_items]
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from ann_index import IVFIndex
+from vector_index import VectorIndex
+
+SECTIONS = ["projects", "experience", "publications", "education", "blog"]
+
+
+def clustered_corpus(n_items: int, dim: int = 384, n_topics: int = 500, n_queries: int = 200, seed: int = 11):
+    """Vectors around random topic centres (real embeddings cluster by subject, not uniformly)"""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim)).astype(np.float32)
+    members = rng.integers(0, n_topics, size=n_items)
+    embeddings = topics[members] + rng.normal(scale=1.5, size=(n_items, dim)).astype(np.float32)
+    sections = [SECTIONS[i] for i in rng.integers(0, len(SECTIONS), size=n_items)]
+    queries = topics[rng.integers(0, n_topics, size=n_queries)] + rng.normal(scale=1.5, size=(n_queries, dim)).astype(np.float32)
+    return embeddings, sections, queries
+
+
+def recall_at_k(exact_hits, approx_hits):
+    found = sum(len({row for row, _ in exact} & {row for row, _ in approx}) for exact, approx in zip(exact_hits, approx_hits))
+    return found / max(1, sum(len(exact) for exact in exact_hits))
+
+
+def _time_per_query(search, queries):
+    start = time.perf_counter()
+    results = [search(query) for query in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def run_benchmark(n_items: int = 50000, top_k: int = 10):
+    embeddings, sections, queries = clustered_corpus(n_items)
+    exact = VectorIndex(embeddings, sections)
+    exact_hits, exact_ms = _time_per_query(lambda query: exact.search(query, top_k=top_k, min_score=-1.0), queries)
+
+    build_start = time.perf_counter()
+    ivf = IVFIndex.build(embeddings, sections, exact_threshold=0)
+    build_s = time.perf_counter() - build_start
+    print(f"📏 {n_items} items, {len(ivf.centroids)} lists (built in {build_s:.1f} s)")
+    print(f"   🐢 exact scan:        {exact_ms:7.3f} ms/query  recall@{top_k} 1.000")
+    for n_probe in (1, 2, 4, 8, 16, 32):
+        hits, ivf_ms = _time_per_query(lambda query: ivf.search(query, top_k=top_k, min_score=-1.0, n_probe=n_probe), queries)
+        print(f"   🚀 ivf n_probe={n_probe:<3}  {ivf_ms:7.3f} ms/query  recall@{top_k} {recall_at_k(exact_hits, hits):.3f}"
+              f"  ({exact_ms / ivf_ms:.1f}x)")
+
+    # Incremental insertion keeps recall without re-clustering
+    extra, extra_sections, _ = clustered_corpus(n_items // 10, seed=12)
+    insert_start = time.perf_counter()
+    ivf.add(extra, extra_sections)
+    insert_ms = (time.perf_counter() - insert_start) * 1000
+    exact = VectorIndex(np.vstack([embeddings, extra]), sections + extra_sections)
+    exact_hits = [exact.search(query, top_k=top_k, min_score=-1.0) for query in queries]
+    hits = [ivf.search(query, top_k=top_k, min_score=-1.0) for query in queries]
+    print(f"➕ Inserted {len(extra)} items in {insert_ms:.0f} ms; recall@{top_k} at n_probe={ivf.n_probe}: {recall_at_k(exact_hits, hits):.3f}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
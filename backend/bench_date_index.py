@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: filter_by_date and the date sorts - per-item regex parsing + sorted() per
+request vs the prebuilt DateIndex interval arrays and date-ordered views.
+
+Usage: python bench_date_index.py [items_per_section]
+"""
+import os
+import random
+import re
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from date_index import DateIndex
+
+MODIFIERS = [None, "in", "during", "from", "from_only", "in_only", "after", "before", "last_two_years"]
+MONTHS = ["Jan.", "Feb.", "Mar.", "Apr.", "May", "Jun.", "Jul.", "Aug.", "Sep.", "Oct.", "Nov.", "Dec."]
+
+
+def legacy_filter_by_date(items, target_years, date_modifier):
+    """The old filter_by_date loop, kept verbatim for comparison"""
+    filtered_items = []
+    for item in items:
+        dates_field = item.get("dates", item.get("date", ""))
+        if not dates_field:
+            continue
+        if "–" in dates_field or "-" in dates_field:
+            separator = "–" if "–" in dates_field else "-"
+            parts = dates_field.split(separator)
+            if len(parts) == 2:
+                start_year_match = re.search(r'(20[0-9]{2})', parts[0].strip())
+                end_year_match = re.search(r'(20[0-9]{2})', parts[1].strip())
+                if start_year_match and end_year_match:
+                    start_year = int(start_year_match.group(1))
+                    end_year = int(end_year_match.group(1))
+                    if date_modifier == "from_only":
+                        if start_year in target_years:
+                            filtered_items.append(item)
+                    elif date_modifier == "in_only":
+                        if start_year in target_years and end_year in target_years:
+                            filtered_items.append(item)
+                    elif date_modifier in ("last_two_years", "during", "in"):
+                        if any(start_year <= target_year <= end_year for target_year in target_years):
+                            filtered_items.append(item)
+                    elif date_modifier == "from":
+                        if start_year in target_years or end_year in target_years:
+                            filtered_items.append(item)
+                    elif date_modifier == "after":
+                        if start_year > max(target_years):
+                            filtered_items.append(item)
+                    elif date_modifier == "before":
+                        if end_year < min(target_years):
+                            filtered_items.append(item)
+                    else:
+                        if any(start_year <= target_year <= end_year for target_year in target_years):
+                            filtered_items.append(item)
+        else:
+            year_match = re.search(r'(20[0-9]{2})', dates_field)
+            if year_match and int(year_match.group(1)) in target_years:
+                filtered_items.append(item)
+    return filtered_items
+
+
+def synthetic_corpus(items_per_section: int, seed: int = 4):
+    """Experience-style ranges, project/publication single dates, and some odd date strings"""
+    rng = random.Random(seed)
+
+    def month_year():
+        return f"{rng.choice(MONTHS)} {rng.randint(2015, 2026)}"
+
+    def range_field():
+        start = month_year()
+        end = rng.choice(["Present", month_year(), str(rng.randint(2018, 2026))])
+        return f"{start} {rng.choice(['–', '-'])} {end}"
+
+    odd = ["", "2024-01-05", "Summer 2019", "Ongoing", "2023 – 2024"]
+    return {
+        "experience": [{"id": f"e{i}", "dates": rng.choice([range_field()] * 9 + odd)} for i in range(items_per_section)],
+        "projects": [{"id": f"p{i}", "date": rng.choice([month_year()] * 9 + odd)} for i in range(items_per_section)],
+        "publications": [{"id": f"u{i}", "date": month_year()} for i in range(items_per_section)],
+    }
+
+
+def date_workload(count: int = 40, seed: int = 8):
+    rng = random.Random(seed)
+    return [(sorted(rng.sample(range(2016, 2027), rng.randint(1, 3))), rng.choice(MODIFIERS)) for _ in range(count)]
+
+
+def run_benchmark(items_per_section: int = 3500):
+    corpus = synthetic_corpus(items_per_section)
+    build_start = time.perf_counter()
+    index = DateIndex(corpus)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    total = sum(len(items) for items in corpus.values())
+    print(f"⚙️  Date index: {total} items, built in {build_ms:.0f} ms")
+
+    workload = date_workload()
+    mismatches = 0
+    start = time.perf_counter()
+    legacy = [legacy_filter_by_date(items, years, modifier) for years, modifier in workload for items in corpus.values()]
+    legacy_ms = (time.perf_counter() - start) * 1000 / len(workload)
+    start = time.perf_counter()
+    indexed = [index.filter(items, years, modifier) for years, modifier in workload for items in corpus.values()]
+    index_ms = (time.perf_counter() - start) * 1000 / len(workload)
+    mismatches += sum(1 for a, b in zip(legacy, indexed) if a != b)
+    print(f"📅 filter_by_date ({len(workload)} filters)")
+    print(f"   🐢 per-item regex:  {legacy_ms:9.2f} ms/query")
+    print(f"   🚀 interval masks:  {index_ms:9.2f} ms/query  ({legacy_ms / index_ms:.1f}x faster)")
+
+    key = lambda item: item.get("dates", item.get("date", "2020"))
+    subsets = [[item for item in items if hash(item["id"]) % 3] for items in corpus.values()]
+    start = time.perf_counter()
+    legacy_sorted = [sorted(items, key=key, reverse=True) for items in list(corpus.values()) + subsets]
+    legacy_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    index_sorted = [index.sort(items, "dates_or_date") for items in list(corpus.values()) + subsets]
+    index_ms = (time.perf_counter() - start) * 1000
+    mismatches += sum(1 for a, b in zip(legacy_sorted, index_sorted) if a != b)
+    print(f"🗂️  date sorts (3 sections + 3 subsets)")
+    print(f"   🐢 sorted():        {legacy_ms:9.2f} ms")
+    print(f"   🚀 prebuilt views:  {index_ms:9.2f} ms  ({legacy_ms / index_ms:.1f}x faster)")
+
+    print(f"🔍 Output mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 3500)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-query latency and batch throughput of the embedding backends
+(torch, torch-int8, onnx, onnx-int8) plus cosine drift against torch.
+
+Uses the real all-MiniLM-L6-v2 when it can be loaded, otherwise the tiny offline
+model from test_embedding_backends (numbers then only show relative overhead).
+
+Usage: python bench_embedding_backends.py [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from embedding_backends import EMBEDDING_BACKENDS, ONNX_EXPORT_DIR, load_embedding_backend
+
+QUERIES = ["machine learning projects", "what did he do at dataplatr", "python and fastapi backend",
+           "distributed systems and scalability", "robotics research", "react frontend work"]
+ITEMS = [f"{query} - built and shipped to production with a small team, item {i}"
+         for i in range(32) for query in QUERIES][:128]
+
+
+def _load_base_model(scratch_dir: str):
+    try:
+        from model_registry import get_embedding_model, embedding_model_id
+        return get_embedding_model("torch"), embedding_model_id("torch"), ONNX_EXPORT_DIR
+    except Exception as e:
+        print(f"⚠️ MiniLM unavailable ({e}), benchmarking the tiny offline model")
+        from test_embedding_backends import build_tiny_model
+        return build_tiny_model(os.path.join(scratch_dir, "model")), "tiny-minilm", os.path.join(scratch_dir, "onnx")
+
+
+def run_benchmark(repeats: int = 50):
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        base_model, model_id, export_dir = _load_base_model(scratch_dir)
+        reference = None
+        for backend in EMBEDDING_BACKENDS:
+            try:
+                encoder = load_embedding_backend(base_model, backend, model_id, export_dir=export_dir)
+            except ImportError as e:
+                print(f"⏭️ {backend:<10} skipped ({e})")
+                continue
+            encoder.encode(QUERIES)  # Warm up (first-call allocation, ONNX graph optimisation)
+
+            start = time.perf_counter()
+            for i in range(repeats):
+                encoder.encode([QUERIES[i % len(QUERIES)]], show_progress_bar=False)
+            latency_ms = (time.perf_counter() - start) / repeats * 1000
+
+            start = time.perf_counter()
+            vectors = np.asarray(encoder.encode(ITEMS, batch_size=32, show_progress_bar=False), dtype=np.float32)
+            throughput = len(ITEMS) / (time.perf_counter() - start)
+
+            scores = np.asarray(encoder.encode(QUERIES), dtype=np.float32) @ vectors.T
+            if reference is None:
+                reference = scores
+            drift = np.abs(scores - reference).max()
+            print(f"⚡ {backend:<10} {latency_ms:7.2f} ms/query   {throughput:8.1f} items/s   max cosine drift {drift:.1e}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
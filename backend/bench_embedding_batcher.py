@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: query embedding throughput with 1, 8 and 64 concurrent clients - one encode()
+per request in a worker thread vs the EmbeddingBatcher micro-batching them.
+
+By default the model is a stand-in with MiniLM-on-CPU-like costs (fixed per-call overhead
+plus a small per-text cost, GIL released like torch). Pass --minilm to use the real model.
+
+Usage: python bench_embedding_batcher.py [--minilm] [requests_per_client]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from embedding_batcher import EmbeddingBatcher
+
+QUERIES = ["machine learning projects", "what did he do at dataplatr", "python and fastapi backend",
+           "distributed systems and scalability", "robotics research", "react frontend work"]
+
+
+class SimulatedEncoder:
+    """~6 ms per encode call + 0.25 ms per text, 384-dim output; one call at a time,
+    like torch using every core for a single forward pass"""
+    def __init__(self, call_overhead_s: float = 0.006, per_text_s: float = 0.00025):
+        self.call_overhead_s = call_overhead_s
+        self.per_text_s = per_text_s
+        self._cpu = threading.Lock()
+
+    def encode(self, texts, show_progress_bar=False):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        with self._cpu:
+            time.sleep(self.call_overhead_s + self.per_text_s * len(texts))
+        vectors = np.zeros((len(texts), 384), dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+async def _run_clients(embed, clients: int, requests_per_client: int) -> float:
+    async def client(offset):
+        for i in range(requests_per_client):
+            await embed(QUERIES[(offset + i) % len(QUERIES)])
+    start = time.perf_counter()
+    await asyncio.gather(*(client(offset) for offset in range(clients)))
+    return clients * requests_per_client / (time.perf_counter() - start)
+
+
+async def run_benchmark(model, requests_per_client: int = 20):
+    for clients in (1, 8, 64):
+        unbatched = await _run_clients(lambda text: asyncio.to_thread(model.encode, [text], show_progress_bar=False),
+                                       clients, requests_per_client)
+        batcher = EmbeddingBatcher(model)
+        batched = await _run_clients(batcher.embed, clients, requests_per_client)
+        await batcher.close()
+        stats = batcher.describe()
+        print(f"👥 {clients:>2} clients: 🐢 {unbatched:8.1f} req/s unbatched   🚀 {batched:8.1f} req/s batched"
+              f"  ({batched / unbatched:.1f}x, avg batch {stats['avg_batch']}, max {stats['max_batch']})")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--minilm"]
+    if "--minilm" in sys.argv:
+        from model_registry import get_embedding_model
+        model = get_embedding_model()
+    else:
+        model = SimulatedEncoder()
+    asyncio.run(run_benchmark(model, int(args[0]) if args else 20))
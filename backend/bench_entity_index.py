@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: specific-entity detection - regex patterns + a rebuilt searchable_text scan
+per item vs the EntityIndex trigram postings, on synthetic corpora of growing size.
+
+Usage: python bench_entity_index.py [max_items]
+"""
+import os
+import random
+import re
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from entity_index import ENTITY_QUERY_PATTERNS, ENTITY_SECTIONS, EntityIndex
+
+ENTITY_QUESTIONS = [
+    "what did he do at people robots lab", "what did he do at the people & robots slap?",
+    "tell me about dataplatr", "what did he do at spenza", "tell me about the slap",
+    "tell me about his work at cdac", "what specifically did he build at drdo?", "in spenza experience",
+    "tell me about the chicago project", "tell me about amazon semantic search", "what did he do in 2023",
+    "tell me about codeforces", "what about the merge sort", "tell me about apneanet", "at quinnis company",
+    "no, i meant what did he do at dataplatr consulting", "what projects has he built", "hello",
+]
+NAME_WORDS = ["north", "star", "quantum", "river", "works", "atlas", "vertex", "cloud", "pixel", "harbor",
+              "summit", "nova", "orbit", "ember", "forge", "signal", "lumen", "cedar", "delta", "prism"]
+
+
+def legacy_detect(sections, question):
+    """The old _detect_specific_entity loop, kept verbatim (minus printing) for comparison"""
+    company_patterns = [pattern.pattern for pattern in ENTITY_QUERY_PATTERNS]
+    for pattern in company_patterns:
+        match = re.search(pattern, question)
+        if match:
+            entity_name = match.group(1).strip()
+            entity_name = re.sub(r'\b(slap|lab)\b', 'lab', entity_name, flags=re.IGNORECASE)
+            entity_name = re.sub(r'\b(robot|robots)\b', 'robots', entity_name, flags=re.IGNORECASE)
+            matched_items = []
+            for content_type in ENTITY_SECTIONS:
+                for item in sections.get(content_type, []):
+                    searchable_text = " ".join([
+                        item.get("company", ""),
+                        item.get("title", ""),
+                        item.get("description", "")
+                    ]).lower()
+                    entity_words = entity_name.lower().split()
+                    if len(entity_words) >= 2:
+                        word_matches = sum(1 for word in entity_words if word in searchable_text and len(word) > 2)
+                        if word_matches >= 2:
+                            matched_items.append({**item, "content_source": content_type})
+                    elif len(entity_words) == 1 and len(entity_words[0]) > 3:
+                        if entity_words[0] in searchable_text:
+                            matched_items.append({**item, "content_source": content_type})
+            if matched_items:
+                return entity_name, matched_items
+    return None
+
+
+def index_detect(index, question):
+    detected = index.detect(question)
+    if detected is None:
+        return None
+    entity_name, matches = detected
+    return entity_name, [{**match.item, "content_source": match.section} for match in matches]
+
+
+def synthetic_corpus(resume_data, total_items: int, seed: int = 6):
+    """The real entity sections padded with generated companies/projects/papers"""
+    rng = random.Random(seed)
+    name = lambda: " ".join(rng.choice(NAME_WORDS).title() + str(rng.randint(0, 99999)) for _ in range(rng.randint(2, 3)))
+    filler = lambda: " ".join(rng.choice(NAME_WORDS) + str(rng.randint(0, 99999)) for _ in range(rng.randint(15, 40)))
+    corpus = {section: list(resume_data.get(section, [])) for section in ENTITY_SECTIONS}
+    for i in range(max(0, total_items - sum(len(items) for items in corpus.values()))):
+        section = ENTITY_SECTIONS[i % 3]
+        field = "company" if section == "experience" else "title"
+        corpus[section].append({"id": f"synthetic-{i}", field: name(), "description": filler()})
+    return corpus
+
+
+def _time_per_question(fn, questions, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for question in questions:
+            fn(question)
+    return (time.perf_counter() - start) / (iterations * len(questions)) * 1000
+
+
+def run_benchmark(max_items: int = 10000):
+    import json
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json")) as f:
+        resume_data = json.load(f)
+
+    mismatches = 0
+    for size in [size for size in (100, 1000, max_items) if size <= max_items]:
+        corpus = synthetic_corpus(resume_data, size)
+        build_start = time.perf_counter()
+        index = EntityIndex(corpus)
+        build_ms = (time.perf_counter() - build_start) * 1000
+        cold_ms = _time_per_question(lambda question: index.detect(question), ENTITY_QUESTIONS, 1)
+        mismatches += sum(1 for question in ENTITY_QUESTIONS if legacy_detect(corpus, question) != index_detect(index, question))
+
+        iterations = max(1, 2000 // size)
+        legacy_ms = _time_per_question(lambda question: legacy_detect(corpus, question), ENTITY_QUESTIONS, iterations)
+        index_ms = _time_per_question(lambda question: index.detect(question), ENTITY_QUESTIONS, iterations * 5)
+        print(f"📏 {size} items: index built in {build_ms:.0f} ms")
+        print(f"   🐢 per-item scan: {legacy_ms:9.3f} ms/question")
+        print(f"   🧊 entity index:  {cold_ms:9.3f} ms/question  (cold word cache)")
+        print(f"   🚀 entity index:  {index_ms:9.3f} ms/question  ({legacy_ms / index_ms:.1f}x faster)")
+
+    print(f"🔍 Output mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fuzzy tech lookup in extract_technologies - extractOne-style scan of every
+alias vs the prebuilt FuzzyTermIndex, on misspellings, ASR-style mishearings and noise.
+
+Usage: python bench_fuzzy_index.py [iterations]
+"""
+import os
+import random
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fuzzy_index import FuzzyTermIndex, full_process, ratio
+
+MISSPELLED_TERMS = [
+    "pytorh", "tensorflw", "kubernets", "javascrpt", "typescipt", "postgress", "mongodbb", "dokcer",
+    "fastpi", "djanga", "langchian", "databrick", "bigqury", "websocket", "kotln", "reactjs",
+    "pie torch", "tensor flow", "java script", "type script", "post gres", "next js", "lang chain",
+    "machine lerning", "deep lerning", "natural langauge", "computer vison", "speach recognition",
+    "what", "about", "projects", "with", "does", "have", "experience", "nitigya",
+]
+
+
+def legacy_best_match(terms, text, min_score):
+    """The old lookup: score every alias, keep the first best (extractOne semantics)"""
+    processed = full_process(text)
+    best, best_score = None, -1
+    for term in terms:
+        score = ratio(processed, full_process(term))
+        if score > best_score:
+            best, best_score = term, score
+    return (best, best_score) if best is not None and best_score >= min_score else None
+
+
+def noisy_terms(terms, count: int = 300, seed: int = 11):
+    """Random single-edit typos of real aliases (drops, swaps, substitutions)"""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    noisy = []
+    for _ in range(count):
+        term = list(rng.choice(terms))
+        position = rng.randrange(len(term))
+        edit = rng.choice(["drop", "swap", "sub"])
+        if edit == "drop" and len(term) > 1:
+            del term[position]
+        elif edit == "swap" and position + 1 < len(term):
+            term[position], term[position + 1] = term[position + 1], term[position]
+        else:
+            term[position] = rng.choice(letters)
+        noisy.append("".join(term))
+    return noisy
+
+
+def _time_per_lookup(fn, texts, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (iterations * len(texts)) * 1e6
+
+
+def run_benchmark(iterations: int = 5):
+    sys.modules.setdefault("sentence_transformers", None)  # Only tech_mappings is needed
+    from resume_query_processor import ResumeQueryProcessor
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+    terms = list(processor.fuzzy_keyword_tech.keys())
+
+    build_start = time.perf_counter()
+    index = FuzzyTermIndex(terms)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    print(f"⚙️  Fuzzy index: {len(index)} aliases, built in {build_ms:.1f} ms")
+
+    texts = MISSPELLED_TERMS + noisy_terms(terms)
+    mismatches = []
+    for text in texts:
+        min_score = 80 if " " in text else 82
+        if legacy_best_match(terms, text, min_score) != index.best_match(text, min_score):
+            mismatches.append(text)
+
+    legacy_us = _time_per_lookup(lambda text: legacy_best_match(terms, text, 82), texts, iterations)
+    index_us = _time_per_lookup(lambda text: index.best_match(text, 82), texts, iterations)
+    print(f"📏 {len(texts)} lookups")
+    print(f"   🐢 full extractOne scan: {legacy_us:10.1f} µs/lookup")
+    print(f"   🚀 fuzzy index:          {index_us:10.1f} µs/lookup  ({legacy_us / index_us:.1f}x faster)")
+    print(f"   🎯 avg candidates scored: {index.stats['candidates'] / index.stats['lookups']:.1f} of {len(index)}")
+    print(f"🔍 Output mismatches: {len(mismatches)}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: processor + RAG startup with no caches, with the per-index caches, and from
+the memory-mapped index bundle (build_index.py).
+
+Uses the real all-MiniLM-L6-v2 when it can be loaded, otherwise the trigram stand-in
+from test_tech_embeddings (encode cost is then near zero, so the gap understates a real
+cold start). Model load time is excluded: every mode shares the loaded model.
+
+Usage: python bench_index_bundle.py [repeats]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import model_registry
+import rag_service
+from build_index import build_index
+from resume_query_processor import ResumeQueryProcessor
+
+RESUME_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json")
+
+
+def _load_model():
+    try:
+        return model_registry.get_embedding_model()
+    except Exception as e:
+        print(f"⚠️ MiniLM unavailable ({e}), benchmarking the trigram stand-in")
+        from test_tech_embeddings import TrigramEncoder
+        model = TrigramEncoder()
+        model_registry.get_embedding_model = rag_service.get_embedding_model = lambda backend=None: model
+        return model
+
+
+def _startup(data_path: str, use_index_bundle: bool) -> float:
+    started = time.perf_counter()
+    ResumeQueryProcessor(data_path, use_index_bundle=use_index_bundle)
+    rag_service.ResumeRAG(data_path, use_index_bundle=use_index_bundle)
+    return time.perf_counter() - started
+
+
+def run_benchmark(repeats: int = 5):
+    _load_model()
+    with tempfile.TemporaryDirectory() as data_dir:
+        data_path = os.path.join(data_dir, "resume_data.json")
+        shutil.copy(RESUME_DATA, data_path)
+        cache_dir = os.path.join(data_dir, ".index_cache")
+
+        cold = []
+        for _ in range(repeats):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(_startup(data_path, use_index_bundle=False))
+        warm = [_startup(data_path, use_index_bundle=False) for _ in range(repeats)]
+        build_index(data_path)
+        bundled = [_startup(data_path, use_index_bundle=True) for _ in range(repeats)]
+
+    print(f"\n{'mode':<22}{'best ms':>10}{'median ms':>12}")
+    for name, times in (("no caches", cold), ("per-index caches", warm), ("index bundle (mmap)", bundled)):
+        times = sorted(times)
+        print(f"{name:<22}{times[0] * 1000:>10.1f}{times[len(times) // 2] * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark: RAG vector storage - float32 VectorIndex vs int8 / float16 QuantizedVectorIndex,
+with and without full-precision rescoring. Reports resident memory, recall@k and latency.
+
+Usage: python bench_quantized_index.py [n_items]
+"""
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_ann_index import clustered_corpus, recall_at_k
+from quantized_index import QuantizedVectorIndex
+from vector_index import VectorIndex
+
+
+def _time_per_query(index, queries, top_k):
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, top_k=top_k, min_score=-1.0)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def run_benchmark(n_items: int = 50000, top_k: int = 10):
+    embeddings, sections, queries = clustered_corpus(n_items)
+    exact = VectorIndex(embeddings, sections)
+    exact_ms = _time_per_query(exact, queries, top_k)
+    print(f"📏 {n_items} x {exact.dim} vectors")
+    print(f"   🐢 float32:            {exact.matrix.nbytes / 2**20:7.1f} MB  recall@{top_k} 1.000  {exact_ms:6.3f} ms/query")
+
+    exact_hits = exact.search_batch(queries, top_k=top_k, min_score=-1.0)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for mode in ("float16", "int8"):
+            for rescore_factor in (0, 4):
+                path = os.path.join(cache_dir, f"{mode}.npy") if rescore_factor else None
+                index = QuantizedVectorIndex(embeddings, sections, mode, rescore_factor=rescore_factor, full_precision_path=path)
+                recall = recall_at_k(exact_hits, index.search_batch(queries, top_k=top_k, min_score=-1.0))
+                stats = index.memory_stats()
+                label = f"{mode} + rescore x{rescore_factor}" if rescore_factor else f"{mode}, no rescore"
+                print(f"   🗜️ {label:<19} {stats['resident_bytes'] / 2**20:7.1f} MB  recall@{top_k} {recall:.3f}"
+                      f"  {_time_per_query(index, queries, top_k):6.3f} ms/query  ({stats['compression']}x smaller)")
+    print("ℹ️ float16 is widened to float32 per query, which NumPy does slowly; int8 is the faster compressed mode")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-query classification cost of the old per-pattern re.search checks
+vs the precompiled QueryRuleEngine (intent, greeting, casual, highlights, follow-up).
+
+Usage: python bench_query_rules.py [iterations]
+"""
+import os
+import re
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from query_rules import (QueryRuleEngine, GREETING_PATTERNS, CASUAL_PATTERNS, GENERAL_PATTERNS,
+                         VERY_GENERAL_PATTERNS, FOLLOWUP_PATTERNS)
+
+BENCH_QUERIES = [
+    "hi", "hello", "Hey", "how are you doing?", "good morning!", "what do you mean", "testing one two three",
+    "what projects has he built", "what are his skills", "tell me about his work at Spenza",
+    "what technologies does he know", "show me his research", "what is his background", "tell me about his education",
+    "what companies has he worked at", "show me his publications", "projects with react", "does he know golang",
+    "experience in java development", "projects from 2024", "what did he do in 2023", "work after 2023",
+    "highlights", "career recap", "tell me about him", "show me everything", "show me his best project",
+    "what stands out in his career", "tell me more about that", "the second project sounds cool",
+    "what did he do in that role?", "no, i meant the first one", "show all", "give me all of them",
+    "what tech did he use at this company", "tell me about yourself", "who are you", "blog posts",
+    "what's his story", "his portfolio", "any rust projects in there?", "tell me more details about the third one",
+    "What Has He Done?", "   Show me everything   ", "pytorch and tensorflow deep learning projects with cnn",
+    "I'm a recruiter looking for someone with experience building data pipelines on GCP and AWS - "
+    "what has he worked on, which companies, and does he have publications or research in ML?",
+]
+
+
+def legacy_classify(intent_patterns, highlights_patterns, query):
+    """The pre-engine logic: raw pattern strings, one re.search each"""
+    query_lower = query.lower()
+    if any(re.search(pattern, query_lower.strip()) for pattern in GREETING_PATTERNS):
+        intent = "greeting"
+    elif any(re.search(pattern, query_lower.strip()) for pattern in CASUAL_PATTERNS):
+        intent = "general"
+    else:
+        intent_scores = {}
+        for name, patterns in intent_patterns.items():
+            score = sum(1 for pattern in patterns if re.search(pattern, query))
+            if score > 0:
+                intent_scores[name] = score
+        if intent_scores:
+            intent = max(intent_scores, key=intent_scores.get)
+        elif any(re.search(pattern, query_lower) for pattern in GENERAL_PATTERNS):
+            intent = "general"
+        else:
+            intent = "projects"
+    is_highlights = any(re.search(pattern, query) for pattern in highlights_patterns)
+    is_followup = any(re.search(pattern, query) for pattern in FOLLOWUP_PATTERNS)
+    is_very_general = any(re.search(pattern, query.lower().strip()) for pattern in VERY_GENERAL_PATTERNS)
+    return intent, is_highlights, is_followup, is_very_general
+
+
+def engine_classify(processor, query):
+    """Same four decisions from one engine pass"""
+    rules = processor.rule_engine.classify(query)
+    return (processor.extract_intent(query, rules), processor.is_highlights_query(query, rules),
+            "followup" in rules, "very_general" in rules)
+
+
+def _time_per_query(fn, queries, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (iterations * len(queries)) * 1e6
+
+
+def run_benchmark(iterations: int = 200):
+    # Only the rule tables are needed, so skip loading the embedding model
+    sys.modules.setdefault("sentence_transformers", None)
+    from resume_query_processor import ResumeQueryProcessor
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+
+    mismatches = [query for query in BENCH_QUERIES
+                  if legacy_classify(processor.intent_patterns, processor.highlights_patterns, query)
+                  != engine_classify(processor, query)]
+    print(f"🔍 Checked {len(BENCH_QUERIES)} queries, {len(mismatches)} mismatches")
+    for query in mismatches:
+        print(f"   ❌ {query!r}")
+
+    build_start = time.perf_counter()
+    QueryRuleEngine(processor.intent_patterns, processor.highlights_patterns)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    legacy_us = _time_per_query(
+        lambda query: legacy_classify(processor.intent_patterns, processor.highlights_patterns, query),
+        BENCH_QUERIES, iterations)
+    engine_us = _time_per_query(lambda query: engine_classify(processor, query), BENCH_QUERIES, iterations)
+
+    print(f"⚙️  Engine build (once per processor): {build_ms:.2f} ms")
+    print(f"🐢 Per-pattern re.search: {legacy_us:8.1f} µs/query")
+    print(f"🚀 Compiled rule engine:  {engine_us:8.1f} µs/query  ({legacy_us / engine_us:.1f}x faster)")
+    return mismatches
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
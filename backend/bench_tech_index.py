@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: filter_by_technology - per-item text join + substring/regex loops vs the
+inverted TechItemIndex bitsets, on synthetic corpora of growing size.
+
+Usage: python bench_tech_index.py [max_items]
+"""
+import os
+import random
+import re
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tech_index import TechItemIndex
+
+FILLER_WORDS = ["built", "designed", "scalable", "pipeline", "team", "users", "latency", "model", "service",
+                "reduced", "improved", "platform", "data", "real-time", "dashboard", "mongodb", "django", "cargo"]
+
+
+def legacy_filter(tech_mappings, items, tech_filters):
+    """The old filter_by_technology body, kept verbatim for comparison"""
+    if not tech_filters:
+        return items
+    filtered_items = []
+    for item in items:
+        item_techs = item.get("technologies", [])
+        item_keywords = item.get("keywords", [])
+        item_text = " ".join([
+            item.get("title", ""),
+            item.get("company", ""),
+            item.get("description", ""),
+            " ".join(item.get("highlights", []))
+        ]).lower()
+        match_found = False
+        for tech_filter in tech_filters:
+            tech_lower = tech_filter.lower()
+            if len(tech_filter) <= 3:
+                word_pattern = r'\b' + re.escape(tech_lower) + r'\b'
+                if any(re.search(word_pattern, tech.lower()) for tech in item_techs):
+                    match_found = True
+                    break
+                if any(re.search(word_pattern, keyword.lower()) for keyword in item_keywords):
+                    match_found = True
+                    break
+                if re.search(word_pattern, item_text):
+                    match_found = True
+                    break
+            else:
+                if any(tech_lower in tech.lower() for tech in item_techs):
+                    match_found = True
+                    break
+                if any(tech_lower in keyword.lower() for keyword in item_keywords):
+                    match_found = True
+                    break
+                if tech_filter in tech_mappings:
+                    mapped_keywords = tech_mappings[tech_filter]
+                    if tech_filter == "database":
+                        specific_db_match = False
+                        for keyword in mapped_keywords:
+                            if keyword.lower() in item_text or any(keyword.lower() in tech.lower() for tech in item_techs):
+                                specific_db_match = True
+                                break
+                        if specific_db_match:
+                            match_found = True
+                            break
+                    else:
+                        if any(keyword.lower() in item_text for keyword in mapped_keywords):
+                            match_found = True
+                            break
+                if tech_lower in item_text:
+                    match_found = True
+                    break
+        if match_found:
+            filtered_items.append(item)
+    return filtered_items
+
+
+def synthetic_corpus(tech_mappings, items_per_section: int, seed: int = 5):
+    """projects / experience / publications built from random aliases and filler text"""
+    rng = random.Random(seed)
+    aliases = sorted({keyword for keywords in tech_mappings.values() for keyword in keywords})
+    sentence = lambda: " ".join(rng.choice(FILLER_WORDS + aliases[:40]) for _ in range(rng.randint(6, 14)))
+    corpus = {}
+    for section in ("projects", "experience", "publications"):
+        corpus[section] = [{
+            "id": f"{section}-{i}",
+            "title": f"{rng.choice(aliases)} {rng.choice(FILLER_WORDS)}",
+            "company": rng.choice(["Acme", "Globex", "Initech", ""]),
+            "description": sentence(),
+            "highlights": [sentence() for _ in range(rng.randint(0, 3))],
+            "technologies": rng.sample(aliases, rng.randint(1, 6)),
+            "keywords": rng.sample(aliases, rng.randint(0, 4)),
+        } for i in range(items_per_section)]
+    return corpus
+
+
+def filter_workload(tech_mappings, count: int = 30, seed: int = 9):
+    rng = random.Random(seed)
+    techs = list(tech_mappings.keys())
+    workload = [["go"], ["r"], ["c"], ["database"], ["python", "pytorch"]]
+    workload += [rng.sample(techs, rng.randint(1, 3)) for _ in range(count - len(workload))]
+    return workload
+
+
+def run_benchmark(max_items: int = 10000):
+    sys.modules.setdefault("sentence_transformers", None)  # Only tech_mappings is needed
+    from resume_query_processor import ResumeQueryProcessor
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+    tech_mappings = processor.tech_mappings
+    workload = filter_workload(tech_mappings)
+
+    mismatches = 0
+    sizes = [size for size in (100, 1000, max_items) if size <= max_items]
+    for size in sizes:
+        corpus = synthetic_corpus(tech_mappings, size // 3 + 1)
+        build_start = time.perf_counter()
+        index = TechItemIndex(corpus, tech_mappings)
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        section_lists = list(corpus.values())
+        start = time.perf_counter()
+        legacy_results = [legacy_filter(tech_mappings, items, filters) for filters in workload for items in section_lists]
+        legacy_ms = (time.perf_counter() - start) * 1000 / len(workload)
+        start = time.perf_counter()
+        index_results = [index.filter(items, filters) for filters in workload for items in section_lists]
+        index_ms = (time.perf_counter() - start) * 1000 / len(workload)
+        mismatches += sum(1 for legacy, indexed in zip(legacy_results, index_results) if legacy != indexed)
+
+        total = sum(len(items) for items in section_lists)
+        print(f"📏 {total} items: index built in {build_ms:.0f} ms ({len(tech_mappings)} techs)")
+        print(f"   🐢 per-item loops: {legacy_ms:9.2f} ms/query")
+        print(f"   🚀 bitsets:        {index_ms:9.2f} ms/query  ({legacy_ms / index_ms:.1f}x faster)")
+
+    print(f"🔍 Output mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: exact tech detection in extract_technologies - per-alias re.search loop
+vs the Aho-Corasick TechMatcher, on realistic and adversarially long queries.
+
+Usage: python bench_tech_matcher.py [iterations]
+"""
+import os
+import random
+import re
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tech_matcher import CONTEXT_TECH_PATTERNS, TechMatcher
+
+REALISTIC_QUERIES = [
+    "projects with react", "does he know golang", "any rust projects", "experience in java development",
+    "his experience with c++", "pytorch projects", "tensorflow and cnn", "aws lambda work", "etl pipelines",
+    "databricks", "bigquery projects", "mongodb experience", "websockets", "whisper speech", "fastapi backend",
+    "semantic search", "eeg bci", "kotlin apps", "docker and kubernetes", "sql databases", "nextjs frontend",
+    "experience in r programming", "c programming", "in go", "langchain rag pipelines", "stripe payments",
+    "what machine learning and deep learning work has he done with python?",
+    "I'm hiring for a backend role - has he used FastAPI, PostgreSQL, Redis and Docker in production systems?",
+]
+
+
+def legacy_exact_pass(tech_mappings, query_lower):
+    """The old exact pass: one regex compile + search per alias"""
+    found = []
+    for tech, patterns in CONTEXT_TECH_PATTERNS.items():
+        if any(re.search(pattern, query_lower) for pattern in patterns):
+            found.append(tech)
+    for tech, keywords in tech_mappings.items():
+        for keyword in keywords:
+            if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', query_lower):
+                if tech not in found:
+                    found.append(tech)
+                break
+    return found
+
+
+def matcher_exact_pass(matcher, query_lower):
+    found = matcher.match_context(query_lower)
+    for tech in matcher.match_aliases(query_lower):
+        if tech not in found:
+            found.append(tech)
+    return found
+
+
+def adversarial_queries(tech_mappings, seed: int = 7):
+    """Long inputs: alias soup, near-miss prefixes, and no-boundary runs"""
+    rng = random.Random(seed)
+    aliases = sorted({keyword.lower() for keywords in tech_mappings.values() for keyword in keywords})
+    soup = " ".join(rng.choice(aliases) for _ in range(400))
+    near_misses = " ".join(alias[:-1] + "x" for alias in rng.sample(aliases, 200))
+    glued = "".join(rng.choice(aliases).replace(" ", "") for _ in range(300))
+    repeated = "c" * 2000 + "++ " + "java " * 300
+    return [soup, near_misses, glued, repeated]
+
+
+def _time_per_query(fn, queries, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (iterations * len(queries)) * 1e6
+
+
+def run_benchmark(iterations: int = 50):
+    sys.modules.setdefault("sentence_transformers", None)  # Only tech_mappings is needed
+    from resume_query_processor import ResumeQueryProcessor
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+    tech_mappings = processor.tech_mappings
+
+    build_start = time.perf_counter()
+    matcher = TechMatcher(tech_mappings)
+    build_ms = (time.perf_counter() - build_start) * 1000
+    print(f"⚙️  Automaton: {len(matcher.automaton.patterns)} aliases, built in {build_ms:.1f} ms")
+
+    suites = {
+        "realistic": [query.lower() for query in REALISTIC_QUERIES],
+        "adversarial": adversarial_queries(tech_mappings),
+    }
+    mismatches = []
+    for name, queries in suites.items():
+        for query in queries:
+            if legacy_exact_pass(tech_mappings, query) != matcher_exact_pass(matcher, query):
+                mismatches.append(query)
+
+        runs = iterations if name == "realistic" else max(1, iterations // 10)
+        legacy_us = _time_per_query(lambda query: legacy_exact_pass(tech_mappings, query), queries, runs)
+        matcher_us = _time_per_query(lambda query: matcher_exact_pass(matcher, query), queries, runs)
+        avg_len = sum(len(query) for query in queries) / len(queries)
+        print(f"📏 {name} ({len(queries)} queries, avg {avg_len:.0f} chars)")
+        print(f"   🐢 per-alias re.search: {legacy_us:10.1f} µs/query")
+        print(f"   🚀 Aho-Corasick:        {matcher_us:10.1f} µs/query  ({legacy_us / matcher_us:.1f}x faster)")
+
+    print(f"🔍 Output mismatches: {len(mismatches)}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
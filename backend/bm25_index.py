@@ -0,0 +1,153 @@
+"""
+BM25 Index - Precomputed lexical index for hybrid RAG retrieval
+Term postings are stored CSR-style (one offsets array, one doc-id array, one term-frequency
+array), with document lengths and IDF as arrays, so scoring a query is a gather over its
+terms' postings plus one bincount - no per-document Python loop. Exact rare terms
+("duckdb", "c++") that dense embeddings blur still score highly here.
+"""
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))  # Term-frequency saturation
+BM25_B = float(os.getenv("BM25_B", "0.75"))   # Document-length normalization
+BM25_MIN_IDF = float(os.getenv("BM25_MIN_IDF", "0.3"))      # Terms below this can't make a document a candidate alone
+BM25_MIN_SCORE = float(os.getenv("BM25_MIN_SCORE", "0.0"))  # Lexical candidates need a score above this
+
+# Keeps tech spellings whole: c++, c#, node.js, scikit-learn
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+
+
+# Function words that would otherwise "match" every question ("any projects with go or rust?")
+STOPWORDS = frozenset(
+    "a an and any are as at be by did do does for from had has have he his i in is it me of on or show "
+    "tell that the this to was what which who with you your".split()
+)
+
+
+# Resume-question vocabulary: scored like any term, but never the only reason a document matches
+# ("any experience with COBOL" must not return every job that says "experience")
+GENERIC_TERMS = frozenset(
+    "about anything build building built company companies done ever experience experienced experiences "
+    "familiar job jobs know knowledge project projects role roles skill skills something stuff tech "
+    "technologies technology use used uses using work worked working works year years".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, stopwords dropped"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents (row i = texts[i])"""
+
+    def __init__(self, texts: List[str], k1: float = BM25_K1, b: float = BM25_B, min_idf: float = BM25_MIN_IDF):
+        self.k1 = k1
+        self.b = b
+        self.min_idf = min_idf
+        self.vocabulary: Dict[str, int] = {}
+        doc_ids: List[int] = []
+        term_ids: List[int] = []
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[doc_id] = len(tokens)
+            for token in tokens:
+                term_ids.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                doc_ids.append(doc_id)
+
+        # Postings: (term, doc) pairs sorted by term, then doc; repeats collapse into tf
+        n_docs = max(len(texts), 1)
+        keys, counts = np.unique(np.asarray(term_ids, dtype=np.int64) * n_docs + np.asarray(doc_ids, dtype=np.int64),
+                                 return_counts=True)
+        self.terms = list(self.vocabulary)  # term id -> token
+        self.postings_docs = (keys % n_docs).astype(np.int32)
+        self.postings_tf = counts.astype(np.float32)
+        self.postings_offsets = np.searchsorted(keys // n_docs, np.arange(len(self.terms) + 1)).astype(np.int64)
+
+        self.doc_lengths = lengths
+        self.avg_doc_length = float(lengths.mean()) if len(texts) and lengths.mean() > 0 else 1.0
+        document_frequency = np.diff(self.postings_offsets).astype(np.float32)
+        self.idf = np.log1p((len(texts) - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        # Per-posting length norm is query independent, so it is folded in once
+        norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths / self.avg_doc_length)
+        self._posting_weights = self.postings_tf * (self.k1 + 1.0) / (self.postings_tf + norm[self.postings_docs])
+        self._mark_informative()
+
+    def _mark_informative(self):
+        """Terms that can anchor a lexical match: not generic, and rare enough (idf >= min_idf)"""
+        generic = np.fromiter((term in GENERIC_TERMS for term in self.terms), dtype=bool, count=len(self.terms))
+        self.informative = (np.asarray(self.idf) >= self.min_idf) & ~generic
+
+    def to_bundle(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """(arrays, metadata) for the index bundle"""
+        arrays = {
+            "postings_offsets": self.postings_offsets, "postings_docs": self.postings_docs,
+            "postings_tf": self.postings_tf, "doc_lengths": self.doc_lengths, "idf": self.idf,
+            "posting_weights": self._posting_weights,
+        }
+        return arrays, {"terms": self.terms, "k1": self.k1, "b": self.b, "avg_doc_length": self.avg_doc_length}
+
+    @classmethod
+    def from_bundle(cls, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> "BM25Index":
+        """Index with its postings memory-mapped from the bundle (no re-tokenizing)"""
+        index = cls([], meta["k1"], meta["b"])
+        index.terms = list(meta["terms"])
+        index.vocabulary = {term: i for i, term in enumerate(index.terms)}
+        index.postings_offsets = arrays["postings_offsets"]
+        index.postings_docs = arrays["postings_docs"]
+        index.postings_tf = arrays["postings_tf"]
+        index.doc_lengths = arrays["doc_lengths"]
+        index.idf = arrays["idf"]
+        index._posting_weights = arrays["posting_weights"]
+        index.avg_doc_length = meta["avg_doc_length"]
+        index._mark_informative()
+        return index
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def _query_terms(self, query: str) -> np.ndarray:
+        """Vocabulary ids of the query's distinct known terms"""
+        ids = {self.vocabulary[token] for token in tokenize(query) if token in self.vocabulary}
+        return np.fromiter(sorted(ids), dtype=np.int64, count=len(ids))
+
+    def _gather(self, terms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(posting positions, per-posting term id) for every posting of terms, in one flat gather"""
+        starts, ends = self.postings_offsets[terms], self.postings_offsets[terms + 1]
+        lengths = ends - starts
+        positions = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths) + np.arange(lengths.sum())
+        return positions, np.repeat(terms, lengths)
+
+    def scores(self, query: str, anchored: bool = False) -> np.ndarray:
+        """BM25 score of every document for query (0 where no term matches)
+        anchored: also 0 where the document matches only generic / near-ubiquitous terms"""
+        terms = self._query_terms(query)
+        if not len(terms):
+            return np.zeros(len(self), dtype=np.float32)
+        positions, posting_terms = self._gather(terms)
+        docs = self.postings_docs[positions]
+        weights = self._posting_weights[positions] * self.idf[posting_terms]
+        scores = np.bincount(docs, weights=weights, minlength=len(self)).astype(np.float32)
+        if anchored:
+            scores[~np.isin(np.arange(len(self)), docs[self.informative[posting_terms]])] = 0.0
+        return scores
+
+    def scores_batch(self, queries: List[str], anchored: bool = False) -> np.ndarray:
+        """(n_queries, n_docs) BM25 scores"""
+        if not queries:
+            return np.zeros((0, len(self)), dtype=np.float32)
+        return np.stack([self.scores(query, anchored) for query in queries])
+
+    def matched_terms(self, query: str, doc_id: int) -> List[str]:
+        """Query terms that occur in a document (for score breakdowns)"""
+        matched = []
+        for term in self._query_terms(query):
+            docs = self.postings_docs[self.postings_offsets[term]:self.postings_offsets[term + 1]]
+            position = np.searchsorted(docs, doc_id)
+            if position < len(docs) and docs[position] == doc_id:
+                matched.append(self.terms[term])
+        return matched
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Build the resume index bundle (see index_bundle.py)
+
+Compiles resume_data.json into memory-mappable .npy arrays + manifest so API workers
+start without re-encoding items, chunks or the tech vocabulary. Re-run after editing
+the resume data or changing EMBEDDING_BACKEND; stale parts are ignored (and rebuilt
+in-process) until then.
+
+Usage: python build_index.py [--resume-data resume_data.json] [--out DIR] [--backend torch] [--verify]
+"""
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from index_bundle import IndexBundle, default_bundle_dir, file_sha256, write_bundle
+
+
+def build_index(resume_data_path: str, out_dir: str = None, embedding_backend: str = None) -> IndexBundle:
+    """Build every index from scratch and write the bundle; returns the written bundle"""
+    from model_registry import embedding_model_id
+    from resume_query_processor import ResumeQueryProcessor
+
+    out_dir = out_dir or default_bundle_dir(resume_data_path)
+    started = time.perf_counter()
+    processor = ResumeQueryProcessor(resume_data_path, embedding_backend, use_index_bundle=False)
+    parts = processor.index_bundle_parts()
+    if processor.semantic_model is None:
+        print("⚠️ Embedding model unavailable: bundling lexical/date/fuzzy indexes only")
+    else:
+        from rag_service import ResumeRAG
+        rag = ResumeRAG(resume_data_path, index_mode="exact", quantization="none",
+                        embedding_backend=embedding_backend, chunk_index=True, use_index_bundle=False)
+        parts.update(rag.index_bundle_parts())
+
+    manifest = write_bundle(out_dir, parts, file_sha256(resume_data_path), embedding_model_id(embedding_backend))
+    total_bytes = sum(entry["bytes"] for entry in manifest["arrays"].values())
+    print(f"📦 Wrote {len(parts)} parts / {len(manifest['arrays'])} arrays ({total_bytes / 1024:.1f} KB) "
+          f"to {out_dir} in {time.perf_counter() - started:.1f}s")
+    return IndexBundle(out_dir, manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mappable resume index bundle")
+    default_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json")
+    parser.add_argument("--resume-data", default=default_data, help="Resume JSON to index")
+    parser.add_argument("--out", help="Bundle directory (default: INDEX_BUNDLE_DIR or <index cache>/bundle)")
+    parser.add_argument("--backend", help="Embedding backend: torch / torch-int8 / onnx / onnx-int8 (default EMBEDDING_BACKEND)")
+    parser.add_argument("--verify", action="store_true", help="Only check an existing bundle's files against its manifest")
+    args = parser.parse_args()
+
+    if args.verify:
+        path = args.out or default_bundle_dir(args.resume_data)
+        bundle = IndexBundle.open(path, file_sha256(args.resume_data))
+        if bundle is None:
+            print(f"❌ No usable bundle at {path}")
+            sys.exit(1)
+        corrupt = bundle.verify()
+        if corrupt:
+            print(f"❌ Corrupt arrays: {', '.join(corrupt)}")
+            sys.exit(1)
+        print(f"✅ Bundle OK: {bundle.stats()}")
+        return
+
+    build_index(args.resume_data, args.out, args.backend)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Shared pytest fixtures for the backend test scripts
+"""
+import contextlib
+import sys
+
+import pytest
+
+
+@contextlib.contextmanager
+def embedding_model_blocked():
+    """sentence-transformers is unimportable inside the block only (processors fall back to lexical
+    matching, RAG tests swap in fake encoders); for import-time setup and script runs"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setitem(sys.modules, "sentence_transformers", None)
+        yield
+
+
+@pytest.fixture
+def no_embedding_model(monkeypatch):
+    """embedding_model_blocked for one test, undone before the next test file runs"""
+    monkeypatch.setitem(sys.modules, "sentence_transformers", None)
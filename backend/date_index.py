@@ -0,0 +1,157 @@
+"""
+Date Index - Start/end years parsed once per item, filtered as NumPy interval masks
+Each section keeps int arrays of (kind, start_year, end_year) parsed from "dates"/"date"
+at load time, so filter_by_date evaluates one vectorized comparison per section instead
+of re-running regexes per item. Date-ordered views are precomputed too: whole sections
+come back ready-sorted, and subsets are ordered by precomputed key ranks (a bucket pass,
+same order as sorted(..., reverse=True)).
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from item_locator import ItemLocator
+
+YEAR_PATTERN = re.compile(r'(20[0-9]{2})')
+
+# Interval kinds
+NO_DATE, DATE_RANGE, SINGLE_DATE = 0, 1, 2
+
+# How each date-ordered view reads its sort key (most recent first)
+DATE_SORT_KEYS: Dict[str, Callable[[Dict], Any]] = {
+    "date": lambda item: item.get("date", "2020"),
+    "dates": lambda item: item.get("dates", "2020"),
+    "dates_or_date": lambda item: item.get("dates", item.get("date", "2020")),
+}
+
+
+def parse_date_interval(item: Dict) -> Tuple[int, int, int]:
+    """(kind, start_year, end_year) for an item, e.g. "Mar. 2024 – Jan. 2025" -> (DATE_RANGE, 2024, 2025)"""
+    dates_field = item.get("dates", item.get("date", ""))
+    if not dates_field:
+        return NO_DATE, 0, 0
+
+    if "–" in dates_field or "-" in dates_field:
+        separator = "–" if "–" in dates_field else "-"
+        parts = dates_field.split(separator)
+        if len(parts) == 2:
+            start_year_match = YEAR_PATTERN.search(parts[0].strip())
+            end_year_match = YEAR_PATTERN.search(parts[1].strip())
+            if start_year_match and end_year_match:
+                return DATE_RANGE, int(start_year_match.group(1)), int(end_year_match.group(1))
+        return NO_DATE, 0, 0
+
+    # Single date (e.g., "Feb 2025")
+    year_match = YEAR_PATTERN.search(dates_field)
+    if year_match:
+        year = int(year_match.group(1))
+        return SINGLE_DATE, year, year
+    return NO_DATE, 0, 0
+
+
+def interval_mask(kinds: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  target_years: List[int], date_modifier: Optional[str]) -> np.ndarray:
+    """Which intervals pass a date filter (same rules filter_by_date always applied)"""
+    targets = np.asarray(target_years, dtype=np.int32)
+    starts_in = np.isin(starts, targets)
+    ends_in = np.isin(ends, targets)
+
+    if date_modifier == "from_only":
+        # Only items that START in one of the target years
+        range_mask = starts_in
+    elif date_modifier == "in_only":
+        # Only items that are ENTIRELY within target years
+        range_mask = starts_in & ends_in
+    elif date_modifier == "from":
+        # Items that START in target year or END in target year (inclusive)
+        range_mask = starts_in | ends_in
+    elif date_modifier == "after":
+        # Items that start after target year
+        range_mask = starts > targets.max()
+    elif date_modifier == "before":
+        # Items that end before target year
+        range_mask = ends < targets.min()
+    else:
+        # in / during / last_two_years / default: items that overlap with any target year
+        range_mask = ((starts[:, None] <= targets) & (targets <= ends[:, None])).any(axis=1)
+
+    # Single dates only ever match their own year
+    return ((kinds == DATE_RANGE) & range_mask) | ((kinds == SINGLE_DATE) & starts_in)
+
+
+class DateIndex:
+    """Per-section interval arrays and date-ordered views, built once at load"""
+
+    def __init__(self, sections: Dict[str, object], intervals: Optional[np.ndarray] = None):
+        """intervals: prebuilt (kind, start, end) rows for every item, sections in order (from the index bundle)"""
+        self.locator = ItemLocator(sections)
+        self.sections: Dict[str, List[Dict]] = self.locator.sections
+        if intervals is not None and len(intervals) != sum(len(items) for items in self.sections.values()):
+            raise ValueError(f"Expected one date interval per item, got {len(intervals)}")
+        self._intervals: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        start = 0
+        for name, items in self.sections.items():
+            if intervals is not None:
+                parsed = intervals[start:start + len(items)]
+                start += len(items)
+            else:
+                parsed = np.array([parse_date_interval(item) for item in items], dtype=np.int32).reshape(-1, 3)
+            self._intervals[name] = (parsed[:, 0], parsed[:, 1], parsed[:, 2])
+
+        # Dense rank of every sort key value seen at load (0 = most recent), plus sorted sections
+        self._key_ranks: Dict[str, Dict[Any, int]] = {}
+        self._sorted_views: Dict[str, Dict[str, List[Dict]]] = {}
+        for key_name, key in DATE_SORT_KEYS.items():
+            values = {key(item) for items in self.sections.values() for item in items}
+            self._key_ranks[key_name] = {value: rank for rank, value in enumerate(sorted(values, reverse=True))}
+            self._sorted_views[key_name] = {
+                name: sorted(items, key=key, reverse=True) for name, items in self.sections.items()
+            }
+
+    def intervals(self) -> np.ndarray:
+        """(kind, start_year, end_year) of every item, sections in order (the index bundle's copy)"""
+        parsed = [np.stack(self._intervals[name], axis=1) for name in self.sections]
+        return np.concatenate(parsed) if parsed else np.zeros((0, 3), dtype=np.int32)
+
+    def filter(self, items: List[Dict], target_years: List[int], date_modifier: Optional[str]) -> List[Dict]:
+        """Items passing the date filter, in input order (items not in the index are parsed directly)"""
+        masks: Dict[str, np.ndarray] = {}
+
+        def section_mask(name: str) -> np.ndarray:
+            if name not in masks:
+                masks[name] = interval_mask(*self._intervals[name], target_years, date_modifier)
+            return masks[name]
+
+        name = self.locator.section_of(items)
+        if name is not None:
+            return [items[position] for position in np.flatnonzero(section_mask(name))]
+
+        filtered_items = []
+        for item in items:
+            location = self.locator.locate(item)
+            if location is not None:
+                name, position = location
+                if section_mask(name)[position]:
+                    filtered_items.append(item)
+            else:
+                interval = np.array([parse_date_interval(item)], dtype=np.int32)
+                if interval_mask(interval[:, 0], interval[:, 1], interval[:, 2], target_years, date_modifier)[0]:
+                    filtered_items.append(item)
+        return filtered_items
+
+    def sort(self, items: List[Dict], key_name: str = "date") -> List[Dict]:
+        """Most recent first by the given key - identical to sorted(items, key=..., reverse=True)"""
+        name = self.locator.section_of(items)
+        if name is not None:
+            return list(self._sorted_views[key_name][name])
+
+        key, ranks = DATE_SORT_KEYS[key_name], self._key_ranks[key_name]
+        buckets: Dict[int, List[Dict]] = {}
+        for item in items:
+            rank = ranks.get(key(item))
+            if rank is None:
+                # A date never seen at load time: fall back to a real sort
+                return sorted(items, key=key, reverse=True)
+            buckets.setdefault(rank, []).append(item)
+        return [item for rank in sorted(buckets) for item in buckets[rank]]
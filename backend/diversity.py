@@ -0,0 +1,146 @@
+"""
+Diversity - Maximal Marginal Relevance card selection
+Picks k of N result cards by λ·relevance − (1−λ)·(max similarity to the cards already
+picked), with per-section quotas so one content type can't take every slot. Item vectors
+are the RAG item embeddings (same content-hash cache, so nothing is re-encoded) and the
+item-item cosine matrix is computed once per processor; each pick then costs one row
+gather and one np.maximum over the N candidates, O(N·k) overall.
+"""
+import math
+import os
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tech_embeddings import l2_normalize
+
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))  # 1.0 = pure relevance, 0.0 = pure novelty
+MMR_SECTION_QUOTA = int(os.getenv("MMR_SECTION_QUOTA", "0"))  # Max cards per section (0 = ceil(k / sections present))
+DIVERSITY_SECTIONS = ("projects", "experience", "publications", "education")
+
+ItemKey = Tuple[str, str]  # (content_source, item id)
+
+
+def item_key(item: Dict[str, Any]) -> ItemKey:
+    return item.get("content_source", "unknown"), str(item.get("id", ""))
+
+
+def relevance_scores(items: List[Dict[str, Any]]) -> np.ndarray:
+    """Relevance in [0, 1] on the same scale as cosine similarity: min-max normalized RAG scores when
+    every item has one (RRF scores are at most ~0.033), else rank order (the processor returns best first)"""
+    if items and all(isinstance(item.get("rag_score"), (int, float)) for item in items):
+        scores = np.asarray([item["rag_score"] for item in items], dtype=np.float32)
+        spread = float(scores.max() - scores.min())
+        return (scores - scores.min()) / spread if spread > 0 else np.ones(len(items), dtype=np.float32)
+    return 1.0 - np.arange(len(items), dtype=np.float32) / max(len(items), 1)
+
+
+def mmr_select(relevance: np.ndarray, similarity: np.ndarray, rows: np.ndarray, sections: List[str], k: int,
+               lambda_: float = MMR_LAMBDA, quotas: Optional[Dict[str, int]] = None,
+               default_quota: Optional[int] = None) -> List[int]:
+    """Candidate indices picked by MMR, in pick order
+    similarity: cached (M, M) cosine matrix; rows[i]: candidate i's row in it
+    quotas: per-section caps (others use default_quota); ignored once no capped-in candidate is left"""
+    n = len(relevance)
+    k = min(k, n)
+    section_names = list(dict.fromkeys(sections))
+    codes = np.asarray([section_names.index(section) for section in sections], dtype=np.int64)
+    caps = [(quotas or {}).get(section, default_quota) for section in section_names]
+    counts = [0] * len(section_names)
+    available = np.ones(n, dtype=bool)
+    within_quota = np.ones(n, dtype=bool)
+    max_similarity = np.zeros(n, dtype=np.float32)
+    picked: List[int] = []
+    for _ in range(k):
+        scores = lambda_ * relevance - (1.0 - lambda_) * max_similarity if picked else relevance
+        allowed = available & within_quota
+        if not allowed.any():
+            allowed = available  # Quotas can't fill k: take the best of the rest
+        pick = int(np.argmax(np.where(allowed, scores, -np.inf)))
+        picked.append(pick)
+        available[pick] = False
+        # One cached row, gathered for the candidates only
+        max_similarity = np.maximum(max_similarity, similarity[rows[pick], rows])
+        code = codes[pick]
+        counts[code] += 1
+        if caps[code] is not None and counts[code] >= caps[code]:
+            within_quota &= codes != code
+    return picked
+
+
+class DiversitySelector:
+    """Item vectors + cached cosine matrix for MMR over result cards"""
+
+    def __init__(self, embeddings: Optional[np.ndarray] = None, keys: Optional[List[ItemKey]] = None):
+        keys = keys or []
+        dim = embeddings.shape[1] if embeddings is not None and len(keys) else 1
+        # Extra zero row: items without a vector are "unlike everything"
+        matrix = np.zeros((len(keys) + 1, dim), dtype=np.float32)
+        if len(keys):
+            matrix[:-1] = l2_normalize(np.asarray(embeddings, dtype=np.float32))
+        self.rows = {key: row for row, key in enumerate(keys)}
+        self.similarity = matrix @ matrix.T
+
+    @classmethod
+    def from_processor(cls, processor: Any) -> "DiversitySelector":
+        """Vectors for the processor's resume items from the RAG item-embedding cache"""
+        model = getattr(processor, "semantic_model", None)
+        if model is None:
+            return cls()
+        from embedding_cache import EmbeddingCache
+        from model_registry import embedding_model_id
+        from rag_service import ResumeRAG
+        from tech_embeddings import default_index_cache_dir
+
+        items = [(section, item) for section in DIVERSITY_SECTIONS for item in processor.resume_data.get(section, [])]
+        cache = EmbeddingCache(default_index_cache_dir(processor.resume_data_path),
+                               model_id=embedding_model_id(getattr(processor, "embedding_backend", None)))
+        embeddings = cache.encode([ResumeRAG._item_text(item) for _, item in items],
+                                  lambda texts: model.encode(texts, show_progress_bar=False))
+        return cls(embeddings, [(section, str(item.get("id", ""))) for section, item in items])
+
+    def select(self, items: List[Dict[str, Any]], max_items: int, lambda_: float = MMR_LAMBDA,
+               quotas: Optional[Dict[str, int]] = None, default_quota: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Up to max_items cards, relevant but unlike each other, spread across sections"""
+        if len(items) <= max_items:
+            return items
+        sections = [item.get("content_source", "unknown") for item in items]
+        if default_quota is None:
+            default_quota = MMR_SECTION_QUOTA or math.ceil(max_items / len(set(sections)))
+        missing = len(self.similarity) - 1
+        rows = np.asarray([self.rows.get(item_key(item), missing) for item in items], dtype=np.int64)
+        picked = mmr_select(relevance_scores(items), self.similarity, rows, sections, max_items,
+                            lambda_, quotas, default_quota)
+        return [items[i] for i in picked]
+
+
+_selectors: "weakref.WeakKeyDictionary[Any, DiversitySelector]" = weakref.WeakKeyDictionary()
+_selectors_lock = threading.Lock()
+
+
+def get_diversity_selector(processor: Any) -> DiversitySelector:
+    """Selector for a query processor, built once (a reloaded processor gets a fresh one)"""
+    selector = _selectors.get(processor)
+    if selector is None:
+        with _selectors_lock:
+            selector = _selectors.get(processor)
+            if selector is None:
+                try:
+                    selector = DiversitySelector.from_processor(processor)
+                except Exception as e:
+                    print(f"⚠️ Item embeddings unavailable for diversity selection ({e}), using relevance + quotas only")
+                    selector = DiversitySelector()
+                _selectors[processor] = selector
+    return selector
+
+
+def select_diverse_items(items: List[Dict[str, Any]], max_items: int, processor: Any = None, **options) -> List[Dict[str, Any]]:
+    """MMR selection of result cards (options: lambda_, quotas, default_quota)"""
+    if len(items) <= max_items:
+        return items
+    if processor is None:
+        from resume_query_processor import get_query_processor
+        processor = get_query_processor()
+    return get_diversity_selector(processor).select(items, max_items, **options)
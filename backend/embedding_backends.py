@@ -0,0 +1,147 @@
+"""
+Embedding Backends - Alternate CPU runtimes for the MiniLM sentence embedding model
+  torch       SentenceTransformer as-is (default)
+  torch-int8  torch dynamic int8 quantization of every Linear layer
+  onnx        transformer exported to ONNX, run with onnxruntime; mean pooling + L2
+              normalization done in NumPy exactly like the SentenceTransformer pipeline
+  onnx-int8   the ONNX export with onnxruntime dynamic int8 weight quantization
+Every backend exposes SentenceTransformer.encode(), so RAG and the query processor
+don't care which one they get. Heavy imports stay inside the loaders.
+"""
+
+import inspect
+import os
+from typing import Any, List, Optional
+
+import numpy as np
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+ONNX_EXPORT_DIR = os.getenv("ONNX_EXPORT_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".index_cache", "onnx")
+ONNX_OPSET = 14
+
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Mask-weighted mean over tokens (sentence_transformers Pooling, mode 'mean')"""
+    mask = attention_mask[..., None].astype(np.float32)
+    return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def _pipeline_config(st_model: Any):
+    """(transformer module, normalize?) of a SentenceTransformer, checking it pools by mean"""
+    modules = list(st_model)
+    transformer = modules[0]
+    pooling = next((module for module in modules if type(module).__name__ == "Pooling"), None)
+    config = pooling.get_config_dict() if pooling is not None else {}
+    # sentence-transformers 2.x/3.x store one flag per mode, newer releases a single 'pooling_mode'
+    flags = [key for key, value in config.items() if key.startswith("pooling_mode_") and value is True]
+    if config.get("pooling_mode", "mean" if flags == ["pooling_mode_mean_tokens"] else None) != "mean":
+        raise ValueError("ONNX backend only reproduces mean pooling")
+    normalize = any(type(module).__name__ == "Normalize" for module in modules)
+    return transformer, normalize
+
+
+def quantize_torch_dynamic(st_model: Any) -> Any:
+    """Copy of the model with int8 dynamic quantization on Linear layers (CPU only)"""
+    import torch
+    quantize_dynamic = getattr(getattr(torch, "ao", None), "quantization", torch.quantization).quantize_dynamic
+    return quantize_dynamic(st_model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxSentenceEncoder:
+    """SentenceTransformer-compatible encoder running the exported transformer in onnxruntime"""
+
+    def __init__(self, st_model: Any, export_dir: str = ONNX_EXPORT_DIR, model_id: str = "minilm", quantize: bool = False):
+        import onnxruntime as ort
+
+        transformer, self.normalize = _pipeline_config(st_model)
+        self.tokenizer = st_model.tokenizer
+        self.max_seq_length = st_model.max_seq_length
+        safe_id = model_id.replace("/", "__").replace("@", "_")
+        self.model_path = os.path.join(export_dir, f"{safe_id}.onnx")
+        if not os.path.exists(self.model_path):
+            self._export(transformer.auto_model, self.model_path)
+        if quantize:
+            quantized_path = os.path.join(export_dir, f"{safe_id}.int8.onnx")
+            if not os.path.exists(quantized_path):
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                tmp_path = f"{quantized_path}.{os.getpid()}.tmp"
+                quantize_dynamic(self.model_path, tmp_path, weight_type=QuantType.QInt8)
+                os.replace(tmp_path, quantized_path)
+            self.model_path = quantized_path
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def _export(self, auto_model: Any, path: str):
+        """torch.onnx.export of the HF transformer with dynamic batch/sequence axes (atomic)"""
+        import torch
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        sample = self.tokenizer(["onnx export sample"], return_tensors="pt")
+        input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+        kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+
+        class _LastHiddenState(torch.nn.Module):
+            """Keyword call into the HF model (forward's positional order differs across transformers releases)"""
+            def __init__(self):
+                super().__init__()
+                self.model = auto_model
+
+            def forward(self, *inputs):
+                return self.model(**dict(zip(input_names, inputs)), return_dict=False)[0]
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        was_training = auto_model.training
+        auto_model.eval()
+        try:
+            with torch.no_grad():
+                torch.onnx.export(
+                    _LastHiddenState(), tuple(sample[name] for name in input_names), tmp_path,
+                    input_names=input_names, output_names=["last_hidden_state"],
+                    dynamic_axes=dynamic_axes, opset_version=ONNX_OPSET, **kwargs
+                )
+            os.replace(tmp_path, path)
+        finally:
+            auto_model.train(was_training)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(f"📦 Exported embedding model to {path}")
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """float32 embeddings like SentenceTransformer.encode (1-D for a single string)"""
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+        output = np.zeros((len(texts), 0), dtype=np.float32)
+        # Length-sorted batches keep padding small (same trick as SentenceTransformer)
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        for start in range(0, len(texts), batch_size):
+            batch_ids = order[start:start + batch_size]
+            features = self.tokenizer([texts[i] for i in batch_ids], padding=True, truncation=True,
+                                      max_length=self.max_seq_length, return_tensors="np")
+            feeds = {name: np.asarray(value, dtype=np.int64) for name, value in features.items() if name in self.input_names}
+            token_embeddings = self.session.run(["last_hidden_state"], feeds)[0]
+            pooled = mean_pool(token_embeddings, features["attention_mask"])
+            if output.shape[1] == 0:
+                output = np.zeros((len(texts), pooled.shape[1]), dtype=np.float32)
+            output[batch_ids] = pooled
+        if self.normalize or normalize_embeddings:
+            norms = np.linalg.norm(output, axis=1, keepdims=True)
+            output = output / np.clip(norms, 1e-12, None)
+        return output[0] if single else output
+
+
+def load_embedding_backend(st_model: Any, backend: str, model_id: str, export_dir: Optional[str] = None) -> Any:
+    """Wrap/convert a loaded SentenceTransformer for the requested backend"""
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r} (expected one of {EMBEDDING_BACKENDS})")
+    if backend == "torch":
+        return st_model
+    if backend == "torch-int8":
+        return quantize_torch_dynamic(st_model)
+    return OnnxSentenceEncoder(st_model, export_dir or ONNX_EXPORT_DIR, model_id=model_id, quantize=backend == "onnx-int8")
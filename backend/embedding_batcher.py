@@ -0,0 +1,202 @@
+"""
+Embedding Batcher - Cross-request micro-batching of SentenceTransformer.encode calls
+Concurrent requests each embed one short query; on CPU most of a single-text encode is
+per-call tokenizer/forward overhead. Requests are queued on the app's event loop, held
+for up to EMBED_BATCH_MAX_WAIT_MS (or until EMBED_BATCH_MAX_SIZE texts are waiting),
+encoded together in a worker thread, and each caller's future gets its own rows.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+
+# Event loop the batchers run on (set by the API server at startup; None = encode directly)
+_batching_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class EmbeddingBatcher:
+    """SentenceTransformer-compatible encode() that micro-batches across threads and coroutines"""
+
+    def __init__(self, model: Any, max_batch_size: int = EMBED_BATCH_MAX_SIZE,
+                 max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._oldest_arrival = 0.0  # loop.time() when the oldest pending request arrived
+        self._wakeup: Optional[asyncio.Event] = None
+        self._full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Own encode thread: the default executor can be full of request threads blocked on our futures
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-batcher")
+        self.stats = {"requests": 0, "batches": 0, "texts": 0, "max_batch": 0, "direct_calls": 0}
+
+    # ---- async API -------------------------------------------------------
+
+    def _ensure_worker(self):
+        """Start the drain task on the running loop (restarted if the loop changed)"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._loop is not loop or self._worker.done():
+            self._loop = loop
+            self._pending, self._pending_texts = [], 0
+            self._wakeup, self._full = asyncio.Event(), asyncio.Event()
+            self._worker = loop.create_task(self._drain())
+
+    async def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embeddings of texts, encoded together with whatever else arrives within the wait window"""
+        if not texts:
+            return np.asarray(self.model.encode([], show_progress_bar=False))
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            self._oldest_arrival = loop.time()
+        self._pending.append((list(texts), future))
+        self._pending_texts += len(texts)
+        self.stats["requests"] += 1
+        self._wakeup.set()
+        if self._pending_texts >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def embed(self, text: str) -> np.ndarray:
+        return (await self.embed_many([text]))[0]
+
+    async def close(self):
+        """Stop the drain task (pending callers get CancelledError)"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        for _, future in self._pending:
+            future.cancel()
+        self._pending, self._pending_texts, self._worker = [], 0, None
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            # Requests that queued up during the previous encode have already waited
+            remaining = self._oldest_arrival + self.max_wait_s - loop.time()
+            if self._pending_texts < self.max_batch_size and remaining > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._take_batch()
+            if self._pending:
+                self._oldest_arrival = loop.time()
+            else:
+                self._wakeup.clear()
+            if self._pending_texts < self.max_batch_size:
+                self._full.clear()
+            if batch:
+                await self._run_batch(batch)
+
+    def _take_batch(self) -> List[Tuple[List[str], asyncio.Future]]:
+        """Whole requests, oldest first, up to max_batch_size texts (an oversized request goes alone)"""
+        batch, size = [], 0
+        while self._pending and (not batch or size + len(self._pending[0][0]) <= self.max_batch_size):
+            texts, future = self._pending.pop(0)
+            self._pending_texts -= len(texts)
+            if future.cancelled():
+                continue
+            batch.append((texts, future))
+            size += len(texts)
+        return batch
+
+    async def _run_batch(self, batch: List[Tuple[List[str], asyncio.Future]]):
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        self.stats["batches"] += 1
+        self.stats["texts"] += len(texts)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(texts))
+        try:
+            vectors = np.asarray(await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(self.model.encode, texts, show_progress_bar=False)))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for request_texts, future in batch:
+            if not future.done():
+                future.set_result(vectors[start:start + len(request_texts)])
+            start += len(request_texts)
+
+    # ---- sync API (what RAG / the query processor call from worker threads) ----
+
+    def encode(self, texts, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        """Drop-in for SentenceTransformer.encode: batched via the app loop when called off-loop"""
+        loop = _batching_loop
+        single = isinstance(texts, str)
+        if loop is None or loop.is_closed() or not loop.is_running() or kwargs or _on_loop(loop):
+            self.stats["direct_calls"] += 1
+            return self.model.encode(texts, show_progress_bar=show_progress_bar, **kwargs)
+        vectors = asyncio.run_coroutine_threadsafe(self.embed_many([texts] if single else list(texts)), loop).result()
+        return vectors[0] if single else vectors
+
+    def describe(self) -> Dict[str, Any]:
+        """Batching counters plus the configured limits"""
+        return {
+            **self.stats,
+            "avg_batch": round(self.stats["texts"] / self.stats["batches"], 2) if self.stats["batches"] else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+            "enabled": _batching_loop is not None,
+        }
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    """True when called from the loop's own thread (blocking on it there would deadlock)"""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+# One batcher per model object, shared by every caller in the process
+_batchers: Dict[int, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(model: Any) -> EmbeddingBatcher:
+    """Get or create the batcher wrapping model"""
+    with _batchers_lock:
+        batcher = _batchers.get(id(model))
+        if batcher is None or batcher.model is not model:
+            batcher = _batchers[id(model)] = EmbeddingBatcher(model)
+        return batcher
+
+
+def enable_embedding_batching(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """Route off-loop encode() calls through this loop (call from the app's startup hook)"""
+    global _batching_loop
+    _batching_loop = loop or asyncio.get_running_loop()
+
+
+async def disable_embedding_batching():
+    """Back to direct encode() calls; stops the drain tasks (call from the app's shutdown hook)"""
+    global _batching_loop
+    _batching_loop = None
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+    for batcher in batchers:
+        await batcher.close()
+
+
+def get_batcher_stats() -> List[Dict[str, Any]]:
+    with _batchers_lock:
+        return [batcher.describe() for batcher in _batchers.values()]
@@ -0,0 +1,120 @@
+"""
+Embedding Cache - Persistent item embeddings keyed by content hash and model
+Vectors live in an .npy file next to a JSON manifest listing the sha256 of the text
+behind each row. On startup only new or changed texts are re-encoded. Both files are
+written via temp file + rename and the .npy name embeds its content digest, so workers
+sharing the directory always see a manifest whose matrix is complete.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from tech_embeddings import save_npy_atomic
+
+MANIFEST_VERSION = 1
+
+
+def text_hash(text: str) -> str:
+    """Stable key of an embedded text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def save_json_atomic(path: str, data: Dict[str, Any]):
+    """Write a JSON file via a temp file + rename"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class EmbeddingCache:
+    """Content-addressed store of text embeddings for one model"""
+
+    def __init__(self, cache_dir: str, model_id: str, name: str = "item_embeddings"):
+        self.cache_dir = cache_dir
+        self.model_id = model_id
+        model_digest = hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:12]
+        self.prefix = f"{name}_{model_digest}"
+        self.manifest_path = os.path.join(cache_dir, f"{self.prefix}.json")
+        self.stats = {"cached": 0, "encoded": 0, "written": False}
+
+    def load(self) -> Dict[str, np.ndarray]:
+        """hash -> vector for everything currently cached ({} if missing, stale or unreadable)"""
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != MANIFEST_VERSION or manifest.get("model_id") != self.model_id:
+                return {}
+            matrix = np.load(os.path.join(self.cache_dir, manifest["matrix"]))
+            hashes = manifest["hashes"]
+            if matrix.ndim != 2 or matrix.shape[0] != len(hashes):
+                return {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable embedding cache {self.manifest_path}: {e}")
+            return {}
+        return dict(zip(hashes, matrix))
+
+    def save(self, hashes: List[str], matrix: np.ndarray):
+        """Persist rows + manifest (matrix first, so the manifest never points at a partial file)"""
+        content_digest = hashlib.sha256("\n".join(hashes).encode("utf-8")).hexdigest()[:12]
+        matrix_name = f"{self.prefix}_{content_digest}.npy"
+        previous = self._current_matrix_name()
+        save_npy_atomic(os.path.join(self.cache_dir, matrix_name), matrix)
+        save_json_atomic(self.manifest_path, {
+            "version": MANIFEST_VERSION,
+            "model_id": self.model_id,
+            "matrix": matrix_name,
+            "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+            "dtype": str(matrix.dtype),
+            "hashes": hashes,
+        })
+        if previous and previous != matrix_name:
+            try:
+                os.remove(os.path.join(self.cache_dir, previous))
+            except OSError:
+                pass  # Already replaced by another worker
+
+    def _current_matrix_name(self) -> Optional[str]:
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f).get("matrix")
+        except (OSError, ValueError):
+            return None
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Embeddings for texts (rows in order), encoding only texts not already cached"""
+        hashes = [text_hash(text) for text in texts]
+        cached = self.load()
+        missing = list(dict.fromkeys(h for h in hashes if h not in cached))
+        self.stats["cached"] = len(hashes) - sum(1 for h in hashes if h not in cached)
+        self.stats["encoded"] = len(missing)
+
+        if missing:
+            text_by_hash = dict(zip(hashes, texts))
+            fresh = np.asarray(encode_fn([text_by_hash[h] for h in missing]))
+            cached.update(zip(missing, fresh))
+        if not hashes:
+            return np.asarray(encode_fn([]))
+
+        matrix = np.stack([cached[h] for h in hashes])
+        unique_hashes = list(dict.fromkeys(hashes))
+        if missing or len(cached) != len(unique_hashes):
+            try:
+                self.save(unique_hashes, np.stack([cached[h] for h in unique_hashes]))
+                self.stats["written"] = True
+            except OSError as e:
+                print(f"⚠️ Could not persist embeddings to {self.cache_dir}: {e}")
+        return matrix
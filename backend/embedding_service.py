@@ -0,0 +1,124 @@
+"""
+Embedding Service - Process-wide LRU of query embeddings
+RAG search and semantic tech matching embed the same user text several times per
+request, and popular queries repeat across requests. Embeddings are cached as float32,
+keyed by model and normalized text (case and whitespace folded - MiniLM is uncased),
+in a bounded, thread-safe LRU with hit-rate and memory stats.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from model_registry import EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_VERSION
+
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+DEFAULT_MODEL_ID = f"{EMBEDDING_MODEL_NAME}@{EMBEDDING_MODEL_VERSION}"
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a text: lowercased, whitespace collapsed"""
+    return " ".join(text.lower().split())
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of (model, normalized text) -> float32 embedding"""
+
+    def __init__(self, max_entries: int = QUERY_EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "encode_calls": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+            return vector
+
+    def _put(self, key: Tuple[str, str], vector: np.ndarray):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = vector
+            self._bytes += vector.nbytes
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.metrics["evictions"] += 1
+
+    def encode_many(self, model: Any, texts: List[str], model_id: str = DEFAULT_MODEL_ID) -> np.ndarray:
+        """float32 embeddings (one row per text), encoding only the texts not cached in one call"""
+        keys = [(model_id, normalize_query(text)) for text in texts]
+        vectors: Dict[Tuple[str, str], np.ndarray] = {}
+        missing: List[Tuple[str, str]] = []
+        for key in keys:
+            if key in vectors or key in missing:
+                continue
+            cached = self._get(key)
+            if cached is None:
+                missing.append(key)
+            else:
+                vectors[key] = cached
+
+        if missing:
+            with self._lock:
+                self.metrics["encode_calls"] += 1
+            encoded = np.asarray(model.encode([text for _, text in missing], show_progress_bar=False), dtype=np.float32)
+            for key, vector in zip(missing, encoded):
+                vector = np.ascontiguousarray(vector)
+                vector.setflags(write=False)  # Callers get stacked copies, never the cached array
+                vectors[key] = vector
+                self._put(key, vector)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def encode(self, model: Any, text: str, model_id: str = DEFAULT_MODEL_ID) -> np.ndarray:
+        """float32 embedding of one text"""
+        return self.encode_many(model, [text], model_id)[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, memory and hit/miss counters"""
+        with self._lock:
+            lookups = self.metrics["hits"] + self.metrics["misses"]
+            return {
+                **self.metrics,
+                "hit_rate": round(self.metrics["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": self._bytes,
+            }
+
+
+# Singleton shared by every embedding consumer in the process
+_query_cache: Optional[QueryEmbeddingCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get or create the process-wide query embedding cache"""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryEmbeddingCache()
+    return _query_cache
@@ -0,0 +1,186 @@
+"""
+Entity Index - Company / project / publication lookup for "what did he do at X" queries
+Each item's searchable text (company, title, description) is lowercased once and posted
+under its character trigrams, one int bitset per section. An entity word then narrows to
+the items holding all of its trigrams before the substring check, so a lookup touches
+only the items that can match. Organization/title initialisms ("prl" -> People & Robots
+Lab) are indexed as aliases, and known ASR mishearings are normalized up front.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from item_locator import ItemLocator
+
+# Sections that can hold a named entity, in the order matches are reported
+ENTITY_SECTIONS = ["experience", "projects", "publications"]
+
+# Questions that name a specific company/project (first pattern with matching items wins)
+ENTITY_QUERY_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(?i)what.*did.*he.*do.*(?:at|in|for)\s+(.+?)(?:\?|$)',
+    r'(?i)what.*specifically.*(?:at|in|for)\s+(.+?)(?:\?|$)',
+    r'(?i)tell me about.*(?:his work|experience).*(?:at|in|for)\s+(.+?)(?:\?|$)',
+    r'(?i)(?:at|in|for)\s+(.+?)(?:\?|$)',
+    r'(?i)about.*(.+?)\s+(?:lab|company|inc|corp|llc|organization)(?:\?|$)',
+    r'(?i)tell me about\s+(.+?)(?:\?|$)',  # General "tell me about X" pattern
+    r'(?i)\bin\s+(.+?)\s+(experience|company|job|role)\b',  # "in Quinnis experience"
+    r'(?i)\bat\s+(.+?)\s+(experience|company|job|role)\b',  # "at Quinnis experience"
+    r'(?i)(?:no,?\s*i\s*meant\s*)?what.*did.*he.*do.*(?:at|in)\s+(.+?)(?:\?|$)'  # Clarification patterns
+]]
+
+# Known speech recognition errors and variations -> the word used in the resume
+ENTITY_ASR_VARIANTS = {
+    "slap": "lab",
+    "lab": "lab",
+    "robot": "robots",
+    "robots": "robots",
+}
+_ASR_VARIANT_PATTERN = re.compile(r'\b(' + "|".join(ENTITY_ASR_VARIANTS) + r')\b', re.IGNORECASE)
+
+# Words that don't count towards an initialism ("People & Robots Lab" -> "prl")
+_INITIALISM_STOPWORDS = {"of", "for", "the", "and", "a", "an", "in", "on", "with"}
+
+
+def normalize_entity_name(entity_name: str) -> str:
+    """Replace known ASR mishearings ("the slap" -> "the lab")"""
+    return _ASR_VARIANT_PATTERN.sub(lambda match: ENTITY_ASR_VARIANTS[match.group(1).lower()], entity_name)
+
+
+def initialism(name: str) -> Optional[str]:
+    """Lowercase initials of a name's leading part, if it has at least three significant words"""
+    leading = re.split(r'[(,:—–]', name, maxsplit=1)[0]
+    words = [word for word in re.findall(r'[A-Za-z][\w\'.-]*', leading) if word.lower() not in _INITIALISM_STOPWORDS]
+    return "".join(word[0] for word in words).lower() if len(words) >= 3 else None
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass
+class EntityMatch:
+    """One item matching an entity name"""
+    section: str
+    position: int
+    item: dict
+    score: int  # entity words found in the item (1 for single-word and alias hits)
+
+
+class EntityIndex:
+    """Trigram + alias postings over the entity sections, built once at load"""
+
+    # Words kept per-word (substring bitsets) between lookups
+    MAX_CACHED_WORDS = 4096
+
+    def __init__(self, sections: Dict[str, object], reserved_terms: Iterable[str] = ()):
+        locator = ItemLocator(sections)
+        self.sections: Dict[str, List[Dict]] = {
+            name: locator.sections[name] for name in ENTITY_SECTIONS if name in locator.sections
+        }
+        self._texts: Dict[str, List[str]] = {
+            name: [" ".join([item.get("company", ""), item.get("title", ""), item.get("description", "")]).lower()
+                   for item in items]
+            for name, items in self.sections.items()
+        }
+
+        self._trigram_postings: Dict[str, Dict[str, int]] = {}
+        for name, texts in self._texts.items():
+            for position, text in enumerate(texts):
+                for gram in trigrams(text):
+                    postings = self._trigram_postings.setdefault(gram, {})
+                    postings[name] = postings.get(name, 0) | (1 << position)
+
+        # alias -> section -> bitset (initialisms that don't collide with other vocabulary)
+        reserved = {term.lower() for term in reserved_terms}
+        self._alias_postings: Dict[str, Dict[str, int]] = {}
+        for name, items in self.sections.items():
+            for position, item in enumerate(items):
+                for field in ("company", "title"):
+                    alias = initialism(item.get(field) or "")
+                    if alias and alias not in reserved:
+                        postings = self._alias_postings.setdefault(alias, {})
+                        postings[name] = postings.get(name, 0) | (1 << position)
+
+        self._word_cache: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def aliases(self) -> List[str]:
+        return sorted(self._alias_postings)
+
+    def _word_bits(self, word: str) -> Dict[str, int]:
+        """Section -> bitset of items whose text contains the word (as a substring)"""
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            return cached
+
+        grams = trigrams(word)
+        bits = {}
+        for name, texts in self._texts.items():
+            candidates = -1  # all items
+            for gram in grams:
+                candidates &= self._trigram_postings.get(gram, {}).get(name, 0)
+                if not candidates:
+                    break
+            if candidates == -1:
+                candidates = (1 << len(texts)) - 1
+            verified = 0
+            while candidates:
+                lowest = candidates & -candidates
+                position = lowest.bit_length() - 1
+                if word in texts[position]:
+                    verified |= lowest
+                candidates ^= lowest
+            bits[name] = verified
+
+        if len(self._word_cache) < self.MAX_CACHED_WORDS:
+            self._word_cache[word] = bits
+        return bits
+
+    def lookup(self, entity_name: str) -> List[EntityMatch]:
+        """Items matching an (already normalized) entity name, in section/resume order"""
+        entity_words = entity_name.lower().split()
+        scores: Dict[Tuple[str, int], int] = {}
+
+        if len(entity_words) >= 2:
+            # Multi-word entities: at least 2 significant (>2 char) words must appear
+            for word in entity_words:
+                if len(word) > 2:
+                    for name, bits in self._word_bits(word).items():
+                        while bits:
+                            lowest = bits & -bits
+                            key = (name, lowest.bit_length() - 1)
+                            scores[key] = scores.get(key, 0) + 1
+                            bits ^= lowest
+            scores = {key: score for key, score in scores.items() if score >= 2}
+        elif len(entity_words) == 1 and len(entity_words[0]) > 3:
+            # Single significant word
+            for name, bits in self._word_bits(entity_words[0]).items():
+                while bits:
+                    lowest = bits & -bits
+                    scores[(name, lowest.bit_length() - 1)] = 1
+                    bits ^= lowest
+
+        if not scores:
+            # Abbreviations ("prl", "emms") name the item directly
+            for name, bits in self._alias_postings.get(" ".join(entity_words), {}).items():
+                while bits:
+                    lowest = bits & -bits
+                    scores[(name, lowest.bit_length() - 1)] = 1
+                    bits ^= lowest
+
+        section_order = {name: rank for rank, name in enumerate(ENTITY_SECTIONS)}
+        return [
+            EntityMatch(name, position, self.sections[name][position], score)
+            for (name, position), score in sorted(scores.items(), key=lambda entry: (section_order[entry[0][0]], entry[0][1]))
+        ]
+
+    def detect(self, question: str) -> Optional[Tuple[str, List[EntityMatch]]]:
+        """(entity_name, matches) for the first question pattern whose entity matches any item"""
+        for pattern in ENTITY_QUERY_PATTERNS:
+            match = pattern.search(question)
+            if match:
+                entity_name = normalize_entity_name(match.group(1).strip())
+                matches = self.lookup(entity_name)
+                if matches:
+                    return entity_name, matches
+        return None
@@ -0,0 +1,111 @@
+"""
+Fuzzy Index - Prebuilt misspelling lookup over a fixed term list
+Scores are fuzzywuzzy's fuzz.ratio (2*matches / total length, rounded), and lookups
+return exactly what extractOne(text, terms, scorer=fuzz.ratio) would, but only the
+candidates whose length and character counts could still reach the threshold get scored.
+"""
+import re
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from fuzzywuzzy import fuzz
+    _ratio_backend = fuzz.ratio
+except ImportError:
+    _ratio_backend = None
+
+FUZZYWUZZY_AVAILABLE = _ratio_backend is not None
+
+_NON_WORD = re.compile(r"(?ui)\W")
+
+
+def full_process(text: str) -> str:
+    """fuzzywuzzy's default processor: non-word characters to spaces, lowercase, strip"""
+    return _NON_WORD.sub(" ", text).lower().strip()
+
+
+def ratio(a: str, b: str) -> int:
+    """fuzz.ratio - uses fuzzywuzzy when installed, the identical difflib formula otherwise"""
+    if _ratio_backend is not None:
+        return _ratio_backend(a, b)
+    if a == b:
+        return 100
+    if not a or not b:
+        return 0
+    return int(round(100 * SequenceMatcher(None, a, b).ratio()))
+
+
+class FuzzyTermIndex:
+    """Terms bucketed by character counts so a lookup only scores plausible candidates"""
+
+    def __init__(self, terms: Iterable[str], scorer: Callable[[str, str], int] = ratio):
+        self.terms: List[str] = list(terms)
+        self.scorer = scorer
+        self._processed = [full_process(term) for term in self.terms]
+
+        alphabet = sorted({ch for term in self._processed for ch in term})
+        self._char_index: Dict[str, int] = {ch: i for i, ch in enumerate(alphabet)}
+        self._lengths = np.array([len(term) for term in self._processed], dtype=np.int32)
+        self._counts = np.zeros((len(self.terms), max(len(alphabet), 1)), dtype=np.int16)
+        for row, term in enumerate(self._processed):
+            for ch in term:
+                self._counts[row, self._char_index[ch]] += 1
+
+        self.stats = {"lookups": 0, "candidates": 0}
+
+    def to_bundle(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """(arrays, metadata) for the index bundle"""
+        return {"lengths": self._lengths, "counts": self._counts}, {"terms": self.terms, "alphabet": list(self._char_index)}
+
+    @classmethod
+    def from_bundle(cls, arrays: Dict[str, np.ndarray], meta: Dict[str, Any],
+                    scorer: Callable[[str, str], int] = ratio) -> "FuzzyTermIndex":
+        """Index over the same terms without recounting characters (counts stay memory-mapped)"""
+        index = cls([], scorer)
+        index.terms = list(meta["terms"])
+        index._processed = [full_process(term) for term in index.terms]
+        index._char_index = {ch: i for i, ch in enumerate(meta["alphabet"])}
+        index._lengths = arrays["lengths"]
+        index._counts = arrays["counts"]
+        return index
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def candidates(self, text: str, min_score: int) -> np.ndarray:
+        """Term indices (in list order) whose score could still round up to min_score"""
+        return self._candidates(full_process(text), min_score)
+
+    def _candidates(self, processed: str, min_score: int) -> np.ndarray:
+        query_counts = np.zeros(self._counts.shape[1], dtype=np.int16)
+        for ch in processed:
+            index = self._char_index.get(ch)
+            if index is not None:
+                query_counts[index] += 1
+
+        # ratio = 2*M/T and M can't exceed the shared character count (nor the shorter length)
+        shared = np.minimum(self._counts, query_counts).sum(axis=1)
+        total = self._lengths + len(processed)
+        upper_bound = 200.0 * shared / np.maximum(total, 1)
+        # round() can lift a score by half a point, so keep anything within 0.5 of the cut
+        return np.flatnonzero(upper_bound >= min_score - 0.5)
+
+    def best_match(self, text: str, min_score: int = 0) -> Optional[Tuple[str, int]]:
+        """(term, score) of the best term if it scores >= min_score; ties go to the earliest term"""
+        if not self.terms:
+            return None
+        processed = full_process(text)
+        candidates = self._candidates(processed, min_score)
+        self.stats["lookups"] += 1
+        self.stats["candidates"] += len(candidates)
+
+        best_index, best_score = None, -1
+        for index in candidates:
+            score = self.scorer(processed, self._processed[index])
+            if score > best_score:
+                best_index, best_score = index, score
+        if best_index is None or best_score < min_score:
+            return None
+        return self.terms[best_index], best_score
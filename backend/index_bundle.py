@@ -0,0 +1,282 @@
+"""
+Index Bundle - Prebuilt resume indexes in one versioned, memory-mappable directory
+`python build_index.py` compiles what every worker would otherwise derive from
+resume_data.json at startup - RAG item/chunk matrices, BM25 postings, the tech vocabulary
+matrix and its graph neighbours, tech postings, the fuzzy alias index, date intervals and
+pre-serialized cards - into content-addressed .npy files plus a JSON manifest. Workers
+np.load(mmap_mode='r') the arrays, so they share page-cache pages and start without
+encoding anything. Each part carries a key digest of its inputs (data, model, mappings);
+a part whose key no longer matches is ignored and rebuilt in-process as before.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from embedding_cache import save_json_atomic
+from tech_embeddings import default_index_cache_dir
+
+BUNDLE_VERSION = 1
+USE_INDEX_BUNDLE = os.getenv("USE_INDEX_BUNDLE", "true").lower() == "true"
+INDEX_BUNDLE_DIR = os.getenv("INDEX_BUNDLE_DIR", "")  # Default: <index cache dir>/bundle
+MANIFEST_NAME = "manifest.json"
+# "<part>.<array>_<digest>.npy" as written by _write_array; other .npy files (embedding caches) aren't ours
+ARRAY_FILE_PATTERN = re.compile(r"^\w+\.\w+_[0-9a-f]{12}\.npy$")
+
+
+@dataclass
+class BundlePart:
+    """Arrays + JSON metadata of one index, valid while its key matches"""
+    key: str  # Digest of everything the part was derived from
+    arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+def bundle_key(*inputs: Any) -> str:
+    """Stable digest of a part's inputs (strings as-is, anything else as sorted JSON)"""
+    digest = hashlib.sha256()
+    for value in inputs:
+        text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=list)
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_bundle_dir(resume_data_path: str, cache_dir: Optional[str] = None) -> str:
+    """INDEX_BUNDLE_DIR, or bundle/ inside the index cache directory"""
+    return INDEX_BUNDLE_DIR or os.path.join(cache_dir or default_index_cache_dir(resume_data_path), "bundle")
+
+
+def bitsets_to_csr(postings: Dict[str, Dict[str, int]], sizes: Dict[str, int]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """(keys, offsets, rows) for key -> section -> int bitset postings
+    Rows number items across sections in `sizes` order, so key i's items are rows[offsets[i]:offsets[i + 1]]"""
+    starts, start = {}, 0
+    for name, size in sizes.items():
+        starts[name] = start
+        start += size
+    keys = list(postings)
+    rows: List[int] = []
+    offsets = [0]
+    for key in keys:
+        for name, bits in postings[key].items():
+            while bits:
+                lowest = bits & -bits
+                rows.append(starts[name] + lowest.bit_length() - 1)
+                bits ^= lowest
+        offsets.append(len(rows))
+    return keys, np.asarray(offsets, dtype=np.int64), np.asarray(rows, dtype=np.int32)
+
+
+def csr_to_bitsets(keys: List[str], offsets: np.ndarray, rows: np.ndarray, sizes: Dict[str, int]) -> Dict[str, Dict[str, int]]:
+    """Inverse of bitsets_to_csr"""
+    bounds = np.cumsum([0] + list(sizes.values()))
+    names = list(sizes)
+    sections = np.searchsorted(bounds, rows, side="right") - 1
+    postings = {}
+    for i, key in enumerate(keys):
+        posting = {name: 0 for name in names}
+        for row, section in zip(rows[offsets[i]:offsets[i + 1]].tolist(), sections[offsets[i]:offsets[i + 1]].tolist()):
+            posting[names[section]] |= 1 << (row - int(bounds[section]))
+        postings[key] = posting
+    return postings
+
+
+class IndexBundle:
+    """A built bundle directory; arrays are memory-mapped on first use"""
+
+    def __init__(self, path: str, manifest: Dict[str, Any]):
+        self.path = path
+        self.manifest = manifest
+        self.model_id: str = manifest.get("model_id", "")
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str, source_sha256: Optional[str] = None) -> Optional["IndexBundle"]:
+        """Bundle at path, or None if missing, from another bundle version or built from other data"""
+        try:
+            with open(os.path.join(path, MANIFEST_NAME), "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable index bundle {path}: {e}")
+            return None
+        if manifest.get("version") != BUNDLE_VERSION:
+            print(f"⚠️ Ignoring index bundle {path}: version {manifest.get('version')} (expected {BUNDLE_VERSION})")
+            return None
+        if source_sha256 is not None and manifest.get("source_sha256") != source_sha256:
+            print(f"⚠️ Ignoring stale index bundle {path}: resume data changed (rebuild with python build_index.py)")
+            return None
+        return cls(path, manifest)
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only memory map of one array (shape/dtype checked against the manifest)"""
+        array = self._arrays.get(name)
+        if array is None:
+            entry = self.manifest["arrays"][name]
+            array = np.load(os.path.join(self.path, entry["file"]), mmap_mode="r")
+            if list(array.shape) != entry["shape"] or str(array.dtype) != entry["dtype"]:
+                raise ValueError(f"Bundle array {name} is {array.shape} {array.dtype}, manifest says {entry['shape']} {entry['dtype']}")
+            with self._lock:
+                self._arrays[name] = array
+        return array
+
+    def part(self, name: str, key: str) -> Optional[BundlePart]:
+        """A part whose inputs still match key (None if absent or built from other inputs)"""
+        entry = self.manifest.get("parts", {}).get(name)
+        if entry is None:
+            return None
+        if entry["key"] != key:
+            print(f"⚠️ Index bundle part '{name}' is stale, rebuilding it in-process")
+            return None
+        try:
+            arrays = {array: self.array(f"{name}.{array}") for array in entry["arrays"]}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable index bundle part '{name}': {e}")
+            return None
+        return BundlePart(key, arrays, entry["meta"])
+
+    def card_json(self, section: str, item_id: str) -> Optional[bytes]:
+        """Pre-serialized JSON of one resume item (None if it isn't in the bundle)"""
+        entry = self.manifest.get("parts", {}).get("cards")
+        if entry is None:
+            return None
+        try:
+            row = entry["meta"]["keys"].index(f"{section}/{item_id}")
+        except ValueError:
+            return None
+        offsets = self.array("cards.offsets")
+        return self.array("cards.data")[offsets[row]:offsets[row + 1]].tobytes()
+
+    def verify(self) -> List[str]:
+        """Names of arrays whose file no longer matches its manifest sha256"""
+        return [name for name, entry in self.manifest["arrays"].items()
+                if file_sha256(os.path.join(self.path, entry["file"])) != entry["sha256"]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "built_at": self.manifest.get("built_at"),
+            "model_id": self.model_id,
+            "parts": sorted(self.manifest.get("parts", {})),
+            "bytes": sum(entry["bytes"] for entry in self.manifest["arrays"].values()),
+            "mapped_arrays": len(self._arrays),
+        }
+
+
+def load_or_build(bundle: Optional[IndexBundle], part: str, key: str,
+                  load: Callable[[BundlePart], Any], build: Callable[[], Any]) -> Any:
+    """load(part) when the bundle has a matching, readable part, else build()"""
+    bundle_part = bundle.part(part, key) if bundle is not None else None
+    if bundle_part is not None:
+        try:
+            return load(bundle_part)
+        except (ValueError, KeyError, IndexError) as e:
+            print(f"⚠️ Ignoring index bundle part '{part}': {e}")
+    return build()
+
+
+def _write_array(directory: str, name: str, array: np.ndarray) -> Dict[str, Any]:
+    """Save one array under a content-addressed name (temp file + rename)"""
+    array = np.ascontiguousarray(array)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        digest = file_sha256(tmp_path)
+        file_name = f"{name}_{digest[:12]}.npy"
+        os.replace(tmp_path, os.path.join(directory, file_name))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return {"file": file_name, "sha256": digest, "shape": list(array.shape), "dtype": str(array.dtype),
+            "bytes": os.path.getsize(os.path.join(directory, file_name))}
+
+
+def _manifest_files(path: str) -> set:
+    """Array files listed by the bundle manifest already in path (empty if none or unreadable)"""
+    try:
+        with open(os.path.join(path, MANIFEST_NAME), "r") as f:
+            return {entry["file"] for entry in json.load(f).get("arrays", {}).values()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return set()
+
+
+def write_bundle(path: str, parts: Dict[str, BundlePart], source_sha256: str, model_id: str) -> Dict[str, Any]:
+    """Write every part's arrays, then the manifest (so readers never see a partial bundle), then prune old files"""
+    os.makedirs(path, exist_ok=True)
+    manifest: Dict[str, Any] = {
+        "version": BUNDLE_VERSION,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source_sha256": source_sha256,
+        "model_id": model_id,
+        "arrays": {},
+        "parts": {},
+    }
+    for part_name, part in parts.items():
+        for array_name, array in part.arrays.items():
+            manifest["arrays"][f"{part_name}.{array_name}"] = _write_array(path, f"{part_name}.{array_name}", array)
+        manifest["parts"][part_name] = {"key": part.key, "arrays": sorted(part.arrays), "meta": part.meta}
+    previous = _manifest_files(path)
+    save_json_atomic(os.path.join(path, MANIFEST_NAME), manifest)
+
+    # Only bundle arrays go: the directory may be shared with the embedding caches (INDEX_BUNDLE_DIR / --out).
+    # Workers still mapping replaced files keep their pages (unlinked files stay valid on POSIX)
+    current = {entry["file"] for entry in manifest["arrays"].values()}
+    for name in os.listdir(path):
+        if name not in current and (name in previous or ARRAY_FILE_PATTERN.match(name)):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+    return manifest
+
+
+def cards_part(items: List[Tuple[str, Dict[str, Any]]]) -> BundlePart:
+    """(section, item) pairs as one UTF-8 JSON blob + offsets, keyed "section/id" """
+    keys, blobs = [], []
+    for section, item in items:
+        keys.append(f"{section}/{item.get('id', len(keys))}")
+        blobs.append(json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    offsets = np.cumsum([0] + [len(blob) for blob in blobs]).astype(np.int64)
+    data = np.frombuffer(b"".join(blobs), dtype=np.uint8)
+    return BundlePart(bundle_key(keys, b"".join(blobs).decode("utf-8")), {"data": data, "offsets": offsets}, {"keys": keys})
+
+
+_bundles: Dict[Tuple[str, str, float], Optional[IndexBundle]] = {}
+_bundles_lock = threading.Lock()
+
+
+def load_index_bundle(resume_data_path: str, cache_dir: Optional[str] = None) -> Optional[IndexBundle]:
+    """The bundle for this resume data (opened once per process and shared by the processor and the RAG)"""
+    path = default_bundle_dir(resume_data_path, cache_dir)
+    try:
+        built = os.path.getmtime(os.path.join(path, MANIFEST_NAME))
+        source_sha256 = file_sha256(resume_data_path)
+    except OSError:
+        return None
+    with _bundles_lock:
+        key = (path, source_sha256, built)  # A rebuilt bundle is picked up by reload_query_processor()
+        if key not in _bundles:
+            bundle = IndexBundle.open(path, source_sha256)
+            if bundle is not None:
+                print(f"📦 Index bundle {path} (built {bundle.manifest.get('built_at')}, {len(bundle.manifest['parts'])} parts)")
+            _bundles[key] = bundle
+        return _bundles[key]
@@ -0,0 +1,40 @@
+"""
+Item Locator - Maps resume items back to their slot in the loaded sections
+Precomputed per-item indexes (tech bitsets, date intervals) are keyed by
+(section, position); queries pass around the section lists themselves or shallow
+copies of their items (e.g. tagged with content_source), and both map back here.
+"""
+from typing import Dict, List, Optional, Tuple
+
+
+class ItemLocator:
+    """(section, position) lookups for items of the list-of-dict resume sections"""
+
+    # Fields a shallow copy still shares with the original item (and that indexes read)
+    IDENTITY_FIELDS = ("id", "title", "company", "description", "highlights", "technologies", "keywords", "dates", "date")
+
+    def __init__(self, sections: Dict[str, object]):
+        self.sections: Dict[str, List[Dict]] = {
+            name: items for name, items in sections.items()
+            if isinstance(items, list) and all(isinstance(item, dict) for item in items)
+        }
+        # item id -> [(section, position)]
+        self._locations: Dict[object, List[Tuple[str, int]]] = {}
+        for name, items in self.sections.items():
+            for position, item in enumerate(items):
+                self._locations.setdefault(item.get("id"), []).append((name, position))
+
+    def section_of(self, items: List[Dict]) -> Optional[str]:
+        """Name of the section if items IS one of the loaded section lists"""
+        for name, section_items in self.sections.items():
+            if items is section_items:
+                return name
+        return None
+
+    def locate(self, item: Dict) -> Optional[Tuple[str, int]]:
+        """(section, position) of a loaded item or an unmodified shallow copy of one"""
+        for name, position in self._locations.get(item.get("id"), ()):
+            indexed = self.sections[name][position]
+            if item is indexed or all(item.get(key) is indexed.get(key) for key in self.IDENTITY_FIELDS):
+                return name, position
+        return None
@@ -0,0 +1,234 @@
+"""
+LLM Gateway - One pooled Groq client shared by every conversation
+Async calls get real (cancelling) timeouts and a process-wide concurrency cap
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+from groq import AsyncGroq, Groq
+
+load_dotenv()
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+
+# Tunables (see .env.example)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+
+
+@dataclass
+class LLMReply:
+    """Text of a completion plus the tokens it cost (None if the API didn't say)"""
+    text: str
+    tokens_used: Optional[int] = None
+
+
+class LLMGateway:
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 timeout: float = LLM_TIMEOUT_SECONDS, transport: Optional[httpx.BaseTransport] = None):
+        """Set up shared client config (clients themselves are created on first use)"""
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set. Run: export GROQ_API_KEY=your_key_here")
+
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        )
+        self._transport = transport  # Only overridden in tests
+
+        # Async client + semaphore are bound to the event loop that first uses them
+        self._async_client: Optional[AsyncGroq] = None
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Sync client for scripts and thread-pool callers
+        self._sync_client: Optional[Groq] = None
+        self._sync_semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+        # Simple counters for debugging
+        self.stats = {"requests": 0, "timeouts": 0, "errors": 0, "in_flight": 0}
+
+    # ---- clients -------------------------------------------------------
+
+    async def _get_async_client(self):
+        """Pooled AsyncGroq + concurrency semaphore for the running loop (a client left on another loop is closed)"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._loop is not loop:
+            await self._close_stale_client(self._async_client, self._loop)
+            http_client = httpx.AsyncClient(limits=self._limits, timeout=self.timeout, transport=self._transport)
+            self._async_client = AsyncGroq(api_key=self.api_key, http_client=http_client, timeout=self.timeout)
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._async_client, self._async_semaphore
+
+    @staticmethod
+    async def _close_stale_client(client: Optional[AsyncGroq], loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a client bound to an earlier loop: on that loop while it still runs, else here (best effort)"""
+        if client is None:
+            return
+        try:
+            if loop is not None and loop.is_running() and not loop.is_closed():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.close(), loop))
+            else:
+                await client.close()
+        except Exception as e:
+            print(f"⚠️ Failed to close LLM client from a previous event loop: {e}")
+
+    def _get_sync_client(self) -> Groq:
+        """Pooled sync Groq client"""
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    http_client = httpx.Client(limits=self._limits, timeout=self.timeout, transport=self._transport)
+                    self._sync_client = Groq(api_key=self.api_key, http_client=http_client, timeout=self.timeout)
+        return self._sync_client
+
+    @staticmethod
+    def _reply_from(response) -> LLMReply:
+        usage = getattr(response, "usage", None)
+        return LLMReply(
+            text=response.choices[0].message.content.strip(),
+            tokens_used=getattr(usage, "total_tokens", None),
+        )
+
+    # ---- async API -----------------------------------------------------
+
+    async def complete(self, messages: List[Dict], model: str = DEFAULT_MODEL,
+                       timeout: Optional[float] = None, **params) -> LLMReply:
+        """Chat completion; the timeout covers queueing + the request and cancels the HTTP call"""
+        client, semaphore = await self._get_async_client()
+
+        async def _call():
+            async with semaphore:
+                self.stats["in_flight"] += 1
+                try:
+                    response = await client.chat.completions.create(model=model, messages=messages, **params)
+                finally:
+                    self.stats["in_flight"] -= 1
+                return self._reply_from(response)
+
+        self.stats["requests"] += 1
+        try:
+            return await asyncio.wait_for(_call(), timeout=timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    async def stream(self, messages: List[Dict], model: str = DEFAULT_MODEL,
+                     timeout: Optional[float] = None, **params) -> AsyncIterator[str]:
+        """Stream completion tokens; the whole stream must finish within the timeout"""
+        client, semaphore = await self._get_async_client()
+        deadline = time.monotonic() + (timeout or self.timeout)
+
+        def _remaining() -> float:
+            return max(deadline - time.monotonic(), 0.001)
+
+        self.stats["requests"] += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=_remaining())
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+
+        self.stats["in_flight"] += 1
+        try:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(model=model, messages=messages, stream=True, **params),
+                timeout=_remaining(),
+            )
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=_remaining())
+                except StopAsyncIteration:
+                    break
+                if not chunk.choices:
+                    continue
+                content = getattr(chunk.choices[0].delta, "content", None)
+                if content:
+                    yield content
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self.stats["in_flight"] -= 1
+            semaphore.release()
+
+    # ---- sync API (scripts, CLI tests) ---------------------------------
+
+    def complete_sync(self, messages: List[Dict], model: str = DEFAULT_MODEL, **params) -> LLMReply:
+        """Blocking chat completion on the shared pooled client"""
+        client = self._get_sync_client()
+        self.stats["requests"] += 1
+        with self._sync_semaphore:
+            try:
+                response = client.chat.completions.create(model=model, messages=messages, **params)
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+        return self._reply_from(response)
+
+    def stream_sync(self, messages: List[Dict], model: str = DEFAULT_MODEL, **params) -> Iterator[str]:
+        """Blocking token stream on the shared pooled client"""
+        client = self._get_sync_client()
+        self.stats["requests"] += 1
+        with self._sync_semaphore:
+            response = client.chat.completions.create(model=model, messages=messages, stream=True, **params)
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                content = getattr(chunk.choices[0].delta, "content", None)
+                if content:
+                    yield content
+
+    async def aclose(self):
+        """Close pooled connections (called on server shutdown)"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+
+# Global gateway instance
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get or create the process-wide LLM gateway"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+                print(f"🔌 LLM gateway ready (max {_gateway.max_concurrency} concurrent calls, {_gateway.timeout:.0f}s timeout)")
+    return _gateway
+
+
+async def close_llm_gateway():
+    """Close the process-wide gateway's pooled connections (no-op if it was never created)"""
+    if _gateway is not None:
+        await _gateway.aclose()
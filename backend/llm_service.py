@@ -2,12 +2,17 @@
 import os
 import json
 import re
-from typing import Dict, Any
-from groq import Groq
+import asyncio
+from typing import Dict, Any, AsyncIterator, Callable, Optional, Tuple
 from dotenv import load_dotenv
-from resume_query_processor import ResumeQueryProcessor
+from llm_gateway import get_llm_gateway
+from resume_query_processor import ResumeQueryProcessor, get_query_processor
+from diversity import select_diverse_items
 load_dotenv() # Load environment variables from .env file
 
+# Cap on stored chat messages per session (system prompt is always kept)
+MAX_CHAT_HISTORY = int(os.getenv("MAX_CHAT_HISTORY", "20"))
+
 class ConversationManager:
     def __init__(self):
         print("Initializing Groq conversation manager...")
@@ -15,12 +20,10 @@ class ConversationManager:
         if not self.api_key:
             raise ValueError("GROQ_API_KEY environment variable not set. Run: export GROQ_API_KEY=your_key_here")
             
-        self.client = Groq(api_key=self.api_key)
+        # All sessions share one pooled client (no per-session connections)
+        self.gateway = get_llm_gateway()
         self.model = "llama-3.1-8b-instant"  # Use your available model
         
-        # Initialize resume query processor
-        self.query_processor = ResumeQueryProcessor()
-        
         # LIGHTWEIGHT system prompt - NO resume data (saves 7000+ tokens!)
         self.system_prompt = (
             "You are a witty, sarcastic friend who represents Nitigya (a software engineer/ML specialist). "
@@ -56,74 +59,102 @@ class ConversationManager:
         ]
         print("Conversation manager initialized successfully")
     
-    def _select_diverse_items(self, items: list, max_items: int) -> list:
-        """Select diverse items across different content types and categories"""
-        if len(items) <= max_items:
-            return items
-        
-        # Group items by content source (projects, experience, publications)
-        grouped = {}
-        for item in items:
-            source = item.get("content_source", "unknown")
-            if source not in grouped:
-                grouped[source] = []
-            grouped[source].append(item)
-        
-        # Select items with diversity
-        selected = []
-        content_types = list(grouped.keys())
-        
-        # Round-robin selection across content types
-        while len(selected) < max_items and any(grouped.values()):
-            for content_type in content_types:
-                if len(selected) >= max_items:
-                    break
-                if grouped[content_type]:
-                    selected.append(grouped[content_type].pop(0))
-        
-        return selected
+    @property
+    def query_processor(self) -> ResumeQueryProcessor:
+        """Shared resume query engine (looked up per call so reloads take effect immediately)"""
+        return get_query_processor()
+    
+    def _remember(self, role: str, content: str):
+        """Append a message to chat history, dropping the oldest turns past MAX_CHAT_HISTORY"""
+        self.chat_history.append({"role": role, "content": content})
+        if len(self.chat_history) > MAX_CHAT_HISTORY:
+            self.chat_history = self.chat_history[:1] + self.chat_history[-(MAX_CHAT_HISTORY - 1):]
         
     def add_user_message(self, message):
         """Add a user message to the conversation history"""
-        self.chat_history.append({"role": "user", "content": message})
+        self._remember("user", message)
         
     def generate_response(self):
         """Generate a complete response at once"""
-        response = self.client.chat.completions.create(
+        reply = self.gateway.complete_sync(
+            self.chat_history,  # Use existing chat history with system prompt
             model=self.model,
-            messages=self.chat_history,  # Use existing chat history with system prompt
             temperature=0.9,
             top_p=0.95,
             max_tokens=128
-        )
+        ).text
         
-        reply = response.choices[0].message.content.strip()
-        self.chat_history.append({"role": "assistant", "content": reply})
+        self._remember("assistant", reply)
         return reply, self.chat_history
         
     def stream_response(self):
         """Stream response token by token"""
-        response = self.client.chat.completions.create(
+        full_reply = ""
+        for content in self.gateway.stream_sync(
+            self.chat_history,  # Use existing chat history with system prompt
             model=self.model,
-            messages=self.chat_history,  # Use existing chat history with system prompt
             temperature=0.9,
             top_p=0.95,
             max_tokens=128,
-            stream=True,
-        )
-        
-        full_reply = ""
-        for chunk in response:
-            delta = chunk.choices[0].delta
-            content = getattr(delta, "content", None)
-            if content:
-                yield content
-                full_reply += content
+        ):
+            yield content
+            full_reply += content
                 
-        self.chat_history.append({"role": "assistant", "content": full_reply.strip()})
+        self._remember("assistant", full_reply.strip())
+
+    async def stream_response_async(self, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Stream response token by token without blocking the event loop"""
+        full_reply = ""
+        async for content in self.gateway.stream(
+            self.chat_history,
+            model=self.model,
+            timeout=timeout,
+            temperature=0.9,
+            top_p=0.95,
+            max_tokens=128,
+        ):
+            yield content
+            full_reply += content
+        
+        self._remember("assistant", full_reply.strip())
+
+    async def generate_quirky_line(self, prompt: str, timeout: float = 5.0):
+        """One short quirky sentence for a prompt (not added to chat history)"""
+        return await self.gateway.complete(
+            [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            model=self.model,
+            timeout=timeout,
+            temperature=0.9,  # Higher temp for more creativity
+            max_tokens=100  # Just one sentence!
+        )
 
     def generate_structured_response(self, user_message: str, conversation_history: list = None) -> Dict:
         """Generate an intelligent response that only shows cards when relevant content is mentioned"""
+        llm_request, finish = self._prepare_structured_response(user_message, conversation_history)
+        if llm_request is None:
+            return finish(None)
+        
+        messages = llm_request.pop("messages")
+        reply = self.gateway.complete_sync(messages, model=self.model, **llm_request)
+        return finish(reply.text)
+
+    async def generate_structured_response_async(self, user_message: str, conversation_history: list = None, timeout: Optional[float] = None) -> Dict:
+        """Async version of generate_structured_response (LLM call never blocks the event loop)"""
+        # NLP matching is CPU-bound, keep it off the loop
+        llm_request, finish = await asyncio.to_thread(self._prepare_structured_response, user_message, conversation_history)
+        if llm_request is None:
+            return finish(None)
+        
+        messages = llm_request.pop("messages")
+        reply = await self.gateway.complete(messages, model=self.model, timeout=timeout, **llm_request)
+        return finish(reply.text)
+
+    def _prepare_structured_response(self, user_message: str, conversation_history: list = None) -> Tuple[Optional[Dict], Callable[[Optional[str]], Dict]]:
+        """Run the NLP side of a structured response.
+        Returns (llm_request or None, finish) - finish turns the LLM text into the final response dict"""
         
         # Extract already shown item IDs from conversation history to avoid duplicates
         shown_item_ids = set()
@@ -192,26 +223,20 @@ Just have a normal conversation like a friend would.
                 {"role": "system", "content": conversation_prompt},
                 {"role": "user", "content": user_message}
             ]
+
+            def finish_casual(response_text: str) -> Dict:
+                # Add to conversation history
+                self._remember("user", user_message)
+                self._remember("assistant", response_text)
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=enhanced_history,
-                temperature=0.8,
-                max_tokens=100
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            # Add to conversation history
-            self.chat_history.append({"role": "user", "content": user_message})
-            self.chat_history.append({"role": "assistant", "content": response_text})
+                return {
+                    "response": response_text,
+                    "items": [],
+                    "item_type": "none",
+                    "metadata": {"reasoning": "Casual conversation - no cards needed"}
+                }
             
-            return {
-                "response": response_text,
-                "items": [],
-                "item_type": "none",
-                "metadata": {"reasoning": "Casual conversation - no cards needed"}
-            }
+            return {"messages": enhanced_history, "temperature": 0.8, "max_tokens": 100}, finish_casual
         
         # Cards are needed - do intelligent selection with diversity
         # For highlights queries, show ALL items without selection to provide comprehensive overview
@@ -223,6 +248,24 @@ Just have a normal conversation like a friend would.
             "show more", "view more", "see more", "give me more"
         ])
         
+        def finish(response_text: str, selected_items: list) -> Dict:
+            # Add to conversation history
+            self._remember("user", user_message)
+            self._remember("assistant", response_text)
+        
+            return {
+                "response": response_text,
+                "items": selected_items,
+                "item_type": query_result.item_type,
+                "metadata": {
+                    **query_result.metadata,
+                    "intelligent_selection": not (is_highlights or is_show_all),  # No selection for highlights or show all
+                    "cards_shown": len(selected_items) > 0,
+                    "show_all_query": is_show_all,
+                    "shown_item_ids": list(shown_item_ids)  # Include for debugging
+                }
+            }
+        
         if is_highlights or is_show_all:
             if is_highlights:
                 print(f"🎯 Highlights query detected - showing all {len(available_items)} items without selection")
@@ -232,11 +275,12 @@ Just have a normal conversation like a friend would.
                 print(f"🔄 Show all query detected - showing all {len(available_items)} items")
                 selected_items = available_items
                 response_text = f"Here are all the results for your query:"
+            return None, lambda _ai_response: finish(response_text, selected_items)
         else:
             # Apply diversity selection to limit to 4-5 cards maximum for non-highlights queries
             max_items = 4  # Limit to 4 cards for better UX
             if len(available_items) > max_items:
-                truncated_items = self._select_diverse_items(available_items, max_items)
+                truncated_items = select_diverse_items(available_items, max_items, self.query_processor)
             else:
                 truncated_items = available_items
             
@@ -250,6 +294,9 @@ Just have a normal conversation like a friend would.
                     "role": item.get("role", ""),
                     "description": item.get("description", "")[:200] + "..." if len(item.get("description", "")) > 200 else item.get("description", "")
                 }
+                if item.get("rag_snippets"):
+                    # Chunk-level RAG hit: quote the bullets that matched instead of the description head
+                    simplified_item["description"] = " … ".join(item["rag_snippets"])
                 simplified_items.append(simplified_item)
             
             # Handle fallback scenarios with special context
@@ -297,132 +344,99 @@ IDS: people-robots-lab, spenza-inc"""
                 {"role": "system", "content": selection_prompt},
                 {"role": "user", "content": user_message}
             ]
+
+            def finish_selection(ai_response: str) -> Dict:
+                # DEBUG: Show what LLM returned
+                print(f"🔍 DEBUG - LLM raw response: '{ai_response}'")
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=enhanced_history,
-                temperature=0.7,
-                max_tokens=200
-            )
-            
-            ai_response = response.choices[0].message.content.strip()
-            
-            # DEBUG: Show what LLM returned
-            print(f"🔍 DEBUG - LLM raw response: '{ai_response}'")
-            
-            # Parse the response
-            try:
-                # Look for the RESPONSE: and IDS: markers
-                response_text = ""
-                selected_ids = []
+                # Parse the response
+                try:
+                    # Look for the RESPONSE: and IDS: markers
+                    response_text = ""
+                    selected_ids = []
                 
-                # ROBUST PARSING: Handle complex multi-line responses
-                if "IDS:" in ai_response:
-                    # Split at IDS: to separate response and IDs
-                    parts = ai_response.split("IDS:")
-                    if len(parts) == 2:
-                        response_part = parts[0].strip()
-                        ids_part = parts[1].strip()
+                    # ROBUST PARSING: Handle complex multi-line responses
+                    if "IDS:" in ai_response:
+                        # Split at IDS: to separate response and IDs
+                        parts = ai_response.split("IDS:")
+                        if len(parts) == 2:
+                            response_part = parts[0].strip()
+                            ids_part = parts[1].strip()
                         
-                        # IMPROVED: Extract response text intelligently
-                        if "RESPONSE:" in response_part:
-                            # Extract everything after RESPONSE:
-                            response_lines = response_part.split("RESPONSE:")
-                            if len(response_lines) >= 2:
-                                response_text = response_lines[-1].strip()  # Take last part after RESPONSE:
+                            # IMPROVED: Extract response text intelligently
+                            if "RESPONSE:" in response_part:
+                                # Extract everything after RESPONSE:
+                                response_lines = response_part.split("RESPONSE:")
+                                if len(response_lines) >= 2:
+                                    response_text = response_lines[-1].strip()  # Take last part after RESPONSE:
+                                else:
+                                    response_text = response_part.strip()
                             else:
+                                # If no RESPONSE: marker, use the whole response part
                                 response_text = response_part.strip()
-                        else:
-                            # If no RESPONSE: marker, use the whole response part
-                            response_text = response_part.strip()
                         
-                        # Parse IDs
-                        if ids_part and ids_part != "NONE":
-                            selected_ids = [id.strip() for id in ids_part.split(",") if id.strip()]
+                            # Parse IDs
+                            if ids_part and ids_part != "NONE":
+                                selected_ids = [id.strip() for id in ids_part.split(",") if id.strip()]
                 
-                # Fallback: try multi-line format
-                if not response_text and not selected_ids:
-                    lines = ai_response.split('\n')
-                    response_lines = []
+                    # Fallback: try multi-line format
+                    if not response_text and not selected_ids:
+                        lines = ai_response.split('\n')
+                        response_lines = []
                     
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith("RESPONSE:"):
-                            response_text = line[9:].strip()
-                        elif line.startswith("IDS:"):
-                            ids_text = line[4:].strip()
-                            if ids_text and ids_text != "NONE":
-                                selected_ids = [id.strip() for id in ids_text.split(",") if id.strip()]  
-                        elif not line.startswith("IDS:") and line and not response_text:
-                            # Collect non-structured lines as potential response
-                            response_lines.append(line)
+                        for line in lines:
+                            line = line.strip()
+                            if line.startswith("RESPONSE:"):
+                                response_text = line[9:].strip()
+                            elif line.startswith("IDS:"):
+                                ids_text = line[4:].strip()
+                                if ids_text and ids_text != "NONE":
+                                    selected_ids = [id.strip() for id in ids_text.split(",") if id.strip()]  
+                            elif not line.startswith("IDS:") and line and not response_text:
+                                # Collect non-structured lines as potential response
+                                response_lines.append(line)
                     
-                    # If no structured RESPONSE: found, use collected lines
-                    if not response_text and response_lines:
-                        response_text = " ".join(response_lines)
+                        # If no structured RESPONSE: found, use collected lines
+                        if not response_text and response_lines:
+                            response_text = " ".join(response_lines)
                 
-                # If we didn't find structured format, extract IDs from the whole response
-                if not response_text and not selected_ids:
-                    # Look for patterns that might be IDs
-                    import re
-                    # Look for lines that might contain IDs
-                    possible_ids = re.findall(r'\b[a-z-]+\b', ai_response.lower())
-                    # Check if any match actual item IDs
-                    actual_ids = [item.get("id", "") for item in available_items]
-                    selected_ids = [id for id in possible_ids if id in actual_ids]
-                    response_text = ai_response
+                    # If we didn't find structured format, extract IDs from the whole response
+                    if not response_text and not selected_ids:
+                        # Look for patterns that might be IDs
+                        import re
+                        # Look for lines that might contain IDs
+                        possible_ids = re.findall(r'\b[a-z-]+\b', ai_response.lower())
+                        # Check if any match actual item IDs
+                        actual_ids = [item.get("id", "") for item in available_items]
+                        selected_ids = [id for id in possible_ids if id in actual_ids]
+                        response_text = ai_response
                 
-                # Filter items based on selected IDs
-                selected_items = [item for item in available_items if item.get("id") in selected_ids]
+                    # Filter items based on selected IDs
+                    selected_items = [item for item in available_items if item.get("id") in selected_ids]
                 
-                # Ensure we have a response text
-                if not response_text and selected_items:
-                    response_text = f"Here's what you're looking for about his {query_result.item_type}:"
-                elif not response_text:
-                    response_text = "Tell me more about what you're looking for."
+                    # Ensure we have a response text
+                    if not response_text and selected_items:
+                        response_text = f"Here's what you're looking for about his {query_result.item_type}:"
+                    elif not response_text:
+                        response_text = "Tell me more about what you're looking for."
                     
-                # Fallback - if no specific IDs found but we have a good response, don't show any cards
-                if not selected_ids and response_text and "here's what you're looking for" not in response_text.lower():
-                    selected_items = []
-                elif not selected_ids:
-                    # Last resort - show first relevant item if we have any
-                    selected_items = available_items[:1] if len(available_items) > 0 else []
+                    # Fallback - if no specific IDs found but we have a good response, don't show any cards
+                    if not selected_ids and response_text and "here's what you're looking for" not in response_text.lower():
+                        selected_items = []
+                    elif not selected_ids:
+                        # Last resort - show first relevant item if we have any
+                        selected_items = available_items[:1] if len(available_items) > 0 else []
                     
-            except Exception as e:
-                print(f"Parsing error: {e}")
-                print(f"AI Response: {ai_response}")
-                response_text = ai_response if ai_response else "Tell me more about what you're looking for."
-                selected_items = []
-        
-        # Add to conversation history
-        self.chat_history.append({"role": "user", "content": user_message})
-        self.chat_history.append({"role": "assistant", "content": response_text})
-        
-        return {
-            "response": response_text,
-            "items": selected_items,
-            "item_type": query_result.item_type,
-            "metadata": {
-                **query_result.metadata,
-                "intelligent_selection": not (is_highlights or is_show_all),  # No selection for highlights or show all
-                "cards_shown": len(selected_items) > 0,
-                "show_all_query": is_show_all,
-                "shown_item_ids": list(shown_item_ids)  # Include for debugging
-            }
-        }
+                except Exception as e:
+                    print(f"Parsing error: {e}")
+                    print(f"AI Response: {ai_response}")
+                    response_text = ai_response if ai_response else "Tell me more about what you're looking for."
+                    selected_items = []
+                
+                return finish(response_text, selected_items)
+            
+            return {"messages": enhanced_history, "temperature": 0.7, "max_tokens": 200}, finish_selection
 
-    async def generate_structured_response_async(self, user_message: str, conversation_history: list = None) -> Dict:
-        """Async version of generate_structured_response for background processing"""
-        import asyncio
-        
-        # Run the synchronous method in a thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, 
-            self.generate_structured_response, 
-            user_message, 
-            conversation_history
-        )
 
 # Test function - make sure we use the SAME conversation manager for both tests
 def test_llm(input_text=None):
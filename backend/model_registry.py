@@ -0,0 +1,184 @@
+"""
+Model Registry - Single access point for the ML models used by the backend
+Each model is loaded lazily, exactly once per process, and keyed by (name, version)
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from embedding_backends import EMBEDDING_BACKEND, load_embedding_backend
+
+# Canonical model identifiers (the query processor and RAG used to load MiniLM separately)
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_MODEL_VERSION = os.getenv("EMBEDDING_MODEL_REVISION", "main")
+VAD_MODEL_NAME = "silero-vad"
+VAD_MODEL_VERSION = "latest"
+
+
+@dataclass
+class ModelRecord:
+    """A loaded model plus the cost of loading it"""
+    name: str
+    version: str
+    model: Any
+    load_time_s: float
+    memory_bytes: int
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process (Linux), 0 if unavailable"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _estimate_model_bytes(model: Any, rss_delta: int) -> int:
+    """Size of a model's weights (torch modules), falling back to the RSS growth during load"""
+    modules = model if isinstance(model, (tuple, list)) else (model,)
+    total = 0
+    for module in modules:
+        if hasattr(module, "parameters") and callable(module.parameters):
+            try:
+                total += sum(p.numel() * p.element_size() for p in module.parameters())
+                if hasattr(module, "buffers"):
+                    total += sum(b.numel() * b.element_size() for b in module.buffers())
+            except Exception:
+                pass
+    return total if total > 0 else max(rss_delta, 0)
+
+
+class ModelRegistry:
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._loaders: Dict[Tuple[str, str], Callable[[], Any]] = {}
+        self._records: Dict[Tuple[str, str], ModelRecord] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def register(self, name: str, version: str, loader: Callable[[], Any]) -> None:
+        """Register a loader for a model (does not load it)"""
+        with self._lock:
+            self._loaders[(name, version)] = loader
+            self._load_locks.setdefault((name, version), threading.Lock())
+
+    def get(self, name: str, version: str) -> Any:
+        """Return the model, loading it on first use (concurrent callers wait for a single load)"""
+        key = (name, version)
+        record = self._records.get(key)
+        if record is not None:
+            return record.model
+
+        with self._lock:
+            if key not in self._loaders:
+                raise KeyError(f"No loader registered for model {name}@{version}")
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            record = self._records.get(key)
+            if record is not None:
+                return record.model
+
+            print(f"📦 Loading model {name}@{version}...")
+            rss_before = _current_rss_bytes()
+            start_time = time.time()
+            model = self._loaders[key]()
+            load_time = time.time() - start_time
+            memory_bytes = _estimate_model_bytes(model, _current_rss_bytes() - rss_before)
+
+            self._records[key] = ModelRecord(name, version, model, load_time, memory_bytes)
+            print(f"✅ Loaded {name}@{version} in {load_time:.2f}s (~{memory_bytes / 1e6:.1f} MB)")
+            return model
+
+    def is_loaded(self, name: str, version: str) -> bool:
+        """Check whether a model has already been loaded"""
+        return (name, version) in self._records
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-model memory and load time for every loaded model"""
+        return [
+            {
+                "name": record.name,
+                "version": record.version,
+                "load_time_ms": round(record.load_time_s * 1000, 2),
+                "memory_mb": round(record.memory_bytes / 1e6, 2),
+            }
+            for record in list(self._records.values())
+        ]
+
+
+# Loaders (heavy imports stay inside so importing the registry is cheap)
+def _load_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    if EMBEDDING_MODEL_VERSION == "main":
+        return SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return SentenceTransformer(EMBEDDING_MODEL_NAME, revision=EMBEDDING_MODEL_VERSION)
+
+
+def _load_whisper_model(model_size: str):
+    from faster_whisper import WhisperModel
+    return WhisperModel(model_size, device="cpu", compute_type="int8")
+
+
+def _load_vad_model():
+    import torch.hub
+    return torch.hub.load("snakers4/silero-vad", "silero_vad", trust_repo=True)
+
+
+# Global registry instance
+model_registry = ModelRegistry()
+model_registry.register(EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_VERSION, _load_embedding_model)
+model_registry.register(VAD_MODEL_NAME, VAD_MODEL_VERSION, _load_vad_model)
+
+
+def embedding_model_id(backend: Optional[str] = None) -> str:
+    """Cache key for embeddings from a backend (torch keeps the plain id so existing caches stay valid)"""
+    backend = backend or EMBEDDING_BACKEND
+    base_id = f"{EMBEDDING_MODEL_NAME}@{EMBEDDING_MODEL_VERSION}"
+    return base_id if backend == "torch" else f"{base_id}+{backend}"
+
+
+def _load_embedding_backend(backend: str):
+    base_model = get_embedding_model("torch")
+    try:
+        return load_embedding_backend(base_model, backend, embedding_model_id(backend))
+    except ImportError as e:
+        print(f"⚠️ Embedding backend '{backend}' unavailable ({e}), using torch")
+        return base_model
+
+
+def get_embedding_model(backend: Optional[str] = None):
+    """Shared MiniLM sentence embedding model (used by RAG and the query processor)
+    backend: torch | torch-int8 | onnx | onnx-int8 (default EMBEDDING_BACKEND)"""
+    backend = backend or EMBEDDING_BACKEND
+    if backend == "torch":
+        return model_registry.get(EMBEDDING_MODEL_NAME, EMBEDDING_MODEL_VERSION)
+    version = f"{EMBEDDING_MODEL_VERSION}+{backend}"
+    if not model_registry.is_loaded(EMBEDDING_MODEL_NAME, version):
+        model_registry.register(EMBEDDING_MODEL_NAME, version, lambda: _load_embedding_backend(backend))
+    return model_registry.get(EMBEDDING_MODEL_NAME, version)
+
+
+def get_whisper_model(model_size: Optional[str] = None):
+    """Shared faster-whisper model (smaller model in production)"""
+    if model_size is None:
+        model_size = "tiny" if os.environ.get("ENVIRONMENT") == "production" else "base"
+    name = f"whisper-{model_size}"
+    if not model_registry.is_loaded(name, "int8"):
+        model_registry.register(name, "int8", lambda: _load_whisper_model(model_size))
+    return model_registry.get(name, "int8")
+
+
+def get_vad_model():
+    """Shared Silero VAD model, returned as (model, utils)"""
+    return model_registry.get(VAD_MODEL_NAME, VAD_MODEL_VERSION)
+
+
+def get_model_stats() -> List[Dict[str, Any]]:
+    """Memory and load-time report for all loaded models"""
+    return model_registry.stats()
@@ -0,0 +1,126 @@
+"""
+Quantized Index - int8 / float16 storage for the section-partitioned RAG vector index
+Rows are kept in memory as per-vector scaled int8 (or float16). A query ranks every row on
+the compressed codes, then rescores the best top_k * rescore_factor candidates against the
+full-precision vectors, which can live in a memory-mapped .npy so only touched rows are
+paged in. The index reports its memory footprint and can measure its own recall.
+"""
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from tech_embeddings import l2_normalize, save_npy_atomic
+from vector_index import SearchHit, VectorIndex
+
+QUANTIZATION_MODES = ("int8", "float16")
+RESCORE_FACTOR = 4
+SCORE_CHUNK_ROWS = 8192  # Codes are widened to float32 this many rows at a time
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row symmetric int8 codes + float32 scales (row ~= codes * scale)"""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales = np.where(scales == 0, 1.0, scales).astype(np.float32)
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+class QuantizedVectorIndex(VectorIndex):
+    """VectorIndex whose in-memory rows are int8 or float16"""
+
+    def __init__(self, embeddings: np.ndarray, sections: List[str], mode: str = "int8",
+                 rescore_factor: int = RESCORE_FACTOR, full_precision_path: Optional[str] = None):
+        """full_precision_path: .npy to memory-map for rescoring (otherwise the float32 rows stay in RAM)"""
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode {mode!r} (expected one of {QUANTIZATION_MODES})")
+        super().__init__(embeddings, sections)
+        self.mode = mode
+        self.rescore_factor = rescore_factor
+
+        full = self.matrix
+        if mode == "int8":
+            self.codes, self.scales = quantize_int8(full)
+        else:
+            self.codes, self.scales = full.astype(np.float16), None
+
+        self.full_precision: Optional[np.ndarray] = None
+        if rescore_factor > 0:
+            if full_precision_path:
+                if not os.path.exists(full_precision_path):
+                    save_npy_atomic(full_precision_path, full)
+                self.full_precision = np.load(full_precision_path, mmap_mode="r")
+            else:
+                self.full_precision = full
+        self.matrix = None  # Only the codes (and optionally the mmap) are kept
+
+    def _approximate_scores(self, queries: np.ndarray, spans: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Scores on the compressed rows in spans, plus the positions of those rows"""
+        positions = np.concatenate([np.arange(start, end) for start, end in spans])
+        scores = np.empty((len(queries), len(positions)), dtype=np.float32)
+        column = 0
+        for start, end in spans:
+            for chunk_start in range(start, end, SCORE_CHUNK_ROWS):
+                chunk_end = min(end, chunk_start + SCORE_CHUNK_ROWS)
+                block = self.codes[chunk_start:chunk_end].astype(np.float32)
+                scores[:, column:column + chunk_end - chunk_start] = queries @ block.T
+                column += chunk_end - chunk_start
+        if self.scales is not None:
+            scores *= self.scales[positions]
+        return scores, positions
+
+    def search_batch(self, queries: np.ndarray, top_k: int = 10, min_score: float = 0.3,
+                     sections: Optional[Iterable[str]] = None) -> List[List[SearchHit]]:
+        """Rank on the codes, rescore the best candidates in full precision"""
+        queries = l2_normalize(np.atleast_2d(queries))
+        spans = self._slices(sections)
+        if not spans or top_k <= 0 or len(self) == 0:
+            return [[] for _ in range(len(queries))]
+        scores, positions = self._approximate_scores(queries, spans)
+        ids = self.row_ids[positions]
+        if self.full_precision is None:
+            return [self._top_hits(row_scores, ids, top_k, min_score) for row_scores in scores]
+
+        results = []
+        n_candidates = min(top_k * self.rescore_factor, len(positions))
+        for query, row_scores in zip(queries, scores):
+            candidates = np.sort(np.argpartition(-row_scores, n_candidates - 1)[:n_candidates])
+            exact = np.asarray(self.full_precision[positions[candidates]], dtype=np.float32) @ query
+            results.append(self._top_hits(exact, ids[candidates], top_k, min_score))
+        return results
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """Resident bytes of the index vs a plain float32 matrix"""
+        float32_bytes = len(self) * self.dim * 4
+        resident = self.codes.nbytes + self.row_ids.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+        if self.full_precision is None:
+            full_precision = "none"
+        elif isinstance(self.full_precision, np.memmap):
+            full_precision = "mmap"
+        else:
+            full_precision = "memory"
+            resident += self.full_precision.nbytes
+        return {
+            "mode": self.mode,
+            "vectors": len(self),
+            "dim": self.dim,
+            "resident_bytes": int(resident),
+            "float32_bytes": int(float32_bytes),
+            "compression": round(float32_bytes / resident, 2) if resident else 0.0,
+            "rescore_factor": self.rescore_factor,
+            "full_precision": full_precision,
+        }
+
+    def measure_recall(self, queries: np.ndarray, top_k: int = 10) -> float:
+        """recall@top_k of this index against an exact float32 scan (needs the full-precision rows)"""
+        if self.full_precision is None:
+            raise ValueError("Recall needs the full-precision vectors (rescore_factor > 0)")
+        queries = l2_normalize(np.atleast_2d(queries))
+        approximate = self.search_batch(queries, top_k=top_k, min_score=-1.0)
+        exact_scores = queries @ np.asarray(self.full_precision, dtype=np.float32).T
+        found = total = 0
+        for row_scores, hits in zip(exact_scores, approximate):
+            expected = {row for row, _ in self._top_hits(row_scores, self.row_ids, top_k, -1.0)}
+            found += len(expected & {row for row, _ in hits})
+            total += len(expected)
+        return found / total if total else 1.0
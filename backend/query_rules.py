@@ -0,0 +1,221 @@
+"""
+Query Rules - Precompiled pattern families for query classification
+Every family (greeting, casual, intents, highlights, follow-up, ...) is compiled once.
+Each pattern is gated by a literal it cannot match without (a cheap substring check),
+so most patterns never run a regex at all; non-ASCII queries use one combined
+alternation regex per family instead.
+"""
+import re
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+# Simple greetings (matched against the lowercased, stripped query)
+GREETING_PATTERNS = [
+    r"^(hi|hello|hey|yo|sup|what's up)$",
+    r"^how are you",
+    r"^good morning",
+    r"^good afternoon",
+    r"^good evening"
+]
+
+# Casual conversational queries that don't need cards (lowercased, stripped)
+CASUAL_PATTERNS = [
+    r"what does that even mean",
+    r"what do you mean",
+    r"i don't understand",
+    r"that doesn't make sense",
+    r"what are you talking about",
+    r"huh\?",
+    r"what\?",
+    r"^are you there",
+    r"^test",
+    r"^testing",
+    r"one.*two.*three",
+    r"can you hear me"
+]
+
+# General "about you" questions (lowercased)
+GENERAL_PATTERNS = [
+    r"tell me about yourself",
+    r"who are you",
+    r"what do you do",
+    r"introduce yourself"
+]
+
+# Very general queries that should show a mix of everything (lowercased, stripped)
+VERY_GENERAL_PATTERNS = [
+    r"^(tell|show).*\b(me|us)\b.*\babout\s+(him|her|them|nitigya)$",
+    r"^what\s+(has|have|did)\s+(he|she|they|nitigya)\s+done\??$",
+    r"^show\s+me\s+(everything|all)$",
+    r"^tell\s+me\s+everything$",
+    r"^what('s| is)\s+(his|her|their)\s+(background|story|work)$",
+    r"^(his|her|their)\s+(background|story|resume|portfolio)$"
+]
+
+# Follow-up queries that need conversation context (raw query)
+FOLLOWUP_PATTERNS = [
+    r'(?i)\btell me more\b',
+    r'(?i)\bmore about (that|those|them|it)\b',
+    r'(?i)\bwhat about (that|those|them)\b',
+    r'(?i)\bexpand on (that|those|them)\b',
+    r'(?i)\bshow me more\b',
+    r'(?i)\bgive me details\b',
+    r'(?i)\b(that|those|them|it)\b.*\b(sounds?|looks?|seems?)\b',
+    # ORDINAL REFERENCES - "the first project", "second one", "the 3rd item"
+    r'(?i)\b(the\s+)?(first|1st|second|2nd|third|3rd|fourth|4th|last)\s+(one|project|experience|item|card|company|work|role|publication)\b',
+    r'(?i)\b(about|tell.*about|more.*about|details.*on)\s+(the\s+)?(first|1st|second|2nd|third|3rd|fourth|4th|last)\b',
+    # CONTEXTUAL REFERENCE PATTERNS - the key missing piece!
+    r'(?i)\bin (this|that)\b',
+    r'(?i)\bat (this|that)\b',
+    r'(?i)\bfor (this|that)\b',
+    r'(?i)\bwith (this|that)\b',
+    r'(?i)\bdid.*you.*do.*\bin (this|that|there)\b',
+    r'(?i)\bwhat.*did.*he.*do.*\bin (this|that|there)\b',
+    r'(?i)\bany.*\bin (this|that|there)\b',
+    r'(?i)\bwas there.*\bin (this|that)\b',
+    r'(?i)\bdid.*involve.*\bin (this|that)\b',
+    r'(?i)\b(here|there)\b.*\?',
+    r'(?i)\bin (that|this) (project|experience|work|role|position)\b',
+    # CLARIFICATION PATTERNS
+    r'(?i)^no,?\s*i\s*meant\b',
+    r'(?i)^actually,?\s*i\s*meant\b',
+    r'(?i)^sorry,?\s*i\s*meant\b',
+    r'(?i)\bwhat.*did.*he.*do.*\b(at|in)\s+\w+\s+(experience|company|job|role)\b',
+    r'(?i)\bin\s+\w+\s+(experience|company|job|role)\b',
+    # MORE FLEXIBLE PATTERNS
+    r'(?i)\bshow me more\b.*\b(details?|information|info)\b',
+    r'(?i)\bgive me more\b.*\b(details?|information|info)\b',
+    r'(?i)\btell me more\b.*\b(details?|information|info)\b',
+    # SHOW ALL PATTERNS
+    r'(?i)\bshow all\b',
+    r'(?i)\bshow me all\b',
+    r'(?i)\bgive me all\b',
+    r'(?i)\ball of them\b',
+    r'(?i)\beverything\b',
+    r'(?i)\ball results\b',
+    r'(?i)\ball available\b'
+]
+
+# Which form of the query each family is matched against (kept exactly as before)
+TEXT_VIEWS: Dict[str, Callable[[str], str]] = {
+    "raw": lambda query: query,
+    "lower": lambda query: query.lower(),
+    "lower_strip": lambda query: query.lower().strip(),
+}
+
+
+def _scoped(pattern: str) -> str:
+    """Wrap a pattern so it can sit in an alternation (a leading (?i) becomes a scoped flag)"""
+    if pattern.startswith("(?i)"):
+        return f"(?i:{pattern[4:]})"
+    return f"(?:{pattern})"
+
+
+def _required_literal(pattern: str) -> str:
+    """Longest run of literal characters every match of the pattern must contain (lowercased)"""
+    best, current = "", ""
+    for op, arg in sre_parse.parse(pattern):
+        if op is sre_parse.LITERAL:
+            current += chr(arg)
+            continue
+        if len(current) > len(best):
+            best = current
+        current = ""
+    if len(current) > len(best):
+        best = current
+    return best.lower()
+
+
+class RuleFamily:
+    """A named list of patterns, compiled once with a literal gate per pattern"""
+
+    def __init__(self, name: str, patterns: List[str], view: str = "raw"):
+        self.name = name
+        self.patterns = list(patterns)
+        self.view = view
+        self.compiled = [re.compile(pattern) for pattern in self.patterns]
+        self.gates = [(_required_literal(pattern), regex) for pattern, regex in zip(self.patterns, self.compiled)]
+        # search(A|B|...) finds a match iff any single pattern would
+        self.combined = re.compile("|".join(_scoped(pattern) for pattern in self.patterns))
+
+    def _matching(self, text: str):
+        """Yield the index of every pattern that matches"""
+        if text.isascii():
+            # Lowercasing ASCII is exact, so a missing literal rules the pattern out
+            lowered = text.lower()
+            for index, (literal, regex) in enumerate(self.gates):
+                if literal in lowered and regex.search(text):
+                    yield index
+        elif self.combined.search(text):
+            for index, regex in enumerate(self.compiled):
+                if regex.search(text):
+                    yield index
+
+    def fires(self, text: str) -> bool:
+        """True if any pattern in the family matches"""
+        return next(self._matching(text), None) is not None
+
+    def count(self, text: str) -> int:
+        """Number of distinct patterns that match"""
+        return sum(1 for _ in self._matching(text))
+
+    def first_match(self, text: str) -> Optional[str]:
+        """First pattern (in list order) that matches, for debugging"""
+        index = next(self._matching(text), None)
+        return self.patterns[index] if index is not None else None
+
+
+@dataclass
+class RuleMatches:
+    """Which rule families fired for a query, plus per-intent pattern counts"""
+    query: str
+    fired: Set[str] = field(default_factory=set)
+    intent_scores: Dict[str, int] = field(default_factory=dict)
+
+    def __contains__(self, family: str) -> bool:
+        return family in self.fired
+
+
+class QueryRuleEngine:
+    """All query classification rules, compiled once per processor"""
+
+    def __init__(self, intent_patterns: Dict[str, List[str]], highlights_patterns: List[str]):
+        self.families: Dict[str, RuleFamily] = {
+            "greeting": RuleFamily("greeting", GREETING_PATTERNS, "lower_strip"),
+            "casual": RuleFamily("casual", CASUAL_PATTERNS, "lower_strip"),
+            "general": RuleFamily("general", GENERAL_PATTERNS, "lower"),
+            "very_general": RuleFamily("very_general", VERY_GENERAL_PATTERNS, "lower_strip"),
+            "highlights": RuleFamily("highlights", highlights_patterns, "raw"),
+            "followup": RuleFamily("followup", FOLLOWUP_PATTERNS, "raw"),
+        }
+        # Intent families keep their dict order (ties go to the first intent, as before)
+        self.intent_families: Dict[str, RuleFamily] = {
+            intent: RuleFamily(f"intent:{intent}", patterns, "raw")
+            for intent, patterns in intent_patterns.items()
+        }
+
+    def classify(self, query: str) -> RuleMatches:
+        """Run every rule family over the query once"""
+        views = {name: view(query) for name, view in TEXT_VIEWS.items()}
+        matches = RuleMatches(query=query)
+
+        for name, family in self.families.items():
+            if family.fires(views[family.view]):
+                matches.fired.add(name)
+
+        for intent, family in self.intent_families.items():
+            score = family.count(views[family.view])
+            if score > 0:
+                matches.intent_scores[intent] = score
+                matches.fired.add(family.name)
+
+        return matches
+
+    def first_match(self, family: str, query: str) -> Optional[str]:
+        """First matching pattern of a family, for debug output"""
+        rule_family = self.families[family]
+        return rule_family.first_match(TEXT_VIEWS[rule_family.view](query))
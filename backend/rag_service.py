@@ -4,28 +4,121 @@ Uses sentence-transformers for embeddings and cosine similarity for search
 """
 
 import json
+import os
 import numpy as np
-from typing import List, Dict, Any, Tuple
-from sentence_transformers import SentenceTransformer
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from pathlib import Path
+from model_registry import get_embedding_model, embedding_model_id
+from embedding_cache import EmbeddingCache, text_hash
+from embedding_service import get_query_embedding_cache
+from embedding_batcher import get_embedding_batcher
+from vector_index import VectorIndex
+from quantized_index import QuantizedVectorIndex
+from ann_index import IVFIndex
+from tech_embeddings import default_index_cache_dir
+from bm25_index import BM25_B, BM25_K1, BM25_MIN_SCORE, BM25Index
+from chunk_index import ChunkIndex, RAG_CHUNK_POOLING, RAG_CHUNK_TEMPERATURE, item_chunks
+from index_bundle import USE_INDEX_BUNDLE, BundlePart, bundle_key, cards_part, load_index_bundle, load_or_build
+
+# 'exact' brute-force cosine, or 'ivf' approximate search for multi-thousand-item corpora
+RAG_INDEX_MODE = os.getenv("RAG_INDEX_MODE", "exact")
+# Exact-mode vector storage: 'none' (float32), 'int8' or 'float16' (rescored in full precision)
+RAG_QUANTIZATION = os.getenv("RAG_QUANTIZATION", "none")
+# Bullet-level chunk embeddings (detail questions; matched snippets returned with each hit).
+# Chunk search is always exact float32 (pooling needs every chunk score): with it on, RAG_INDEX_MODE and
+# RAG_QUANTIZATION only apply to the item index behind semantic_search, not to hybrid_search
+RAG_CHUNK_INDEX = os.getenv("RAG_CHUNK_INDEX", "true").lower() == "true"
+# Hybrid retrieval: 'rrf' (reciprocal rank fusion) or 'weighted' (dense cosine + max-normalized BM25)
+HYBRID_FUSION = os.getenv("HYBRID_FUSION", "rrf")
+HYBRID_RRF_K = float(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_DENSE_WEIGHT = float(os.getenv("HYBRID_DENSE_WEIGHT", "0.6"))  # 'weighted' only; BM25 gets the rest
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "50"))  # Per-retriever candidates before fusion
+# Expanded queries: an expansion term's cosine counts this much relative to the user's own question
+QUERY_EXPANSION_WEIGHT = float(os.getenv("QUERY_EXPANSION_WEIGHT", "0.8"))
+
+
+@dataclass
+class HybridHit:
+    """One fused result with the evidence behind its score"""
+    item: Dict[str, Any]
+    section: str
+    score: float  # Fused score (RRF or weighted)
+    dense_score: Optional[float]  # Cosine, None if outside the dense candidates
+    bm25_score: float
+    dense_rank: Optional[int]  # 1-based rank in each retriever's list
+    bm25_rank: Optional[int]
+    matched_terms: List[str] = field(default_factory=list)
+    chunks: List[Dict[str, Any]] = field(default_factory=list)  # Best matching chunks: chunk_id, kind, text, score
+    best_term: Optional[str] = None  # Query or expansion term behind dense_score
+    term_scores: Dict[str, float] = field(default_factory=dict)  # Raw cosine per query/expansion term that hit
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Scores without the item (for response metadata / debugging)"""
+        return {
+            "section": self.section, "score": round(self.score, 4),
+            "dense_score": None if self.dense_score is None else round(self.dense_score, 4),
+            "bm25_score": round(self.bm25_score, 4), "dense_rank": self.dense_rank,
+            "bm25_rank": self.bm25_rank, "matched_terms": self.matched_terms,
+            "chunk_ids": [chunk["chunk_id"] for chunk in self.chunks],
+            "best_term": self.best_term,
+            "term_scores": {term: round(score, 4) for term, score in self.term_scores.items()},
+        }
+
+
+@dataclass
+class ChunkSearchHit:
+    """An item scored by its best chunks, with the chunks that matched"""
+    item: Dict[str, Any]
+    section: str
+    score: float  # Pooled chunk cosine
+    chunks: List[Dict[str, Any]]  # chunk_id, kind, text, score - best first
+
 
 class ResumeRAG:
-    def __init__(self, resume_data_path: str = "resume_data.json"):
-        """Initialize RAG with resume data"""
+    def __init__(self, resume_data_path: str = "resume_data.json", cache_dir: Optional[str] = None,
+                 index_mode: str = RAG_INDEX_MODE, quantization: str = RAG_QUANTIZATION,
+                 embedding_backend: Optional[str] = None, chunk_index: bool = RAG_CHUNK_INDEX,
+                 use_index_bundle: bool = USE_INDEX_BUNDLE):
+        """Initialize RAG with resume data (index_mode: 'exact'/'ivf'; quantization: 'none'/'int8'/'float16';
+        embedding_backend: 'torch'/'torch-int8'/'onnx'/'onnx-int8', default EMBEDDING_BACKEND;
+        chunk_index: also embed every bullet/highlight/tech block for chunk-level search (exact float32;
+            hybrid search then uses it instead of the index_mode/quantization item index);
+        use_index_bundle: memory-map matching prebuilt matrices from `python build_index.py`)"""
         print("🔧 Initializing Resume RAG service...")
         
-        # Load lightweight embedding model (all-MiniLM-L6-v2: 384 dims, 80MB)
-        print("📦 Loading embedding model (all-MiniLM-L6-v2)...")
-        self.model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        # Lightweight embedding model (all-MiniLM-L6-v2: 384 dims, 80MB), shared via the model registry
+        self.model = get_embedding_model(embedding_backend)
         
         # Load resume data
         with open(resume_data_path, 'r') as f:
             self.resume_data = json.load(f)
         
+        # Process-wide query embedding LRU (shared with semantic tech matching)
+        self.query_cache = get_query_embedding_cache()
+        
+        # Persistent embeddings keyed by item text hash + model, shared by all workers
+        self.embedding_cache = EmbeddingCache(
+            cache_dir or default_index_cache_dir(resume_data_path),
+            model_id=embedding_model_id(embedding_backend)
+        )
+        
+        self.chunk_cache = EmbeddingCache(
+            self.embedding_cache.cache_dir, model_id=self.embedding_cache.model_id, name="chunk_embeddings"
+        ) if chunk_index else None
+        
+        self.index_bundle = load_index_bundle(resume_data_path, cache_dir) if use_index_bundle else None
+        self.bundle_keys: Dict[str, str] = {}
+        
         # Build vector index
+        self.index_mode = index_mode
+        self.quantization = quantization
         self.items = []
         self.embeddings = []
         self._build_index()
+        if self.chunk_index is not None and (index_mode != "exact" or quantization != "none"):
+            print(f"⚠️ index_mode={index_mode!r} / quantization={quantization!r} only apply to semantic_search: "
+                  f"hybrid search scores the exact float32 chunk index (set RAG_CHUNK_INDEX=false to use them there)")
         
         print(f"✅ RAG initialized with {len(self.items)} items")
     
@@ -41,72 +134,232 @@ class ResumeRAG:
             ('education', self.resume_data.get('education', []))
         ]
         
-        texts_to_embed = []
-        
         for section_name, items in sections:
             for item in items:
-                # Create rich text representation for embedding
-                text_parts = []
-                
-                # Add title/name/role
-                if 'title' in item:
-                    text_parts.append(item['title'])
-                if 'role' in item:
-                    text_parts.append(item['role'])
-                if 'name' in item:
-                    text_parts.append(item['name'])
-                
-                # Add description
-                if 'description' in item:
-                    if isinstance(item['description'], list):
-                        text_parts.extend(item['description'][:2])  # First 2 bullet points
-                    else:
-                        text_parts.append(item['description'])
-                
-                # Add key details
-                if 'key_details' in item:
-                    text_parts.extend(item['key_details'][:2])
-                
-                # Add tech stack (important for matching!)
-                if 'tech_stack' in item and item['tech_stack']:
-                    if isinstance(item['tech_stack'], list):
-                        text_parts.append("Technologies: " + ", ".join(item['tech_stack'][:6]))
-                    elif isinstance(item['tech_stack'], dict):
-                        # If tech_stack is a dict, get all values
-                        all_techs = []
-                        for techs in item['tech_stack'].values():
-                            if isinstance(techs, list):
-                                all_techs.extend(techs)
-                        if all_techs:
-                            text_parts.append("Technologies: " + ", ".join(all_techs[:6]))
-                
-                if 'technologies' in item and item['technologies']:
-                    if isinstance(item['technologies'], list):
-                        text_parts.append("Technologies: " + ", ".join(item['technologies'][:6]))
-                
-                # Add company/university/journal
-                if 'company' in item:
-                    text_parts.append(f"Company: {item['company']}")
-                if 'university' in item:
-                    text_parts.append(f"University: {item['university']}")
-                if 'journal' in item:
-                    text_parts.append(f"Published in: {item['journal']}")
-                
-                # Combine into single text
-                combined_text = " | ".join(text_parts)
-                
                 # Store item with metadata
                 self.items.append({
                     'item': item,
                     'section': section_name,
-                    'text': combined_text
+                    'text': self._item_text(item)
                 })
-                texts_to_embed.append(combined_text)
         
-        # Create embeddings (batch for efficiency)
-        print(f"🔢 Generating embeddings for {len(texts_to_embed)} items...")
-        self.embeddings = self.model.encode(texts_to_embed, show_progress_bar=False)
-        print(f"✅ Embeddings created: shape {self.embeddings.shape}")
+        # Prebuilt normalized rows from the index bundle (exact float32 search maps them directly)
+        bundled = self._from_bundle(
+            "rag_vectors", bundle_key(self.embedding_cache.model_id, [item_data['text'] for item_data in self.items]),
+            lambda part: VectorIndex.from_bundle(part.arrays, part.meta), lambda: None
+        )
+        if bundled is not None and self.index_mode != "ivf" and self.quantization == "none":
+            self.embeddings = None  # The rows live in the memory-mapped bundle matrix
+            self.index = bundled
+            print(f"📦 Memory-mapped {len(bundled)} item vectors from the index bundle")
+        else:
+            if bundled is not None:
+                self.embeddings = np.asarray(bundled.matrix[np.argsort(bundled.row_ids)])
+                print(f"📦 Loaded {len(bundled)} item vectors from the index bundle")
+            else:
+                # Create embeddings (batch for efficiency), re-encoding only new or changed items
+                print(f"🔢 Generating embeddings for {len(self.items)} items...")
+                self.embeddings = self._embed_items()
+                print(f"♻️ Reused {self.embedding_cache.stats['cached']} cached embeddings, encoded {self.embedding_cache.stats['encoded']}")
+                print(f"✅ Embeddings created: shape {self.embeddings.shape}")
+            self.index = self._load_or_build_search_index()
+        
+        self._build_lexical_index()
+        self._build_chunk_index()
+    
+    def _build_chunk_index(self):
+        """Embed every chunk of every item (cached by text like item embeddings); None when disabled"""
+        self.chunk_index = None
+        if self.chunk_cache is None:
+            return
+        pairs = [pair for row, item_data in enumerate(self.items) for pair in item_chunks(item_data['item'], row)]
+        chunks = [chunk for chunk, _ in pairs]
+        sections = [self.items[chunk.parent]['section'] for chunk in chunks]
+        
+        def build() -> ChunkIndex:
+            embeddings = self.chunk_cache.encode(
+                [text for _, text in pairs],
+                lambda texts: self.model.encode(texts, show_progress_bar=False)
+            )
+            return ChunkIndex(embeddings, chunks, sections)
+        
+        self.chunk_index = self._from_bundle(
+            "rag_chunks", bundle_key(self.chunk_cache.model_id, [text for _, text in pairs]),
+            lambda part: ChunkIndex.from_bundle(part.arrays, part.meta, chunks, sections), build
+        )
+        print(f"🧩 Chunk index: {len(chunks)} chunks for {len(self.items)} items")
+    
+    def _build_lexical_index(self):
+        """BM25 over each item's full text (every bullet and technology, not just the embedded summary)"""
+        texts = [self._lexical_text(item_data['item']) for item_data in self.items]
+        self.bm25 = self._from_bundle(
+            "bm25", bundle_key(BM25_K1, BM25_B, texts),
+            lambda part: BM25Index.from_bundle(part.arrays, part.meta), lambda: BM25Index(texts)
+        )
+        self.item_sections = np.asarray([item_data['section'] for item_data in self.items])
+    
+    def _from_bundle(self, part: str, key: str, load: Callable[[BundlePart], Any], build: Callable[[], Any]) -> Any:
+        """Index from the bundle part when it still matches key, otherwise built here"""
+        self.bundle_keys[part] = key
+        return load_or_build(self.index_bundle, part, key, load, build)
+    
+    def index_bundle_parts(self) -> Dict[str, BundlePart]:
+        """Item/chunk matrices, BM25 postings and serialized cards, for build_index.py"""
+        index = self.index
+        if type(index) is not VectorIndex:  # IVF / quantized indexes (QuantizedVectorIndex has no float32 matrix)
+            index = VectorIndex(self._embed_items(), [item_data['section'] for item_data in self.items])
+        parts = {"rag_vectors": BundlePart(self.bundle_keys["rag_vectors"], *index.to_bundle())}
+        parts["bm25"] = BundlePart(self.bundle_keys["bm25"], *self.bm25.to_bundle())
+        if self.chunk_index is not None:
+            parts["rag_chunks"] = BundlePart(self.bundle_keys["rag_chunks"], *self.chunk_index.to_bundle())
+        parts["cards"] = cards_part([(item_data['section'], item_data['item']) for item_data in self.items])
+        return parts
+    
+    @staticmethod
+    def _lexical_text(value: Any) -> str:
+        """Every string in an item, flattened"""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, dict):
+            return " ".join(ResumeRAG._lexical_text(child) for child in value.values())
+        if isinstance(value, (list, tuple)):
+            return " ".join(ResumeRAG._lexical_text(child) for child in value)
+        return ""
+    
+    @staticmethod
+    def _item_text(item: Dict[str, Any]) -> str:
+        """Rich text representation of an item for embedding"""
+        text_parts = []
+        
+        # Add title/name/role
+        if 'title' in item:
+            text_parts.append(item['title'])
+        if 'role' in item:
+            text_parts.append(item['role'])
+        if 'name' in item:
+            text_parts.append(item['name'])
+        
+        # Add description
+        if 'description' in item:
+            if isinstance(item['description'], list):
+                text_parts.extend(item['description'][:2])  # First 2 bullet points
+            else:
+                text_parts.append(item['description'])
+        
+        # Add key details
+        if 'key_details' in item:
+            text_parts.extend(item['key_details'][:2])
+        
+        # Add tech stack (important for matching!)
+        if 'tech_stack' in item and item['tech_stack']:
+            if isinstance(item['tech_stack'], list):
+                text_parts.append("Technologies: " + ", ".join(item['tech_stack'][:6]))
+            elif isinstance(item['tech_stack'], dict):
+                # If tech_stack is a dict, get all values
+                all_techs = []
+                for techs in item['tech_stack'].values():
+                    if isinstance(techs, list):
+                        all_techs.extend(techs)
+                if all_techs:
+                    text_parts.append("Technologies: " + ", ".join(all_techs[:6]))
+        
+        if 'technologies' in item and item['technologies']:
+            if isinstance(item['technologies'], list):
+                text_parts.append("Technologies: " + ", ".join(item['technologies'][:6]))
+        
+        # Add company/university/journal
+        if 'company' in item:
+            text_parts.append(f"Company: {item['company']}")
+        if 'university' in item:
+            text_parts.append(f"University: {item['university']}")
+        if 'journal' in item:
+            text_parts.append(f"Published in: {item['journal']}")
+        
+        # Combine into single text
+        return " | ".join(text_parts)
+    
+    def _embed_items(self) -> np.ndarray:
+        """Embeddings of every item's text (cached ones come from disk)"""
+        return self.embedding_cache.encode(
+            [item_data['text'] for item_data in self.items],
+            lambda texts: self.model.encode(texts, show_progress_bar=False)
+        )
+    
+    def _index_file(self, prefix: str, extension: str) -> str:
+        """Index file keyed by model + every item text, so stale indexes are never loaded"""
+        digest = text_hash("\n".join([self.embedding_cache.model_id] + [item_data['text'] for item_data in self.items]))
+        return os.path.join(self.embedding_cache.cache_dir, f"{prefix}_{digest[:16]}{extension}")
+    
+    def _prune_index_files(self, prefix: str, keep: str):
+        """Drop files written for older versions of the data"""
+        for name in os.listdir(self.embedding_cache.cache_dir):
+            if name.startswith(f"{prefix}_") and name != os.path.basename(keep):
+                os.remove(os.path.join(self.embedding_cache.cache_dir, name))
+    
+    def _ivf_path(self) -> str:
+        return self._index_file("ivf", ".npz")
+    
+    def _exact_index(self):
+        """Normalized rows grouped by section: a filtered query only scores its sections"""
+        sections = [item_data['section'] for item_data in self.items]
+        if self.quantization == "none":
+            return VectorIndex(self.embeddings, sections)
+        
+        # int8/float16 rows in memory; float32 rows memory-mapped from disk for rescoring
+        path = self._index_file("rag_vectors", ".npy")
+        index = QuantizedVectorIndex(self.embeddings, sections, self.quantization, full_precision_path=path)
+        try:
+            self._prune_index_files("rag_vectors", path)
+        except OSError:
+            pass
+        self.embeddings = None  # The float32 copy now lives on disk, memory-mapped by the index
+        stats = index.memory_stats()
+        print(f"🗜️ {stats['mode']} index: {stats['resident_bytes'] / 1024:.1f} KB resident ({stats['compression']}x smaller than float32)")
+        return index
+    
+    def _load_or_build_search_index(self):
+        """Exact (optionally quantized) index, or a persisted IVF index in 'ivf' mode"""
+        if self.index_mode != "ivf":
+            return self._exact_index()
+        
+        sections = [item_data['section'] for item_data in self.items]
+        path = self._ivf_path()
+        if os.path.exists(path):
+            try:
+                index = IVFIndex.load(path)
+                if len(index) == len(self.items):
+                    print(f"📂 Loaded IVF index from {path}")
+                    return index
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Ignoring unreadable IVF index {path}: {e}")
+        index = IVFIndex.build(self.embeddings, sections)
+        self._save_ivf(index)
+        return index
+    
+    def _save_ivf(self, index: IVFIndex):
+        """Persist the IVF index and drop files for older versions of the data"""
+        path = self._ivf_path()
+        try:
+            index.save(path)
+            self._prune_index_files("ivf", path)
+        except OSError as e:
+            print(f"⚠️ Could not persist IVF index: {e}")
+    
+    def add_items(self, section_name: str, items: List[Dict[str, Any]]):
+        """Index new items without rebuilding (IVF inserts into existing lists)"""
+        if not items:
+            return
+        start = len(self.items)
+        self.items.extend({'item': item, 'section': section_name, 'text': self._item_text(item)} for item in items)
+        self.embeddings = self._embed_items()
+        if isinstance(self.index, IVFIndex):
+            self.index.add(self.embeddings[start:], [section_name] * len(items))
+            self._save_ivf(self.index)
+        else:
+            self.index = self._exact_index()
+        self._build_lexical_index()
+        self._build_chunk_index()
+        print(f"➕ Indexed {len(items)} new {section_name} items ({len(self.items)} total)")
     
     def semantic_search(
         self, 
@@ -127,39 +380,215 @@ class ResumeRAG:
         Returns:
             List of (item, score) tuples sorted by relevance
         """
-        # Embed query
-        query_embedding = self.model.encode(query, show_progress_bar=False)
+        return self.semantic_search_batch([query], top_k, min_score, section_filter)[0]
+    
+    def semantic_search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        min_score: float = 0.3,
+        section_filter: List[str] = None
+    ) -> List[List[Tuple[Dict[Any, Any], float]]]:
+        """semantic_search for several queries with one encode call and one matrix product"""
+        if not queries:
+            return []
+        # Shared LRU: queries already embedded (this request or a popular earlier one) skip the model
+        # Misses go through the micro-batcher, so concurrent requests share one encode call
+        query_embeddings = self.query_cache.encode_many(get_embedding_batcher(self.model), list(queries), self.embedding_cache.model_id)
+        hits = self.index.search_batch(query_embeddings, top_k=top_k, min_score=min_score, sections=section_filter)
+        return [[(self.items[row]['item'], score) for row, score in query_hits] for query_hits in hits]
+    
+    def chunk_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        min_score: float = 0.3,
+        section_filter: List[str] = None,
+        **options
+    ) -> List[ChunkSearchHit]:
+        """
+        Chunk-level semantic search, pooled back to items
         
-        # Compute cosine similarities
-        similarities = np.dot(self.embeddings, query_embedding) / (
-            np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
-        )
+        Args:
+            query: Search query
+            top_k: Number of items to return
+            min_score: Minimum pooled similarity score (0-1)
+            section_filter: Filter by sections (e.g., ['projects', 'experience'])
+            **options: pooling ('max'/'softmax'), temperature, max_chunks
+        
+        Returns:
+            ChunkSearchHit list (item, pooled score, matched chunks) sorted by relevance
+        """
+        return self.chunk_search_batch([query], top_k, min_score, section_filter, **options)[0]
+    
+    def chunk_search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        min_score: float = 0.3,
+        section_filter: List[str] = None,
+        pooling: str = RAG_CHUNK_POOLING,
+        temperature: float = RAG_CHUNK_TEMPERATURE,
+        max_chunks: int = 3
+    ) -> List[List[ChunkSearchHit]]:
+        """chunk_search for several queries with one encode call"""
+        if self.chunk_index is None:
+            raise RuntimeError("Chunk index disabled (RAG_CHUNK_INDEX=false)")
+        if not queries:
+            return []
+        query_embeddings = self.query_cache.encode_many(get_embedding_batcher(self.model), list(queries), self.embedding_cache.model_id)
+        hits = self.chunk_index.search_batch(query_embeddings, top_k, min_score, section_filter, pooling, temperature, max_chunks)
+        return [
+            [ChunkSearchHit(self.items[row]['item'], self.items[row]['section'], score, self._chunk_matches(chunks))
+             for row, score, chunks in query_hits]
+            for query_hits in hits
+        ]
+    
+    def _chunk_matches(self, chunks: List[Tuple[int, float]]) -> List[Dict[str, Any]]:
+        """Citable description of matched chunk rows"""
+        return [
+            {"chunk_id": chunk.chunk_id, "kind": chunk.kind, "text": chunk.text, "score": round(score, 4)}
+            for chunk, score in ((self.chunk_index.chunks[row], score) for row, score in chunks)
+        ]
+    
+    def hybrid_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        section_filter: List[str] = None,
+        expansions: Optional[List[str]] = None,
+        **options
+    ) -> List[HybridHit]:
+        """
+        Dense + BM25 retrieval in one call
         
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1][:top_k * 2]  # Get 2x for filtering
-        
-        # Filter and collect results
-        results = []
-        for idx in top_indices:
-            score = similarities[idx]
-            
-            # Skip if below threshold
-            if score < min_score:
-                continue
-            
-            item_data = self.items[idx]
-            
-            # Apply section filter if specified
-            if section_filter and item_data['section'] not in section_filter:
-                continue
-            
-            results.append((item_data['item'], float(score)))
-            
-            if len(results) >= top_k:
-                break
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            section_filter: Filter by sections (e.g., ['projects', 'experience'])
+            expansions: Extra terms (e.g. requested + similar techs) embedded and scored with the query
+            **options: fusion ('rrf'/'weighted'), rrf_k, dense_weight, candidates, min_dense_score, pooling,
+                expansion_weight
         
+        Returns:
+            HybridHit list, best first
+        """
+        return self.hybrid_search_batch([query], top_k, section_filter,
+                                        expansions=[expansions or []], **options)[0]
+    
+    def hybrid_search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        section_filter: List[str] = None,
+        fusion: str = HYBRID_FUSION,
+        rrf_k: float = HYBRID_RRF_K,
+        dense_weight: float = HYBRID_DENSE_WEIGHT,
+        candidates: int = HYBRID_CANDIDATES,
+        min_dense_score: float = 0.25,
+        pooling: str = RAG_CHUNK_POOLING,
+        expansions: Optional[List[List[str]]] = None,
+        expansion_weight: float = QUERY_EXPANSION_WEIGHT
+    ) -> List[List[HybridHit]]:
+        """hybrid_search for several queries (one encode call; a hit needs min_dense_score or a BM25 term match)
+        The dense side is the chunk index when enabled (pooled chunk cosine), else the item index.
+        expansions[i] are extra terms for queries[i]: every query and term is embedded in the same encode
+        call and scored in the same matrix product; an item's dense score is its best weighted term score."""
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion {fusion!r} (expected 'rrf' or 'weighted')")
+        if not queries:
+            return []
+        groups = self._expansion_groups(queries, expansions or [[] for _ in queries], expansion_weight)
+        texts = [text for group in groups for text, _ in group]
+        embeddings = self.query_cache.encode_many(get_embedding_batcher(self.model), texts, self.embedding_cache.model_id)
+        if self.chunk_index is not None:
+            term_hits = self.chunk_index.search_batch(embeddings, candidates, min_dense_score, section_filter, pooling)
+        else:
+            term_hits = [[(row, score, []) for row, score in hits] for hits in
+                         self.index.search_batch(embeddings, top_k=candidates, min_score=min_dense_score, sections=section_filter)]
+        
+        lexical_queries = [" ".join(text for text, _ in group) for group in groups]
+        # Lexical candidates need an informative term ("projects using Elixir" must not match on "projects")
+        bm25_scores = self.bm25.scores_batch(lexical_queries, anchored=True)
+        bm25_scores[bm25_scores <= BM25_MIN_SCORE] = 0.0
+        if section_filter:
+            bm25_scores[:, ~np.isin(self.item_sections, list(section_filter))] = 0.0
+        
+        results, start = [], 0
+        for group, lexical_query, lexical in zip(groups, lexical_queries, bm25_scores):
+            dense = self._combine_terms(group, term_hits[start:start + len(group)], min_dense_score, candidates)
+            start += len(group)
+            results.append(self._fuse(lexical_query, dense, lexical, top_k, fusion, rrf_k, dense_weight, candidates))
         return results
     
+    @staticmethod
+    def _expansion_groups(queries: List[str], expansions: List[List[str]], weight: float) -> List[List[Tuple[str, float]]]:
+        """(text, weight) per query: the query itself at 1.0, then its distinct expansion terms"""
+        groups = []
+        for query, terms in zip(queries, expansions):
+            seen = {query.strip().lower()}
+            group = [(query, 1.0)]
+            for term in terms:
+                if term and term.strip().lower() not in seen:
+                    seen.add(term.strip().lower())
+                    group.append((term, weight))
+            groups.append(group)
+        return groups
+    
+    @staticmethod
+    def _combine_terms(group: List[Tuple[str, float]], term_hits: List[List[Tuple[int, float, list]]],
+                       min_score: float, candidates: int) -> List[Tuple[int, float, str, Dict[str, float], list]]:
+        """Weighted-max fusion of one query's term hit lists: (row, score, best term, raw score per term, chunks)"""
+        best: Dict[int, list] = {}
+        for (text, weight), hits in zip(group, term_hits):
+            for row, score, chunks in hits:
+                weighted = weight * score
+                if weighted < min_score:
+                    continue
+                entry = best.setdefault(row, [-np.inf, None, {}, []])
+                entry[2][text] = score
+                if weighted > entry[0]:
+                    entry[0], entry[1], entry[3] = weighted, text, chunks
+        ranked = sorted(best.items(), key=lambda pair: (-pair[1][0], pair[0]))[:candidates]
+        return [(row, float(score), term, term_scores, chunks) for row, (score, term, term_scores, chunks) in ranked]
+    
+    def _fuse(self, query: str, dense_hits: List[Tuple[int, float, str, Dict[str, float], list]],
+              bm25_scores: np.ndarray, top_k: int, fusion: str, rrf_k: float, dense_weight: float,
+              candidates: int) -> List[HybridHit]:
+        """Fuse one query's dense candidates with its top BM25 candidates"""
+        matching = np.flatnonzero(bm25_scores > 0)
+        lexical_rows = matching[np.lexsort((matching, -bm25_scores[matching]))][:candidates]
+        dense_rank = {hit[0]: rank for rank, hit in enumerate(dense_hits, 1)}
+        dense = {hit[0]: hit for hit in dense_hits}
+        bm25_rank = {int(row): rank for rank, row in enumerate(lexical_rows, 1)}
+        rows = list(dict.fromkeys([hit[0] for hit in dense_hits] + list(bm25_rank)))
+        if not rows:
+            return []
+        
+        rows_array = np.asarray(rows, dtype=np.int64)
+        if fusion == "rrf":
+            ranks = [(dense_rank.get(row), bm25_rank.get(row)) for row in rows]
+            fused = np.asarray([sum(1.0 / (rrf_k + rank) for rank in pair if rank is not None) for pair in ranks])
+        else:
+            dense_scores = np.asarray([dense[row][1] if row in dense else 0.0 for row in rows], dtype=np.float32)
+            lexical = bm25_scores[rows_array]
+            fused = dense_weight * np.clip(dense_scores, 0.0, None) + (1.0 - dense_weight) * lexical / max(float(lexical.max()), 1e-9)
+        
+        # Best first; ties keep the original item order
+        order = np.lexsort((rows_array, -fused))[:top_k]
+        hits = []
+        for i in order:
+            row = rows[i]
+            _, dense_score, best_term, term_scores, chunks = dense.get(row, (row, None, None, {}, []))
+            hits.append(HybridHit(
+                item=self.items[row]['item'], section=self.items[row]['section'], score=float(fused[i]),
+                dense_score=dense_score, bm25_score=float(bm25_scores[row]),
+                dense_rank=dense_rank.get(row), bm25_rank=bm25_rank.get(row),
+                matched_terms=self.bm25.matched_terms(query, row),
+                chunks=self._chunk_matches(chunks), best_term=best_term, term_scores=term_scores
+            ))
+        return hits
+    
     def get_relevant_context(
         self, 
         query: str, 
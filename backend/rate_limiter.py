@@ -0,0 +1,272 @@
+# rate_limiter.py
+"""
+Rate Limiter - Token buckets keyed by IP / user / session with separate budgets
+for text queries, voice requests and LLM token spend.
+
+Each bucket is just (tokens, last_update), so every check is O(1). A bucket
+that has been idle long enough to refill completely is indistinguishable from a new
+one, so idle keys are simply dropped. State lives in memory (single worker) or in a
+local SQLite file shared by all uvicorn workers on the host.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Budget:
+    """A token bucket definition: `capacity` tokens, refilled at `refill_per_second`"""
+    name: str
+    capacity: float
+    refill_per_second: float
+    ip_multiplier: float = 5.0  # Shared IPs (NAT, offices) get a bigger bucket
+
+    def capacity_for(self, key: str) -> float:
+        return self.capacity * self.ip_multiplier if key.startswith("ip:") else self.capacity
+
+    def full_at(self, key: str, tokens: float, now: float) -> float:
+        """When a bucket left at `tokens` is full again - after that it can be forgotten"""
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return now + max(self.capacity_for(key) - tokens, 0.0) / self.refill_per_second
+
+
+class LLMBudgetExceeded(Exception):
+    """Raised when a caller has spent their LLM token budget"""
+    pass
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    budget: str
+    remaining: float
+    retry_after_s: float = 0.0
+    limited_key: Optional[str] = None
+
+
+def _refill(tokens: float, updated: float, now: float, budget: Budget, key: str) -> float:
+    return min(budget.capacity_for(key), tokens + (now - updated) * budget.refill_per_second)
+
+
+class InMemoryBackend:
+    """Per-process buckets; idle keys are expired from the least recently updated end"""
+
+    def __init__(self):
+        # (budget, key) -> (tokens, updated, full_at), least recently updated first
+        self._buckets: "OrderedDict[tuple[str, str], tuple[float, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire_idle(self, now: float, max_checks: int = 8):
+        # A few checks per call keeps this amortized O(1)
+        for _ in range(max_checks):
+            if not self._buckets:
+                return
+            _, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now:
+                return
+            self._buckets.popitem(last=False)
+
+    def consume(self, budget: Budget, keys: List[str], cost: float, now: float,
+                allow_debt: bool) -> RateLimitResult:
+        with self._lock:
+            self._expire_idle(now)
+            levels = []
+            for key in keys:
+                state = self._buckets.get((budget.name, key))
+                tokens = budget.capacity_for(key) if state is None else _refill(state[0], state[1], now, budget, key)
+                levels.append(tokens)
+
+            result = _decide(budget, keys, levels, cost, allow_debt)
+            if result.allowed:
+                for key, tokens in zip(keys, levels):
+                    self._buckets.pop((budget.name, key), None)
+                    self._buckets[(budget.name, key)] = (tokens - cost, now, budget.full_at(key, tokens - cost, now))
+            return result
+
+    def size(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteBackend:
+    """Buckets in a local SQLite file so several uvicorn workers share one view"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "budget TEXT NOT NULL, key TEXT NOT NULL, tokens REAL NOT NULL, "
+                "updated REAL NOT NULL, expires REAL NOT NULL, PRIMARY KEY (budget, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_buckets_expires ON rate_buckets (expires)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def consume(self, budget: Budget, keys: List[str], cost: float, now: float,
+                allow_debt: bool) -> RateLimitResult:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")  # Serializes check-and-update across workers
+        try:
+            self._calls += 1
+            if self._calls % 256 == 0:
+                conn.execute("DELETE FROM rate_buckets WHERE expires < ?", (now,))
+
+            levels = []
+            for key in keys:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM rate_buckets WHERE budget = ? AND key = ?", (budget.name, key)
+                ).fetchone()
+                tokens = budget.capacity_for(key) if row is None else _refill(row[0], row[1], now, budget, key)
+                levels.append(tokens)
+
+            result = _decide(budget, keys, levels, cost, allow_debt)
+            if result.allowed:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rate_buckets (budget, key, tokens, updated, expires) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (budget.name, key, tokens - cost, now, min(budget.full_at(key, tokens - cost, now), 1e18))
+                        for key, tokens in zip(keys, levels)
+                    ],
+                )
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def size(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0]
+
+
+def _decide(budget: Budget, keys: List[str], levels: List[float], cost: float, allow_debt: bool) -> RateLimitResult:
+    """All keys must have enough tokens (debits may overdraw when allow_debt is set)"""
+    remaining = min(levels) - cost if levels else 0.0
+    if allow_debt:
+        return RateLimitResult(True, budget.name, remaining)
+
+    for key, tokens in zip(keys, levels):
+        if tokens < cost:
+            missing = cost - tokens
+            retry_after = missing / budget.refill_per_second if budget.refill_per_second > 0 else float("inf")
+            return RateLimitResult(False, budget.name, max(tokens, 0.0), round(retry_after, 2), key)
+    return RateLimitResult(True, budget.name, remaining)
+
+
+class RateLimiter:
+    def __init__(self, budgets: List[Budget], backend=None, enabled: bool = True):
+        self.budgets: Dict[str, Budget] = {budget.name: budget for budget in budgets}
+        self.backend = backend or InMemoryBackend()
+        self.enabled = enabled
+        self.metrics = {"allowed": 0, "limited": 0}
+
+    def check(self, budget_name: str, keys: List[str], cost: float = 1.0) -> RateLimitResult:
+        """Take `cost` tokens from every key's bucket, or none if any bucket is short"""
+        if not self.enabled or not keys:
+            return RateLimitResult(True, budget_name, float("inf"))
+        result = self.backend.consume(self.budgets[budget_name], keys, cost, time.time(), False)
+        self.metrics["allowed" if result.allowed else "limited"] += 1
+        return result
+
+    def peek(self, budget_name: str, keys: List[str]) -> RateLimitResult:
+        """Check whether the budget has anything left without spending it"""
+        if not self.enabled or not keys:
+            return RateLimitResult(True, budget_name, float("inf"))
+        budget = self.budgets[budget_name]
+        result = self.backend.consume(budget, keys, 0.0, time.time(), True)
+        if result.remaining > 0:
+            return result
+        retry_after = -result.remaining / budget.refill_per_second if budget.refill_per_second > 0 else float("inf")
+        return RateLimitResult(False, budget_name, result.remaining, round(retry_after, 2))
+
+    def charge(self, budget_name: str, keys: List[str], amount: float) -> RateLimitResult:
+        """Debit actual spend after the fact (e.g. LLM tokens); the bucket may go negative"""
+        if not self.enabled or not keys or amount <= 0:
+            return RateLimitResult(True, budget_name, float("inf"))
+        return self.backend.consume(self.budgets[budget_name], keys, amount, time.time(), True)
+
+    def stats(self) -> Dict:
+        return {
+            **self.metrics,
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "tracked_buckets": self.backend.size(),
+            "budgets": {
+                name: {"capacity": budget.capacity, "refill_per_minute": round(budget.refill_per_second * 60, 2)}
+                for name, budget in self.budgets.items()
+            },
+        }
+
+
+# Proxies in front of the app that append to X-Forwarded-For (Render: 1). 0 = ignore the header
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+
+
+def client_ip(request, trusted_proxies: Optional[int] = None) -> Optional[str]:
+    """Caller IP as seen by our outermost trusted proxy: the X-Forwarded-For hop it appended.
+    Earlier hops are whatever the client sent, so they can't pick the bucket."""
+    trusted_proxies = RATE_LIMIT_TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if trusted_proxies > 0 and hops:
+        return hops[-min(trusted_proxies, len(hops))]
+    return request.client.host if request.client else None
+
+
+def rate_limit_keys(ip: Optional[str] = None, user_id: Optional[str] = None, session_id: Optional[str] = None) -> List[str]:
+    """Bucket keys for a caller - every identity we know about is limited independently"""
+    keys = []
+    if ip:
+        keys.append(f"ip:{ip}")
+    if user_id:
+        keys.append(f"user:{user_id}")
+    if session_id:
+        keys.append(f"session:{session_id}")
+    return keys
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter from environment settings (see .env.example)"""
+    budgets = [
+        Budget("text", capacity=_env_float("RATE_LIMIT_BURST", 10),
+               refill_per_second=_env_float("RATE_LIMIT_REQUESTS_PER_MINUTE", 60) / 60),
+        Budget("voice", capacity=_env_float("RATE_LIMIT_VOICE_BURST", 3),
+               refill_per_second=_env_float("RATE_LIMIT_VOICE_PER_MINUTE", 10) / 60),
+        Budget("llm_tokens", capacity=_env_float("RATE_LIMIT_LLM_TOKENS_BURST", 4000),
+               refill_per_second=_env_float("RATE_LIMIT_LLM_TOKENS_PER_HOUR", 20000) / 3600),
+    ]
+
+    backend_name = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    if backend_name == "sqlite":
+        path = os.getenv("RATE_LIMIT_DB_PATH", "/tmp/rate_limits.sqlite3")
+        backend = SQLiteBackend(path)
+        print(f"🚦 Rate limiter using shared SQLite store: {path}")
+    else:
+        backend = InMemoryBackend()
+
+    enabled = os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false"
+    return RateLimiter(budgets, backend=backend, enabled=enabled)
+
+
+# Global rate limiter instance
+rate_limiter = create_rate_limiter()
@@ -2,9 +2,23 @@
 Resume Query Processor - Intelligent querying and structured response generation
 """
 import json
+import random
 import re
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import threading
+import time
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from dataclasses import dataclass, field
+from query_rules import QueryRuleEngine, RuleMatches
+from tech_matcher import TechMatcher
+from fuzzy_index import FUZZYWUZZY_AVAILABLE, FuzzyTermIndex
+from tech_index import TechItemIndex
+from date_index import DateIndex
+from entity_index import EntityIndex
+from tech_embeddings import TechEmbeddingIndex, default_index_cache_dir
+from embedding_service import get_query_embedding_cache
+from embedding_batcher import get_embedding_batcher
+from tech_graph import TechNeighbourhood, TechSimilarityGraph, broad_category_fallback
+from index_bundle import USE_INDEX_BUNDLE, BundlePart, bundle_key, load_index_bundle, load_or_build
 
 @dataclass
 class QueryResult:
@@ -14,17 +28,38 @@ class QueryResult:
     item_type: str  # "projects", "experiences", "publications", "skills"
     metadata: Dict[str, Any] = None
 
+@dataclass
+class QueryContext:
+    """Per-request state for a single query (the processor itself is shared and read-only)"""
+    question: str
+    conversation_history: Optional[list] = None
+    rng: random.Random = field(default_factory=random.Random)
+    rules: Optional[RuleMatches] = None  # Rule families that fired (computed once per query)
+
 class ResumeQueryProcessor:
-    def __init__(self, resume_data_path: str = "resume_data.json"):
-        """Initialize with resume data"""
+    # Aliases too common to be fuzzy-match targets
+    FUZZY_SKIP_KEYWORDS = {'experience', 'user experience', 'work', 'project', 'projects'}
+    # Similar techs per requested tech added to the RAG fallback's expanded query
+    RAG_EXPANSION_NEIGHBOURS = 3
+
+    def __init__(self, resume_data_path: str = "resume_data.json", embedding_backend: Optional[str] = None,
+                 use_index_bundle: bool = USE_INDEX_BUNDLE):
+        """Initialize with resume data (embedding_backend: torch / torch-int8 / onnx / onnx-int8;
+        use_index_bundle: load prebuilt indexes from `python build_index.py` when they match)"""
+        self.resume_data_path = resume_data_path
+        self.embedding_backend = embedding_backend
         with open(resume_data_path, 'r') as f:
             self.resume_data = json.load(f)
         
+        # Memory-mapped prebuilt indexes (parts that don't match this data/config are built below)
+        self.index_bundle = load_index_bundle(resume_data_path) if use_index_bundle else None
+        self.bundle_keys: Dict[str, str] = {}
+        
         # Initialize semantic similarity (optional - only if sentence-transformers available)
         self.semantic_model = None
         try:
-            from sentence_transformers import SentenceTransformer
-            self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+            from model_registry import get_embedding_model
+            self.semantic_model = get_embedding_model(embedding_backend)  # Same MiniLM instance as the RAG service
         except ImportError:
             print("💡 Install sentence-transformers for semantic similarity: pip install sentence-transformers")
             pass
@@ -72,6 +107,9 @@ class ResumeQueryProcessor:
             r"(?i)what.*stands.*out", r"(?i)most.*impressive"
         ]
         
+        # Compile greeting/casual/intent/highlights/follow-up rules once
+        self.rule_engine = QueryRuleEngine(self.intent_patterns, self.highlights_patterns)
+        
         # COMPREHENSIVE Technology mappings auto-generated from resume data
         self.tech_mappings = {
             # DEEP LEARNING & NEURAL NETWORKS (CNN, DCNN, etc.)
@@ -226,9 +264,63 @@ class ResumeQueryProcessor:
             "production_systems": ["Production Systems", "scalable systems", "reliability", "monitoring"],
         }
         
+        # Alias automaton + context rules for extract_technologies (built once)
+        self.tech_matcher = TechMatcher(self.tech_mappings)
+        
+        # Fuzzy index over every alias for misspellings / ASR misrecognitions (built once)
+        self.fuzzy_keyword_tech: Dict[str, str] = {}
+        for tech, keywords in self.tech_mappings.items():
+            for keyword in keywords:
+                keyword_lower = keyword.lower()
+                # Skip very common words that might cause false matches
+                if keyword_lower in self.FUZZY_SKIP_KEYWORDS:
+                    continue
+                self.fuzzy_keyword_tech.setdefault(keyword_lower, tech)
+        self.fuzzy_index = self._from_bundle(
+            "fuzzy", bundle_key(list(self.fuzzy_keyword_tech)),
+            lambda part: FuzzyTermIndex.from_bundle(part.arrays, part.meta),
+            lambda: FuzzyTermIndex(self.fuzzy_keyword_tech.keys())
+        )
+        
+        # Inverted tech -> item bitsets for filter_by_technology (built once)
+        self.tech_index = self._from_bundle(
+            "tech_postings", bundle_key(self.tech_mappings),
+            lambda part: TechItemIndex.from_bundle(self.resume_data, self.tech_mappings, part.arrays, part.meta),
+            lambda: TechItemIndex(self.resume_data, self.tech_mappings)
+        )
+        
+        # Parsed date intervals + date-ordered views for filter_by_date and the date sorts (built once)
+        self.date_index = self._from_bundle(
+            "dates", bundle_key("dates"),
+            lambda part: DateIndex(self.resume_data, intervals=part.arrays["intervals"]),
+            lambda: DateIndex(self.resume_data)
+        )
+        
+        # Company / project / publication name lookup for specific-entity questions (built once)
+        tech_terms = set(self.tech_mappings) | {keyword for keywords in self.tech_mappings.values() for keyword in keywords}
+        self.entity_index = EntityIndex(self.resume_data, reserved_terms=tech_terms)
+        
         # Get all technologies from resume for semantic comparison
         self._resume_technologies = self._extract_all_resume_technologies()
         
+        # Normalized vocabulary embedding matrix for semantic fallbacks (persisted, built once)
+        self.tech_embeddings = None
+        vocabulary_key = None
+        if self.semantic_model is not None and self._resume_technologies:
+            from model_registry import embedding_model_id
+            model_id = embedding_model_id(embedding_backend)
+            vocabulary_key = bundle_key(model_id, self._resume_technologies)
+            make_index = lambda matrix=None: TechEmbeddingIndex(
+                self._resume_technologies, get_embedding_batcher(self.semantic_model),
+                model_id=model_id,
+                cache_dir=default_index_cache_dir(resume_data_path),
+                query_cache=get_query_embedding_cache(),
+                matrix=matrix
+            )
+            self.tech_embeddings = self._from_bundle(
+                "tech_vocabulary", vocabulary_key, lambda part: make_index(part.arrays["matrix"]), make_index
+            )
+        
         # COMPREHENSIVE Technology similarity matrix for fallback suggestions
         self.tech_similarity = {
             # NEURAL NETWORKS & DEEP LEARNING (THE MISSING PIECE!)
@@ -308,7 +400,55 @@ class ResumeQueryProcessor:
             "object_detection": ["computer_vision", "opencv", "cnn"],
             "image_processing": ["computer_vision", "opencv", "signal_processing"]
         }
+        
+        # Weighted similarity graph (curated lists + shared aliases + embedding neighbours) with
+        # every tech's fallback suggestions, multi-hop neighbours and item postings precomputed
+        neighbours_fn = None
+        if self.tech_embeddings is not None:
+            embed_neighbours = lambda terms: self.tech_embeddings.most_similar_many(terms, top_k=3, min_score=0.3)
+            neighbours_fn = self._from_bundle(
+                "tech_neighbours", vocabulary_key,
+                lambda part: self._stored_neighbours(part.meta["neighbours"], embed_neighbours),
+                lambda: embed_neighbours
+            )
+        self.tech_graph = TechSimilarityGraph(
+            self.tech_similarity, self.tech_mappings,
+            neighbours_fn=neighbours_fn, postings_fn=self.tech_index.union
+        )
 
+    def _from_bundle(self, part: str, key: str, load: Callable[[BundlePart], Any], build: Callable[[], Any]) -> Any:
+        """Index from the bundle part when it still matches key, otherwise built here"""
+        self.bundle_keys[part] = key
+        return load_or_build(self.index_bundle, part, key, load, build)
+    
+    @staticmethod
+    def _stored_neighbours(stored: Dict[str, List[List[Any]]], embed_neighbours: Callable) -> Callable:
+        """neighbours_fn answering from the bundle (terms it lacks are embedded as usual)"""
+        def neighbours_fn(terms: List[str]) -> Dict[str, List[Tuple[str, float]]]:
+            found = {term: [(name, score) for name, score in stored[term]] for term in terms if term in stored}
+            missing = [term for term in terms if term not in stored]
+            if missing:
+                found.update(embed_neighbours(missing))
+            return found
+        return neighbours_fn
+    
+    def index_bundle_parts(self) -> Dict[str, BundlePart]:
+        """Everything this processor derived from the resume data, for build_index.py"""
+        parts = {}
+        for name, index in (("fuzzy", self.fuzzy_index), ("tech_postings", self.tech_index)):
+            arrays, meta = index.to_bundle()
+            parts[name] = BundlePart(self.bundle_keys[name], arrays, meta)
+        parts["dates"] = BundlePart(self.bundle_keys["dates"], {"intervals": self.date_index.intervals()})
+        if self.tech_embeddings is not None:
+            parts["tech_vocabulary"] = BundlePart(
+                self.bundle_keys["tech_vocabulary"], {"matrix": self.tech_embeddings.matrix},
+                {"vocabulary": self.tech_embeddings.vocabulary}
+            )
+            parts["tech_neighbours"] = BundlePart(
+                self.bundle_keys["tech_neighbours"], meta={"neighbours": self.tech_graph.embedding_neighbours}
+            )
+        return parts
+    
     def _extract_all_resume_technologies(self) -> List[str]:
         """Extract all unique technologies mentioned in the resume"""
         all_techs = set()
@@ -325,125 +465,91 @@ class ResumeQueryProcessor:
                 keywords = item.get("keywords", [])
                 all_techs.update([kw.lower() for kw in keywords])
         
-        return list(all_techs)
+        return sorted(all_techs)  # Stable order so the embedding matrix can be persisted
 
     def get_semantic_similarities(self, tech: str, top_k: int = 3) -> List[str]:
         """Get semantically similar technologies using embeddings (fallback method)"""
-        if not self.semantic_model or not self._resume_technologies:
+        if not self.tech_embeddings:
             return []
         
         try:
-            # Get embedding for requested technology
-            tech_embedding = self.semantic_model.encode([tech])
-            
-            # Get embeddings for all resume technologies
-            resume_embeddings = self.semantic_model.encode(self._resume_technologies)
-            
-            # Calculate cosine similarities
-            from sklearn.metrics.pairwise import cosine_similarity
-            similarities = cosine_similarity(tech_embedding, resume_embeddings)[0]
-            
-            # Get top-k most similar technologies
-            similar_indices = similarities.argsort()[-top_k:][::-1]
-            similar_techs = [self._resume_technologies[i] for i in similar_indices if similarities[i] > 0.3]  # 0.3 threshold
-            
-            return similar_techs
+            # One matrix-vector product against the precomputed vocabulary matrix (0.3 threshold)
+            return [name for name, _ in self.tech_embeddings.most_similar(tech, top_k=top_k, min_score=0.3)]
             
         except Exception as e:
             print(f"Semantic similarity error: {e}")
             return []
 
-    def get_similar_technologies_hybrid(self, tech: str) -> List[str]:
-        """Hybrid approach: hard-coded mappings + semantic similarity fallback"""
-        # 1. Try hard-coded mappings first (most reliable)
-        if tech.lower() in self.tech_similarity:
-            return self.tech_similarity[tech.lower()]
-        
-        # 2. Try semantic similarity as fallback (for unknown technologies)
+    def get_tech_neighbourhood(self, tech: str) -> TechNeighbourhood:
+        """Similar techs + their item postings: precomputed for known techs, resolved once otherwise"""
+        neighbourhood = self.tech_graph.lookup(tech)
+        if neighbourhood is not None:
+            if neighbourhood.source == "semantic":
+                print(f"🤖 Using semantic similarity for '{tech}': {neighbourhood.similar}")
+            return neighbourhood
+        
+        # Unknown term: semantic similarity, then broad category matching
         semantic_similar = self.get_semantic_similarities(tech, top_k=3)
         if semantic_similar:
             print(f"🤖 Using semantic similarity for '{tech}': {semantic_similar}")
-            return semantic_similar
-        
-        # 3. Last resort: try broad category matching
-        broad_categories = {
-            "database": ["database", "mongodb"],
-            "frontend": ["javascript", "web_development"], 
-            "backend": ["python", "backend"],
-            "ml": ["machine_learning"]
-        }
-        
-        for category, fallback_techs in broad_categories.items():
-            if category in tech.lower() or any(word in tech.lower() for word in ["db", "front", "back", "ai"]):
-                return fallback_techs
-        
-        return []
+            return self.tech_graph.build_neighbourhood(tech, semantic_similar, "semantic")
+        broad = broad_category_fallback(tech)
+        return self.tech_graph.build_neighbourhood(tech, broad, "broad" if broad else "none")
 
-    def extract_intent(self, query: str) -> str:
+    def rag_expansion_terms(self, tech: str, neighbourhood: TechNeighbourhood) -> List[str]:
+        """tech + its closest techs for RAG query expansion: best multi-hop graph scores first
+        (terms resolved at query time have no graph neighbours, so their suggestions are used)"""
+        ranked = [other for other, _ in neighbourhood.neighbours] or neighbourhood.similar
+        return [tech] + ranked[:self.RAG_EXPANSION_NEIGHBOURS]
+
+    def get_similar_technologies_hybrid(self, tech: str) -> List[str]:
+        """Hybrid approach: hard-coded mappings + semantic similarity fallback + broad categories"""
+        return self.get_tech_neighbourhood(tech).similar
+
+    def extract_intent(self, query: str, rules: Optional[RuleMatches] = None) -> str:
         """Extract the main intent from the query - be more conservative"""
-        query_lower = query.lower()
+        rules = rules or self.rule_engine.classify(query)
         
         # Check for simple greetings or casual conversation first
-        greeting_patterns = [
-            r"^(hi|hello|hey|yo|sup|what's up)$",
-            r"^how are you",
-            r"^good morning",
-            r"^good afternoon", 
-            r"^good evening"
-        ]
-        
-        # Check for casual conversational queries that don't need cards
-        casual_patterns = [
-            r"what does that even mean",
-            r"what do you mean",
-            r"i don't understand",
-            r"that doesn't make sense",
-            r"what are you talking about",
-            r"huh\?",
-            r"what\?",
-            r"^are you there",
-            r"^test",
-            r"^testing",
-            r"one.*two.*three",
-            r"can you hear me"
-        ]
-        
-        if any(re.search(pattern, query_lower.strip()) for pattern in greeting_patterns):
+        if "greeting" in rules:
             return "greeting"
             
-        if any(re.search(pattern, query_lower.strip()) for pattern in casual_patterns):
+        # Check for casual conversational queries that don't need cards
+        if "casual" in rules:
             return "general"
         
-        intent_scores = {}
-        for intent, patterns in self.intent_patterns.items():
-            score = sum(1 for pattern in patterns if re.search(pattern, query))
-            if score > 0:
-                intent_scores[intent] = score
-        
+        intent_scores = rules.intent_scores
         if intent_scores:
             return max(intent_scores, key=intent_scores.get)
         
         # Check if it's a general conversational query that doesn't need cards
-        general_patterns = [
-            r"tell me about yourself",
-            r"who are you",
-            r"what do you do",
-            r"introduce yourself"
-        ]
-        
-        if any(re.search(pattern, query_lower) for pattern in general_patterns):
+        if "general" in rules:
             return "general"
         
         # Default fallback only if there's clear intent for content
         return "projects"
 
-    def is_highlights_query(self, query: str) -> bool:
+    def is_highlights_query(self, query: str, rules: Optional[RuleMatches] = None) -> bool:
         """Check if query is asking for highlights or career recap"""
-        return any(re.search(pattern, query) for pattern in self.highlights_patterns)
+        rules = rules or self.rule_engine.classify(query)
+        return "highlights" in rules
+
+    @staticmethod
+    def _tag_items(items: List[Dict], content_type: str) -> List[Dict]:
+        """Return shallow copies of items tagged with their content source (never mutate shared resume data)"""
+        return [{**item, "content_source": content_type} for item in items]
 
     def sort_projects_by_date(self, projects: List[Dict]) -> List[Dict]:
         """Sort projects by date (most recent first) as default ordering"""
-        return sorted(projects, key=lambda x: x.get("date", "2020"), reverse=True)
+        return self.date_index.sort(projects, "date")
+
+    def match_fuzzy_tech(self, text: str, min_score: int = 82) -> Optional[Tuple[str, str, int]]:
+        """Closest tech alias to a (possibly misspelled or misheard) term: (alias, tech, score)"""
+        match = self.fuzzy_index.best_match(text, min_score)
+        if match is None:
+            return None
+        alias, score = match
+        return alias, self.fuzzy_keyword_tech[alias], score
 
     def extract_technologies(self, query: str) -> List[str]:
         """Extract mentioned technologies/keywords from the query (conservative approach with fuzzy matching)"""
@@ -451,103 +557,48 @@ class ResumeQueryProcessor:
         found_techs = []
         
         # SPECIAL CASE: Context-aware detection for ambiguous terms (e.g., "Go", "R", "C")
-        # These are common words but in specific contexts they refer to programming languages
-        context_patterns = {
-            "go": [
-                r'\b(in|using|with|knowledge of|experience in|worked with|built with|coded in|programming in)\s+go\b',
-                r'\bgolang\b'
-            ],
-            "r": [
-                r'\b(in|using|with|knowledge of|experience in|worked with)\s+r\b',
-                r'\br\s+(programming|language|statistical)\b',
-                r'\brstudio\b'
-            ],
-            "c": [
-                r'\b(in|using|with|knowledge of|experience in|worked with|coded in)\s+c\b',
-                r'\bc\s+(programming|language)\b',
-                r'\bc\+\+\b'  # If they mention C++, they might mean C too
-            ],
-            "java": [
-                r'\b(in|using|with|knowledge of|experience in|experience|worked with|coded in|programming in)\s+java\b',
-                r'\bjava\s+(programming|development|language|experience|projects?|work)\b',
-                r'\bjava\s+\w+\b'  # Java followed by any word (Java developer, Java projects, etc.)
-            ],
-            "rust": [
-                r'\b(in|using|with|knowledge of|experience in|experience|worked with|coded in)\s+rust\b',
-                r'\brust\s+(programming|language|projects?|work)\b',
-                r'\b(his|her|their)\s+rust\s+\w+\b',  # His Rust projects
-                r'\brust\s+\w+\b'  # Rust followed by any word
-            ]
-        }
-        
-        for tech, patterns in context_patterns.items():
-            if any(re.search(pattern, query_lower) for pattern in patterns):
+        # (patterns live in tech_matcher.CONTEXT_TECH_PATTERNS, compiled once)
+        for tech in self.tech_matcher.match_context(query_lower):
+            found_techs.append(tech)
+            print(f"🎯 Context match: Found '{tech}' via context patterns")
+        
+        # First pass: exact matching with word boundaries (one Aho-Corasick scan over all aliases)
+        for tech in self.tech_matcher.match_aliases(query_lower):
+            if tech not in found_techs:  # Avoid duplicates from context matching
                 found_techs.append(tech)
-                print(f"🎯 Context match: Found '{tech}' via context patterns")
-        
-        # First pass: exact matching with word boundaries
-        for tech, keywords in self.tech_mappings.items():
-            for keyword in keywords:
-                if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', query_lower):
-                    if tech not in found_techs:  # Avoid duplicates from context matching
-                        found_techs.append(tech)
-                    break
         
         # Second pass: fuzzy matching for potential misspellings (only if no exact matches found)
-        if not found_techs:
-            try:
-                from fuzzywuzzy import fuzz
-                from fuzzywuzzy.process import extractOne
-                
-                # Get all unique keywords from tech mappings for fuzzy matching
-                all_keywords = []
-                keyword_to_tech = {}
-                for tech, keywords in self.tech_mappings.items():
-                    for keyword in keywords:
-                        keyword_lower = keyword.lower()
-                        # Skip very common words that might cause false matches
-                        if keyword_lower in ['experience', 'user experience', 'work', 'project', 'projects']:
-                            continue
-                        if keyword_lower not in all_keywords:  # Avoid duplicates
-                            all_keywords.append(keyword_lower)
-                            keyword_to_tech[keyword_lower] = tech
-                
-                # Split query into words and find fuzzy matches
-                query_words = re.findall(r'\b\w+\b', query_lower)
-                
-                # Also try matching 2-word combinations for multi-word tech terms
-                two_word_combinations = []
-                for i in range(len(query_words) - 1):
-                    two_word_combinations.append(f"{query_words[i]} {query_words[i+1]}")
-                
-                # Check single words first
-                for word in query_words:
-                    if len(word) >= 4:  # Only check words of reasonable length (increased from 3)
-                        # Find best fuzzy match
-                        best_match, score = extractOne(word, all_keywords, scorer=fuzz.ratio)
-                        
-                        # Accept matches with score >= 82 (balanced threshold for accuracy vs coverage)
-                        if score >= 82:
-                            matched_tech = keyword_to_tech[best_match]
-                            if matched_tech not in found_techs:
-                                found_techs.append(matched_tech)
-                                print(f"🎯 Fuzzy match: '{word}' -> '{best_match}' (tech: {matched_tech}, score: {score})")
-                
-                # Check two-word combinations
-                for two_word in two_word_combinations:
-                    if len(two_word.replace(' ', '')) >= 6:  # Reasonable length for two-word term
-                        best_match, score = extractOne(two_word, all_keywords, scorer=fuzz.ratio)
-                        
-                        # Slightly lower threshold for two-word matches since they're more specific
-                        if score >= 80:
-                            matched_tech = keyword_to_tech[best_match]
-                            if matched_tech not in found_techs:
-                                found_techs.append(matched_tech)
-                                print(f"🎯 Fuzzy 2-word match: '{two_word}' -> '{best_match}' (tech: {matched_tech}, score: {score})")
-            
-            except ImportError:
-                # Fuzzy matching not available, continue with exact matching only
-                pass
+        # Fuzzy matching stays opt-in: without fuzzywuzzy installed, continue with exact matching only
+        if not found_techs and FUZZYWUZZY_AVAILABLE:
+            # Split query into words and find fuzzy matches
+            query_words = re.findall(r'\b\w+\b', query_lower)
+            
+            # Also try matching 2-word combinations for multi-word tech terms
+            two_word_combinations = []
+            for i in range(len(query_words) - 1):
+                two_word_combinations.append(f"{query_words[i]} {query_words[i+1]}")
+            
+            # Check single words first
+            for word in query_words:
+                if len(word) >= 4:  # Only check words of reasonable length (increased from 3)
+                    # Accept matches with score >= 82 (balanced threshold for accuracy vs coverage)
+                    match = self.match_fuzzy_tech(word, min_score=82)
+                    if match:
+                        best_match, matched_tech, score = match
+                        if matched_tech not in found_techs:
+                            found_techs.append(matched_tech)
+                            print(f"🎯 Fuzzy match: '{word}' -> '{best_match}' (tech: {matched_tech}, score: {score})")
+            
+            # Check two-word combinations
+            for two_word in two_word_combinations:
+                if len(two_word.replace(' ', '')) >= 6:  # Reasonable length for two-word term
+                    # Slightly lower threshold for two-word matches since they're more specific
+                    match = self.match_fuzzy_tech(two_word, min_score=80)
+                    if match:
+                        best_match, matched_tech, score = match
+                        if matched_tech not in found_techs:
+                            found_techs.append(matched_tech)
+                            print(f"🎯 Fuzzy 2-word match: '{two_word}' -> '{best_match}' (tech: {matched_tech}, score: {score})")
         
         return list(set(found_techs))
 
@@ -622,271 +673,41 @@ class ResumeQueryProcessor:
         if not date_filters["years"]:
             return items
 
-        filtered_items = []
         target_years = [int(year) for year in date_filters["years"]]
-        date_modifier = date_filters["date_modifier"]
-
-        for item in items:
-            # Get date information from item
-            dates_field = item.get("dates", item.get("date", ""))
-            if not dates_field:
-                continue
-
-            # Parse date ranges (e.g., "Mar. 2024 – Jan. 2025" or "Feb 2025")
-            if "–" in dates_field or "-" in dates_field:
-                # Date range
-                separator = "–" if "–" in dates_field else "-"
-                parts = dates_field.split(separator)
-                if len(parts) == 2:
-                    start_part = parts[0].strip()
-                    end_part = parts[1].strip()
-
-                    # Extract years from start and end
-                    start_year_match = re.search(r'(20[0-9]{2})', start_part)
-                    end_year_match = re.search(r'(20[0-9]{2})', end_part)
-
-                    if start_year_match and end_year_match:
-                        start_year = int(start_year_match.group(1))
-                        end_year = int(end_year_match.group(1))
-
-                        # Apply date filtering logic
-                        if date_modifier == "from_only":
-                            # Only items that START in one of the target years
-                            if start_year in target_years:
-                                filtered_items.append(item)
-                        elif date_modifier == "in_only":
-                            # Only items that are ENTIRELY within target years
-                            if start_year in target_years and end_year in target_years:
-                                filtered_items.append(item)
-                        elif date_modifier == "last_two_years":
-                            # Items that overlap with the last two years
-                            if any(start_year <= target_year <= end_year for target_year in target_years):
-                                filtered_items.append(item)
-                        elif date_modifier == "during" or date_modifier == "in":
-                            # Items that overlap with any target year
-                            if any(start_year <= target_year <= end_year for target_year in target_years):
-                                filtered_items.append(item)
-                        elif date_modifier == "from":
-                            # Items that START in target year or END in target year (inclusive)
-                            if start_year in target_years or end_year in target_years:
-                                filtered_items.append(item)
-                        elif date_modifier == "after":
-                            # Items that start after target year
-                            if start_year > max(target_years):
-                                filtered_items.append(item)
-                        elif date_modifier == "before":
-                            # Items that end before target year
-                            if end_year < min(target_years):
-                                filtered_items.append(item)
-                        else:
-                            # Default: items that overlap with any target year
-                            if any(start_year <= target_year <= end_year for target_year in target_years):
-                                filtered_items.append(item)
-            else:
-                # Single date (e.g., "Feb 2025")
-                year_match = re.search(r'(20[0-9]{2})', dates_field)
-                if year_match:
-                    item_year = int(year_match.group(1))
-
-                    if item_year in target_years:
-                        filtered_items.append(item)
-
-        return filtered_items
+        return self.date_index.filter(items, target_years, date_filters["date_modifier"])
 
     def filter_by_technology(self, items: List[Dict], tech_filters: List[str]) -> List[Dict]:
-        """Filter items by technology keywords with precise matching"""
+        """Filter items by technology keywords with precise matching (see tech_index for the rules)"""
         if not tech_filters:
             return items
         
-        filtered_items = []
-        for item in items:
-            item_techs = item.get("technologies", [])
-            item_keywords = item.get("keywords", [])
-            item_text = " ".join([
-                item.get("title", ""),
-                item.get("company", ""),
-                item.get("description", ""),
-                " ".join(item.get("highlights", []))
-            ]).lower()
-            
-            # Check if any filter matches
-            match_found = False
-            for tech_filter in tech_filters:
-                tech_lower = tech_filter.lower()
-                
-                # SPECIAL HANDLING: For very short terms (≤3 chars), use word boundaries to avoid substring matches
-                # This prevents "go" from matching "MongoDB", "Django", etc.
-                use_word_boundary = len(tech_filter) <= 3
-                
-                if use_word_boundary:
-                    # Use regex word boundaries for short terms
-                    import re
-                    word_pattern = r'\b' + re.escape(tech_lower) + r'\b'
-                    
-                    # Check technologies with word boundaries
-                    if any(re.search(word_pattern, tech.lower()) for tech in item_techs):
-                        match_found = True
-                        break
-                    # Check keywords with word boundaries
-                    if any(re.search(word_pattern, keyword.lower()) for keyword in item_keywords):
-                        match_found = True
-                        break
-                    # Check text with word boundaries
-                    if re.search(word_pattern, item_text):
-                        match_found = True
-                        break
-                else:
-                    # Normal substring matching for longer terms
-                    # Direct technology match (exact or substring)
-                    if any(tech_lower in tech.lower() for tech in item_techs):
-                        match_found = True
-                        break
-                    # Keyword match (exact or substring)
-                    if any(tech_lower in keyword.lower() for keyword in item_keywords):
-                        match_found = True
-                        break
-                    # Text content match using tech mappings - BUT ONLY if specific tech found
-                    if tech_filter in self.tech_mappings:
-                        mapped_keywords = self.tech_mappings[tech_filter]
-                        # For database category, require SPECIFIC database tech match
-                        if tech_filter == "database":
-                            # Only match if specific database tech is found in item
-                            specific_db_match = False
-                            for keyword in mapped_keywords:
-                                if keyword.lower() in item_text or any(keyword.lower() in tech.lower() for tech in item_techs):
-                                    specific_db_match = True
-                                    break
-                            if specific_db_match:
-                                match_found = True
-                                break
-                        else:
-                            # For other categories, use general matching
-                            if any(keyword.lower() in item_text for keyword in mapped_keywords):
-                                match_found = True
-                                break
-                    # Direct text match (for specific tech names)
-                    if tech_lower in item_text:
-                        match_found = True
-                        break
-            
-            if match_found:
-                filtered_items.append(item)
-        
-        return filtered_items
+        return self.tech_index.filter(items, tech_filters)
 
-    def _is_followup_query(self, question: str) -> bool:
+    def _is_followup_query(self, question: str, rules: Optional[RuleMatches] = None) -> bool:
         """Detect if this is a follow-up query that needs context"""
         print(f"🔍 FOLLOWUP DEBUG - Testing patterns for: '{question}'")
-        followup_patterns = [
-            r'(?i)\btell me more\b',
-            r'(?i)\bmore about (that|those|them|it)\b',
-            r'(?i)\bwhat about (that|those|them)\b',
-            r'(?i)\bexpand on (that|those|them)\b',
-            r'(?i)\bshow me more\b',
-            r'(?i)\bgive me details\b',
-            r'(?i)\b(that|those|them|it)\b.*\b(sounds?|looks?|seems?)\b',
-            # ORDINAL REFERENCES - "the first project", "second one", "the 3rd item"
-            r'(?i)\b(the\s+)?(first|1st|second|2nd|third|3rd|fourth|4th|last)\s+(one|project|experience|item|card|company|work|role|publication)\b',
-            r'(?i)\b(about|tell.*about|more.*about|details.*on)\s+(the\s+)?(first|1st|second|2nd|third|3rd|fourth|4th|last)\b',
-            # CONTEXTUAL REFERENCE PATTERNS - the key missing piece!
-            r'(?i)\bin (this|that)\b',
-            r'(?i)\bat (this|that)\b',  
-            r'(?i)\bfor (this|that)\b',
-            r'(?i)\bwith (this|that)\b',
-            r'(?i)\bdid.*you.*do.*\bin (this|that|there)\b',
-            r'(?i)\bwhat.*did.*he.*do.*\bin (this|that|there)\b',
-            r'(?i)\bany.*\bin (this|that|there)\b',
-            r'(?i)\bwas there.*\bin (this|that)\b',
-            r'(?i)\bdid.*involve.*\bin (this|that)\b',
-            r'(?i)\b(here|there)\b.*\?',
-            r'(?i)\bin (that|this) (project|experience|work|role|position)\b',
-            # CLARIFICATION PATTERNS
-            r'(?i)^no,?\s*i\s*meant\b',
-            r'(?i)^actually,?\s*i\s*meant\b',
-            r'(?i)^sorry,?\s*i\s*meant\b',
-            r'(?i)\bwhat.*did.*he.*do.*\b(at|in)\s+\w+\s+(experience|company|job|role)\b',
-            r'(?i)\bin\s+\w+\s+(experience|company|job|role)\b',
-            # MORE FLEXIBLE PATTERNS
-            r'(?i)\bshow me more\b.*\b(details?|information|info)\b',
-            r'(?i)\bgive me more\b.*\b(details?|information|info)\b',
-            r'(?i)\btell me more\b.*\b(details?|information|info)\b',
-            # SHOW ALL PATTERNS
-            r'(?i)\bshow all\b',
-            r'(?i)\bshow me all\b',
-            r'(?i)\bgive me all\b',
-            r'(?i)\ball of them\b',
-            r'(?i)\beverything\b',
-            r'(?i)\ball results\b',
-            r'(?i)\ball available\b'
-        ]
-        
-        is_followup = any(re.search(pattern, question) for pattern in followup_patterns)
+        rules = rules or self.rule_engine.classify(question)
+        is_followup = "followup" in rules
         print(f"🔍 FOLLOWUP DEBUG - Is followup query: {is_followup}")
         if is_followup:
-            for pattern in followup_patterns:
-                if re.search(pattern, question):
-                    print(f"🔍 FOLLOWUP DEBUG - MATCHED pattern: {pattern}")
-                    break
+            print(f"🔍 FOLLOWUP DEBUG - MATCHED pattern: {self.rule_engine.first_match('followup', question)}")
         return is_followup
-    
+
     def _detect_specific_entity(self, question: str) -> Optional[Dict]:
         """Detect if the user is asking about a specific company, project, or item"""
-        question_lower = question.lower()
-        
-        # Company/Organization patterns
-        company_patterns = [
-            r'(?i)what.*did.*he.*do.*(?:at|in|for)\s+(.+?)(?:\?|$)',
-            r'(?i)what.*specifically.*(?:at|in|for)\s+(.+?)(?:\?|$)',
-            r'(?i)tell me about.*(?:his work|experience).*(?:at|in|for)\s+(.+?)(?:\?|$)',
-            r'(?i)(?:at|in|for)\s+(.+?)(?:\?|$)',
-            r'(?i)about.*(.+?)\s+(?:lab|company|inc|corp|llc|organization)(?:\?|$)',
-            r'(?i)tell me about\s+(.+?)(?:\?|$)',  # General "tell me about X" pattern
-            r'(?i)\bin\s+(.+?)\s+(experience|company|job|role)\b',  # "in Quinnis experience"
-            r'(?i)\bat\s+(.+?)\s+(experience|company|job|role)\b',  # "at Quinnis experience"
-            r'(?i)(?:no,?\s*i\s*meant\s*)?what.*did.*he.*do.*(?:at|in)\s+(.+?)(?:\?|$)'  # Clarification patterns
-        ]
-        
-        for pattern in company_patterns:
-            match = re.search(pattern, question)
-            if match:
-                entity_name = match.group(1).strip()
-                # Clean up common speech recognition errors and variations
-                entity_name = re.sub(r'\b(slap|lab)\b', 'lab', entity_name, flags=re.IGNORECASE)
-                entity_name = re.sub(r'\b(robot|robots)\b', 'robots', entity_name, flags=re.IGNORECASE)
-                
-                # Search for matching items across all content types
-                matched_items = []
-                for content_type in ["experience", "projects", "publications"]:
-                    items = self.resume_data.get(content_type, [])
-                    for item in items:
-                        # Check company name, title, or description
-                        searchable_text = " ".join([
-                            item.get("company", ""),
-                            item.get("title", ""),
-                            item.get("description", "")
-                        ]).lower()
-                        
-                        # Flexible matching - check if key words from entity_name appear
-                        entity_words = entity_name.lower().split()
-                        if len(entity_words) >= 2:  # Multi-word entities
-                            word_matches = sum(1 for word in entity_words if word in searchable_text and len(word) > 2)
-                            if word_matches >= 2:  # At least 2 significant words match
-                                item["content_source"] = content_type
-                                matched_items.append(item)
-                        elif len(entity_words) == 1 and len(entity_words[0]) > 3:  # Single significant word
-                            if entity_words[0] in searchable_text:
-                                item["content_source"] = content_type
-                                matched_items.append(item)
-                
-                if matched_items:
-                    return {
-                        "entity_name": entity_name,
-                        "entity_type": "company_or_project",
-                        "matched_items": matched_items,
-                        "query_type": "specific_entity"
-                    }
+        # Patterns, ASR clean-up ("slap" -> "lab") and name postings live in entity_index
+        detected = self.entity_index.detect(question)
+        if detected is None:
+            return None
         
-        return None
+        entity_name, matches = detected
+        return {
+            "entity_name": entity_name,
+            "entity_type": "company_or_project",
+            "matched_items": [{**match.item, "content_source": match.section} for match in matches],
+            "match_scores": [match.score for match in matches],
+            "query_type": "specific_entity"
+        }
     
     def _handle_followup_query(self, question: str, conversation_history: list) -> QueryResult:
         """Handle follow-up queries using conversation context"""
@@ -1129,15 +950,17 @@ class ResumeQueryProcessor:
             if prev_item_type == "projects":
                 all_items_of_type = self.sort_projects_by_date(all_items_of_type)
             
+            # Tag with content source
+            default_source = prev_item_type if prev_item_type != "mixed" else "projects"
+            all_items_of_type = [
+                item if item.get('content_source') else {**item, "content_source": default_source}
+                for item in all_items_of_type
+            ]
+            
             # Filter OUT already shown items (this is the KEY fix!)
             remaining_items = [item for item in all_items_of_type if item.get('id') not in shown_item_ids]
             print(f"🔍 DEBUG - Total items: {len(all_items_of_type)}, Already shown: {len(shown_item_ids)}, Remaining: {len(remaining_items)}")
             
-            # Tag with content source
-            for item in remaining_items:
-                if 'content_source' not in item or not item.get('content_source'):
-                    item["content_source"] = prev_item_type if prev_item_type != "mixed" else "projects"
-            
             # If no remaining items, show all items again with a note
             if not remaining_items:
                 remaining_items = all_items_of_type
@@ -1238,10 +1061,7 @@ class ResumeQueryProcessor:
                             items = self.filter_by_date(items, prev_date_filters)
                         
                         # Tag with content source
-                        for item in items:
-                            item["content_source"] = content_type
-                        
-                        all_items_of_type.extend(items)
+                        all_items_of_type.extend(self._tag_items(items, content_type))
                     
                     print(f"🔍 DEBUG - Mixed query found {len(all_items_of_type)} total items")
                 else:
@@ -1285,8 +1105,7 @@ class ResumeQueryProcessor:
                     next_batch = remaining_items[:batch_size]
                     
                     # Tag with content source
-                    for item in next_batch:
-                        item["content_source"] = prev_item_type if prev_item_type != "mixed" else "projects"
+                    next_batch = self._tag_items(next_batch, prev_item_type if prev_item_type != "mixed" else "projects")
                     
                     return QueryResult(
                         response_text=f"Here are {len(next_batch)} more {prev_item_type}:",
@@ -1411,10 +1230,7 @@ class ResumeQueryProcessor:
                 items = self.resume_data.get(content_type, [])
                 items = self.filter_by_technology(items, prev_tech_filters)
                 
-                for item in items:
-                    item["content_source"] = content_type
-                
-                all_items.extend(items)
+                all_items.extend(self._tag_items(items, content_type))
                 content_type_counts[content_type] = len(items)
             
             if all_items:
@@ -1422,7 +1238,7 @@ class ResumeQueryProcessor:
                 sorted_items = []
                 if "publications" in content_type_counts:
                     pub_items = [item for item in all_items if item["content_source"] == "publications"]
-                    pub_items = sorted(pub_items, key=lambda x: x.get("date", "2020"), reverse=True)
+                    pub_items = self.date_index.sort(pub_items, "date")
                     sorted_items.extend(pub_items)
                 if "projects" in content_type_counts:
                     project_items = [item for item in all_items if item["content_source"] == "projects"]
@@ -1493,12 +1309,18 @@ class ResumeQueryProcessor:
         
         return f"Here's what I found about {intent}:"
 
-    def query(self, question: str, conversation_history: list = None) -> QueryResult:
+    def query(self, question: str, conversation_history: list = None, context: Optional[QueryContext] = None) -> QueryResult:
         """Process a natural language query and return structured results"""
+        ctx = context or QueryContext(question=question, conversation_history=conversation_history)
         print(f"🔍 FOLLOWUP DEBUG - Query: '{question}', History: {bool(conversation_history)}")
         
+        # Classify once - intent, highlights and follow-up checks all reuse this
+        if ctx.rules is None:
+            ctx.rules = self.rule_engine.classify(question)
+        rules = ctx.rules
+        
         # Extract intent first to handle greetings before guardrails
-        intent = self.extract_intent(question)
+        intent = self.extract_intent(question, rules)
         
         # Handle greetings gracefully (don't block as off-topic)
         if intent in ["greeting", "general"]:
@@ -1529,7 +1351,7 @@ class ResumeQueryProcessor:
             )
         
         # CONTEXT-AWARE PROCESSING: Handle follow-up queries
-        if conversation_history and self._is_followup_query(question):
+        if conversation_history and self._is_followup_query(question, rules):
             print(f"🔍 FOLLOWUP DEBUG - Detected as followup query!")
             context_result = self._handle_followup_query(question, conversation_history)
             if context_result:
@@ -1571,19 +1393,10 @@ class ResumeQueryProcessor:
         date_filters = self.extract_date_filters(question)
         
         # SPECIAL HANDLING: If this is a very general query, force mixed content search
-        very_general_queries = [
-            r"^(tell|show).*\b(me|us)\b.*\babout\s+(him|her|them|nitigya)$",
-            r"^what\s+(has|have|did)\s+(he|she|they|nitigya)\s+done\??$",
-            r"^show\s+me\s+(everything|all)$",
-            r"^tell\s+me\s+everything$",
-            r"^what('s| is)\s+(his|her|their)\s+(background|story|work)$",
-            r"^(his|her|their)\s+(background|story|resume|portfolio)$"
-        ]
-        
-        is_very_general = any(re.search(pattern, question.lower().strip()) for pattern in very_general_queries)
+        is_very_general = "very_general" in rules
         
         # SPECIAL HANDLING: If this is a highlights/recap query, force mixed content search
-        is_highlights = self.is_highlights_query(question) or is_very_general
+        is_highlights = self.is_highlights_query(question, rules) or is_very_general
         if is_highlights:
             print(f"🎯 Detected highlights query: '{question}' - forcing mixed content search")
             # Override intent to mixed and ensure we search across all content types
@@ -1631,9 +1444,7 @@ class ResumeQueryProcessor:
                         items = self.filter_by_date(items, date_filters)
                     
                     # Take top 2-3 items from each category for highlights
-                    limited_items = items[:3] if content_type == "projects" else items[:2]
-                    for item in limited_items:
-                        item["content_source"] = content_type
+                    limited_items = self._tag_items(items[:3] if content_type == "projects" else items[:2], content_type)
                     all_items.extend(limited_items)
                     content_type_counts[content_type] = len(limited_items)
             else:
@@ -1650,10 +1461,7 @@ class ResumeQueryProcessor:
                         items = self.filter_by_date(items, date_filters)
                     
                     # Tag items with their source
-                    for item in items:
-                        item["content_source"] = content_type
-                    
-                    all_items.extend(items)
+                    all_items.extend(self._tag_items(items, content_type))
                     content_type_counts[content_type] = len(items)
             
             # If we found items across multiple types, return them
@@ -1672,7 +1480,7 @@ class ResumeQueryProcessor:
                 if "publications" in content_type_counts:
                     pub_items = [item for item in all_items if item["content_source"] == "publications"]
                     # Sort publications by date (newer first)
-                    pub_items = sorted(pub_items, key=lambda x: x.get("date", "2020"), reverse=True)
+                    pub_items = self.date_index.sort(pub_items, "date")
                     sorted_items.extend(pub_items)
                 
                 # Add projects second
@@ -1692,15 +1500,15 @@ class ResumeQueryProcessor:
                         other_items = [item for item in exp_items if "spenza" not in item.get("company", "").lower()]
                         
                         # Sort each group by date
-                        spenza_items = sorted(spenza_items, key=lambda x: x.get("dates", "2020"), reverse=True)
-                        other_items = sorted(other_items, key=lambda x: x.get("dates", "2020"), reverse=True)
+                        spenza_items = self.date_index.sort(spenza_items, "dates")
+                        other_items = self.date_index.sort(other_items, "dates")
                         
                         # Add Spenza first, then others
                         sorted_items.extend(spenza_items)
                         sorted_items.extend(other_items)
                     else:
                         # Normal date-based sorting for non-ETL queries
-                        exp_items = sorted(exp_items, key=lambda x: x.get("dates", "2020"), reverse=True)
+                        exp_items = self.date_index.sort(exp_items, "dates")
                         sorted_items.extend(exp_items)
                 
                 # Add blog posts last
@@ -1738,27 +1546,27 @@ class ResumeQueryProcessor:
                 similar_techs = []
                 original_tech_filters = tech_filters.copy()
                 
+                similar_postings: Dict[str, int] = {}
+                expansion_terms: List[str] = []  # Requested techs + their closest neighbours, for RAG query expansion
+                
                 for tech_filter in tech_filters:
-                    # Use hybrid approach: hard-coded + semantic similarity
-                    similar_tech_categories = self.get_similar_technologies_hybrid(tech_filter)
-                    similar_techs.extend(similar_tech_categories)
+                    # Use hybrid approach: hard-coded + semantic similarity (precomputed in tech_graph)
+                    neighbourhood = self.get_tech_neighbourhood(tech_filter)
+                    similar_techs.extend(neighbourhood.similar)
+                    expansion_terms.extend(self.rag_expansion_terms(tech_filter, neighbourhood))
+                    for content_type, bits in neighbourhood.postings.items():
+                        similar_postings[content_type] = similar_postings.get(content_type, 0) | bits
                 
-                # Remove duplicates and search with similar technologies
-                similar_techs = list(set(similar_techs))
+                # Remove duplicates (strongest suggestions first) and search with similar technologies
+                similar_techs = list(dict.fromkeys(similar_techs))
                 
                 if similar_techs:
-                    # Search again with similar technologies
+                    # Items matching any similar technology come straight from the postings
                     for content_type in content_types_to_search:
-                        items = self.resume_data.get(content_type, [])
-                        
-                        # Filter by similar technologies
-                        filtered_items = self.filter_by_technology(items, similar_techs)
+                        filtered_items = self.tech_index.items_at(content_type, similar_postings.get(content_type, 0))
                         
                         # Tag items with their source
-                        for item in filtered_items:
-                            item["content_source"] = content_type
-                        
-                        fallback_items.extend(filtered_items)
+                        fallback_items.extend(self._tag_items(filtered_items, content_type))
                 
                 if fallback_items:
                     # Sort fallback items
@@ -1768,7 +1576,7 @@ class ResumeQueryProcessor:
                         if content_type == "projects":
                             type_items = self.sort_projects_by_date(type_items)
                         elif content_type in ["experience", "publications"]:
-                            type_items = sorted(type_items, key=lambda x: x.get("dates", x.get("date", "2020")), reverse=True)
+                            type_items = self.date_index.sort(type_items, "dates_or_date")
                         sorted_fallback.extend(type_items)
                     
                     # Create QUIRKY response with personality!
@@ -1816,44 +1624,38 @@ class ResumeQueryProcessor:
                         }
                     )
                 
-                # RAG FALLBACK: If similar tech search also found nothing, try semantic search
-                print("🔍 NLP found 0 items, trying RAG semantic search...")
+                # RAG FALLBACK: one hybrid (BM25 + dense) retrieval - exact rare terms match lexically
+                # even when their embedding similarity is below the dense threshold. The question and
+                # every expansion term are embedded in one batch and scored in one pass.
+                print("🔍 NLP found 0 items, trying hybrid RAG search with query expansion...")
                 try:
                     from rag_service import get_rag
                     rag = get_rag()
                     
-                    # Perform semantic search
-                    rag_results = rag.semantic_search(
-                        query=question,
+                    rag_hits = rag.hybrid_search(
+                        question,
                         top_k=8,  # Get more for diversity
-                        min_score=0.25,  # Lower threshold for broader matching
-                        section_filter=content_types_to_search if content_types_to_search else None
+                        section_filter=content_types_to_search if content_types_to_search else None,
+                        expansions=list(dict.fromkeys(expansion_terms)),
+                        min_dense_score=0.25  # Lower threshold for broader matching
                     )
                     
-                    if rag_results:
-                        print(f"✅ RAG found {len(rag_results)} semantically similar items!")
+                    if rag_hits:
+                        print(f"✅ Hybrid RAG found {len(rag_hits)} related items!")
                         
-                        # Extract items and scores
                         rag_items = []
-                        for item, score in rag_results:
-                            # Add content_source if not present
-                            if 'content_source' not in item:
-                                # Infer from item structure
-                                if 'company' in item or 'role' in item:
-                                    item['content_source'] = 'experience'
-                                elif 'authors' in item or 'journal' in item:
-                                    item['content_source'] = 'publications'
-                                else:
-                                    item['content_source'] = 'projects'
-                            item['rag_score'] = score  # Add score for debugging
+                        for hit in rag_hits:
+                            item = dict(hit.item)  # RAG items are shared; annotate a copy
+                            item.setdefault('content_source', hit.section)
+                            item['rag_score'] = hit.score  # Add score for debugging
+                            if hit.chunks:  # Matched bullets, so the LLM can cite just those
+                                item['rag_snippets'] = [chunk['text'] for chunk in hit.chunks]
                             rag_items.append(item)
                         
                         # Determine primary type
-                        sources = [item.get('content_source', 'projects') for item in rag_items]
+                        sources = [item['content_source'] for item in rag_items]
                         primary_type = "mixed" if len(set(sources)) > 1 else sources[0]
                         
-                        asked_techs = ", ".join(original_tech_filters) if original_tech_filters else "that"
-                        
                         return QueryResult(
                             response_text=f"I used semantic search to find these conceptually related items!",
                             items=rag_items[:6],  # Limit to 6 for diversity
@@ -1864,12 +1666,14 @@ class ResumeQueryProcessor:
                                 "total_results": len(rag_items),
                                 "needs_cards": True,
                                 "fallback_search": True,
-                                "rag_search": True,  # New flag!
+                                "rag_search": True,
                                 "tech_not_found": True,
                                 "requested_technologies": original_tech_filters,
-                                "search_method": "semantic_rag",
-                                "rag_scores": [score for _, score in rag_results[:6]],
-                                "fallback_explanation": f"Used semantic search to find conceptually related items",
+                                "search_method": "hybrid_rag",
+                                "rag_scores": [hit.score for hit in rag_hits[:6]],
+                                "rag_score_breakdown": [hit.breakdown() for hit in rag_hits[:6]],
+                                "expansion_terms": list(dict.fromkeys(expansion_terms)),
+                                "fallback_explanation": f"Used hybrid keyword + semantic search to find related items",
                                 "quirky_response_enabled": True
                             }
                         )
@@ -1905,8 +1709,7 @@ class ResumeQueryProcessor:
             ]
         else:
             # INTELLIGENT DEFAULT: Return a MIX of content types with rotation to avoid repetition
-            import random
-            import time
+            rng = ctx.rng
             
             # Get all available content
             projects = self.resume_data.get("projects", [])
@@ -1919,8 +1722,9 @@ class ResumeQueryProcessor:
             
             # Use time-based seed to ensure variety across sessions but consistency within sessions
             # This creates a rotating selection that changes over time
+            # Seed the request's own RNG so concurrent requests never share random state
             time_seed = int(time.time() // 3600)  # Changes every hour
-            random.seed(time_seed + hash(question.lower()) % 100)
+            rng.seed(time_seed + hash(question.lower()) % 100)
             
             # For general queries, show variety to make it interesting
             if any(word in question.lower() for word in ["what", "tell me", "show me", "who", "hello", "hi"]):
@@ -1939,32 +1743,32 @@ class ResumeQueryProcessor:
                 selected_items = []
                 for pool_name, pool in available_pools[:3]:  # Take first 3 non-empty pools
                     if pool:
-                        item = random.choice(pool).copy()  # Copy to avoid modifying original
+                        item = rng.choice(pool).copy()  # Copy to avoid modifying original
                         item["content_source"] = pool_name
                         selected_items.append(item)
                 
                 # Add one more random item from any remaining pool
                 if len(available_pools) > 3:
-                    extra_pool_name, extra_pool = random.choice(available_pools[3:])
+                    extra_pool_name, extra_pool = rng.choice(available_pools[3:])
                     if extra_pool:
-                        item = random.choice(extra_pool).copy()
+                        item = rng.choice(extra_pool).copy()
                         item["content_source"] = extra_pool_name  
                         selected_items.append(item)
                 
                 items = selected_items
-                random.shuffle(items)  # Final shuffle for order variety
+                rng.shuffle(items)  # Final shuffle for order variety
                 intent = "mixed"  # Override intent to mixed
             elif is_highlights:
                 # For highlights queries that fell through to fallback, ensure mixed content
                 selected_items = []
                 if projects:
-                    selected_items.append(random.choice(projects).copy())
+                    selected_items.append(rng.choice(projects).copy())
                     selected_items[-1]["content_source"] = "projects"
                 if experiences:
-                    selected_items.append(random.choice(experiences).copy())
+                    selected_items.append(rng.choice(experiences).copy())
                     selected_items[-1]["content_source"] = "experience"
                 if publications:
-                    selected_items.append(random.choice(publications).copy())
+                    selected_items.append(rng.choice(publications).copy())
                     selected_items[-1]["content_source"] = "publications"
                 
                 items = selected_items
@@ -1997,9 +1801,6 @@ class ResumeQueryProcessor:
                             item = experiences[i].copy()
                             item["content_source"] = "experience"
                             items.append(item)
-            
-            # Reset random seed to avoid affecting other operations
-            random.seed()
         
         # Apply technology filters for single-type queries
         if tech_filters and intent not in ["skills", "education", "publications", "blog"]:
@@ -2018,7 +1819,7 @@ class ResumeQueryProcessor:
         
         return QueryResult(
             response_text=response_text,
-            items=items,
+            items=[dict(item) for item in items],  # Copies, so callers can annotate without touching shared data
             item_type=intent,
             metadata={
                 "tech_filters": tech_filters,
@@ -2217,3 +2018,28 @@ class ResumeQueryProcessor:
             print(f"🚨 OFF-TOPIC QUERY DETECTED: '{question}'")
         
         return is_off_topic
+
+
+# Shared processor engine (built once per process, swapped atomically on reload)
+_processor_instance = None
+_processor_lock = threading.Lock()
+
+def get_query_processor() -> ResumeQueryProcessor:
+    """Get or create the shared query processor (singleton pattern)"""
+    global _processor_instance
+    if _processor_instance is None:
+        with _processor_lock:
+            if _processor_instance is None:
+                _processor_instance = ResumeQueryProcessor()
+    return _processor_instance
+
+def reload_query_processor(resume_data_path: Optional[str] = None) -> ResumeQueryProcessor:
+    """Rebuild the shared processor from disk and swap it in (in-flight requests keep the old one)"""
+    global _processor_instance
+    current = _processor_instance
+    path = resume_data_path or (current.resume_data_path if current else "resume_data.json")
+    new_processor = ResumeQueryProcessor(path)  # Build outside the lock so readers never block
+    with _processor_lock:
+        _processor_instance = new_processor
+    print(f"🔄 Query processor reloaded from {path}")
+    return new_processor
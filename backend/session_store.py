@@ -0,0 +1,222 @@
+# session_store.py
+"""
+Session Store - Bounded home for per-session ConversationManagers
+Idle sessions expire after a TTL; the least recently used ones are evicted when the
+entry or byte budget is exceeded. A background thread reaps expired sessions.
+"""
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tunables (see .env.example)
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "500"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(50 * 1024 * 1024)))
+SESSION_REAP_INTERVAL = float(os.getenv("SESSION_REAP_INTERVAL", "60"))
+
+# Fixed overhead of one manager object (prompt strings, attributes)
+_BASE_SESSION_BYTES = 4096
+
+
+def estimate_session_bytes(session: Any) -> int:
+    """Rough memory footprint of a session - dominated by its chat history"""
+    total = _BASE_SESSION_BYTES
+    for message in getattr(session, "chat_history", None) or []:
+        total += sys.getsizeof(message)
+        for value in message.values():
+            total += sys.getsizeof(value)
+    return total
+
+
+class _Entry:
+    __slots__ = ("session", "last_access", "size_bytes")
+
+    def __init__(self, session: Any, size_bytes: int):
+        self.session = session
+        self.last_access = time.monotonic()
+        self.size_bytes = size_bytes
+
+
+class SessionStore:
+    """Thread-safe TTL + LRU cache of sessions keyed by session id"""
+
+    def __init__(self, factory: Callable[[], Any], ttl_seconds: float = SESSION_TTL_SECONDS,
+                 max_entries: int = SESSION_MAX_ENTRIES, max_bytes: int = SESSION_MAX_BYTES,
+                 reap_interval_seconds: float = SESSION_REAP_INTERVAL,
+                 size_fn: Callable[[Any], int] = estimate_session_bytes):
+        self.factory = factory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.reap_interval_seconds = reap_interval_seconds
+        self.size_fn = size_fn
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()  # oldest access first
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+
+        self.reaper_thread = None
+        self.running = False
+
+        self.metrics = {"hits": 0, "misses": 0, "created": 0, "expired": 0, "evicted": 0}
+
+    # ---- internal helpers (call with lock held) -------------------------
+
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry.last_access > self.ttl_seconds
+
+    def _remove(self, session_id: str) -> Optional[_Entry]:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._total_bytes -= entry.size_bytes
+        return entry
+
+    def _refresh_size(self, entry: _Entry):
+        new_size = self.size_fn(entry.session)
+        self._total_bytes += new_size - entry.size_bytes
+        entry.size_bytes = new_size
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """Evict least recently used sessions until within the entry/byte budget"""
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            oldest_id = next(iter(self._entries))
+            if oldest_id == keep:
+                if len(self._entries) == 1:
+                    break
+                # Never evict the session being handed out right now
+                self._entries.move_to_end(oldest_id)
+                continue
+            self._remove(oldest_id)
+            self.metrics["evicted"] += 1
+            logger.info(f"Evicted session {oldest_id} (LRU)")
+
+    # ---- public API -----------------------------------------------------
+
+    def get(self, session_id: Optional[str]) -> Optional[Any]:
+        """Return a live session (refreshing its TTL) or None"""
+        if not session_id:
+            return None
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.metrics["misses"] += 1
+                return None
+            now = time.monotonic()
+            if self._is_expired(entry, now):
+                self._remove(session_id)
+                self.metrics["expired"] += 1
+                self.metrics["misses"] += 1
+                return None
+            entry.last_access = now
+            self._entries.move_to_end(session_id)
+            # History may have grown since the last request
+            self._refresh_size(entry)
+            self._enforce_budget(keep=session_id)
+            self.metrics["hits"] += 1
+            return entry.session
+
+    def create(self, session_id: Optional[str] = None) -> Tuple[str, Any]:
+        """Create (or replace) a session and return (session_id, session)"""
+        session_id = session_id or str(uuid.uuid4())
+        session = self.factory()
+        with self._lock:
+            self._remove(session_id)
+            entry = _Entry(session, self.size_fn(session))
+            self._entries[session_id] = entry
+            self._total_bytes += entry.size_bytes
+            self.metrics["created"] += 1
+            self._enforce_budget(keep=session_id)
+        return session_id, session
+
+    def get_or_create(self, session_id: Optional[str] = None, keep_unknown_id: bool = True) -> Tuple[str, Any]:
+        """Return (session_id, session), creating one if needed.
+        With keep_unknown_id=False an unknown id is replaced by a fresh one"""
+        session = self.get(session_id)
+        if session is not None:
+            return session_id, session
+        return self.create(session_id if keep_unknown_id else None)
+
+    def delete(self, session_id: str) -> bool:
+        """Drop a session, returns True if it existed"""
+        with self._lock:
+            return self._remove(session_id) is not None
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            return entry is not None and not self._is_expired(entry, time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def reap_expired(self) -> int:
+        """Remove idle sessions past their TTL and re-check the byte budget"""
+        now = time.monotonic()
+        with self._lock:
+            expired_ids = [sid for sid, entry in self._entries.items() if self._is_expired(entry, now)]
+            for session_id in expired_ids:
+                self._remove(session_id)
+            self.metrics["expired"] += len(expired_ids)
+
+            for entry in self._entries.values():
+                self._refresh_size(entry)
+            self._enforce_budget()
+
+        if expired_ids:
+            logger.info(f"Reaped {len(expired_ids)} expired sessions")
+        return len(expired_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.metrics["hits"] + self.metrics["misses"]
+            return {
+                **self.metrics,
+                "hit_rate": round(self.metrics["hits"] / lookups, 3) if lookups else 0.0,
+                "active_sessions": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    # ---- background reaping (same pattern as AudioCleanupService) -------
+
+    def _reap_loop(self):
+        """Background reaper loop"""
+        while self.running:
+            try:
+                self.reap_expired()
+            except Exception as e:
+                logger.error(f"Error while reaping sessions: {e}")
+
+            # Sleep in small steps so we can stop quickly
+            waited = 0.0
+            while self.running and waited < self.reap_interval_seconds:
+                time.sleep(min(1.0, self.reap_interval_seconds))
+                waited += 1.0
+
+    def start_background_reaper(self):
+        """Start the background reaper thread"""
+        if self.running:
+            logger.warning("Session reaper already running")
+            return
+        self.running = True
+        self.reaper_thread = threading.Thread(target=self._reap_loop, daemon=True)
+        self.reaper_thread.start()
+        logger.info(f"Started session reaper (ttl: {self.ttl_seconds:.0f}s, max: {self.max_entries} sessions / {self.max_bytes / 1e6:.0f} MB)")
+
+    def stop_background_reaper(self):
+        """Stop the background reaper thread"""
+        self.running = False
+        if self.reaper_thread:
+            self.reaper_thread.join(timeout=5)
+            logger.info("Stopped session reaper")
@@ -0,0 +1,106 @@
+"""
+Tech Embeddings - Precomputed embedding matrix for the resume's technology vocabulary
+The vocabulary is embedded once, L2-normalized into a contiguous float32 matrix and
+persisted as .npy in the index cache directory (keyed by model + vocabulary), so an
+unknown-tech lookup is one matrix-vector product plus argpartition. Embeddings of the
+unknown terms themselves come from a QueryEmbeddingCache (the process-wide one in the app).
+"""
+import hashlib
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from embedding_service import QUERY_EMBEDDING_CACHE_SIZE, QueryEmbeddingCache
+
+
+def default_index_cache_dir(resume_data_path: str) -> str:
+    """INDEX_CACHE_DIR, or .index_cache next to the resume data"""
+    return os.getenv("INDEX_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(resume_data_path)), ".index_cache")
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-normalized contiguous float32 copy (zero rows stay zero)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.ascontiguousarray(matrix / np.where(norms == 0, 1, norms), dtype=np.float32)
+
+
+def save_npy_atomic(path: str, array: np.ndarray):
+    """Write an .npy file via a temp file + rename so readers never see a partial file"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class TechEmbeddingIndex:
+    """Normalized vocabulary matrix + LRU of unknown-term embeddings"""
+
+    def __init__(self, vocabulary: List[str], model: Any, model_id: str = "", cache_dir: Optional[str] = None,
+                 lru_size: int = QUERY_EMBEDDING_CACHE_SIZE, query_cache: Optional[QueryEmbeddingCache] = None,
+                 matrix: Optional[np.ndarray] = None):
+        """query_cache: shared QueryEmbeddingCache (a private one of lru_size entries otherwise)
+        matrix: prebuilt normalized vocabulary matrix (e.g. memory-mapped from the index bundle)"""
+        self.vocabulary = list(vocabulary)
+        self.model = model
+        self.model_id = model_id
+        self.query_cache = query_cache if query_cache is not None else QueryEmbeddingCache(lru_size)
+        self.stats = {"lookups": 0, "loaded_from_disk": False}
+        if matrix is not None and matrix.shape[0] != len(self.vocabulary):
+            raise ValueError(f"Expected one vocabulary row per term, got {matrix.shape} for {len(self.vocabulary)} terms")
+
+        digest = hashlib.sha256("\n".join([model_id] + self.vocabulary).encode("utf-8")).hexdigest()[:16]
+        self.cache_path = os.path.join(cache_dir, f"tech_vocabulary_{digest}.npy") if cache_dir else None
+        self.matrix = matrix if matrix is not None else self._load_or_build()
+
+    def _load_or_build(self) -> np.ndarray:
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                matrix = np.load(self.cache_path)
+                if matrix.shape[0] == len(self.vocabulary) and matrix.dtype == np.float32:
+                    self.stats["loaded_from_disk"] = True
+                    return np.ascontiguousarray(matrix)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable tech embedding cache {self.cache_path}: {e}")
+
+        matrix = l2_normalize(self.model.encode(self.vocabulary, show_progress_bar=False))
+        if self.cache_path:
+            try:
+                save_npy_atomic(self.cache_path, matrix)
+            except OSError as e:
+                print(f"⚠️ Could not persist tech embeddings to {self.cache_path}: {e}")
+        return matrix
+
+    def embed(self, term: str) -> np.ndarray:
+        """Normalized float32 embedding of a term (raw embedding cached in query_cache)"""
+        return l2_normalize(self.query_cache.encode(self.model, term, self.model_id))
+
+    def most_similar(self, term: str, top_k: int = 3, min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """Up to top_k (tech, cosine) pairs above min_score, most similar first"""
+        if not self.vocabulary or top_k <= 0:
+            return []
+        self.stats["lookups"] += 1
+        return self._top_k(self.matrix @ self.embed(term), top_k, min_score)
+
+    def most_similar_many(self, terms: List[str], top_k: int = 3, min_score: float = 0.3) -> Dict[str, List[Tuple[str, float]]]:
+        """most_similar for many terms with a single encode call (used to precompute neighbours)"""
+        if not self.vocabulary or top_k <= 0 or not terms:
+            return {term: [] for term in terms}
+        vectors = l2_normalize(self.model.encode(list(terms), show_progress_bar=False))  # Build-time: bypasses the query LRU
+        scores = vectors @ self.matrix.T
+        return {term: self._top_k(row, top_k, min_score) for term, row in zip(terms, scores)}
+
+    def _top_k(self, scores: np.ndarray, top_k: int, min_score: float) -> List[Tuple[str, float]]:
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.vocabulary[i], float(scores[i])) for i in top if scores[i] > min_score]
@@ -0,0 +1,133 @@
+"""
+Tech Graph - Compiled, weighted technology similarity graph for fallback suggestions
+Merges the hand-written tech_similarity lists, aliases shared between tech_mappings
+entries and (when the embedding model is available) precomputed embedding neighbours
+into one weighted graph. Every node's fallback suggestion list, multi-hop neighbourhood
+scores and item postings are computed at build time, so a lookup is a dict access.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Hand-written edges: first listed = strongest (1.0, 0.9, 0.8, ... floored at 0.5)
+CURATED_WEIGHT_STEP = 0.1
+CURATED_MIN_WEIGHT = 0.5
+# Two tech_mappings entries sharing aliases: weight = Jaccard overlap of their alias sets
+ALIAS_MIN_OVERLAP = 0.1
+# Each extra hop multiplies a path's score by this
+HOP_DECAY = 0.5
+MAX_HOPS = 2
+MAX_NEIGHBOURS = 10
+
+# Last resort when nothing similar is known (kept exactly as the query-time fallback had it)
+BROAD_CATEGORIES = {
+    "database": ["database", "mongodb"],
+    "frontend": ["javascript", "web_development"],
+    "backend": ["python", "backend"],
+    "ml": ["machine_learning"]
+}
+
+
+def broad_category_fallback(tech: str) -> List[str]:
+    """Broad category techs for a term, or [] if it fits none"""
+    for category, fallback_techs in BROAD_CATEGORIES.items():
+        if category in tech.lower() or any(word in tech.lower() for word in ["db", "front", "back", "ai"]):
+            return fallback_techs
+    return []
+
+
+@dataclass
+class TechNeighbourhood:
+    """Everything the fallback search needs for one tech"""
+    tech: str
+    similar: List[str]  # fallback suggestions, strongest first
+    source: str  # "curated", "semantic", "broad" or "none"
+    neighbours: List[Tuple[str, float]] = field(default_factory=list)  # multi-hop, best score first
+    postings: Dict[str, int] = field(default_factory=dict)  # section -> bitset of items matching `similar`
+
+
+class TechSimilarityGraph:
+    """Weighted similarity edges plus precomputed per-tech neighbourhoods"""
+
+    def __init__(self, tech_similarity: Dict[str, List[str]], tech_mappings: Dict[str, List[str]],
+                 neighbours_fn: Optional[Callable[[List[str]], Dict[str, List[Tuple[str, float]]]]] = None,
+                 postings_fn: Optional[Callable[[List[str]], Dict[str, int]]] = None):
+        """neighbours_fn: terms -> embedding neighbours; postings_fn: techs -> section bitsets"""
+        self.edges: Dict[str, Dict[str, float]] = {}
+        self._curated = {tech.lower(): list(similar) for tech, similar in tech_similarity.items()}
+        self.postings_fn = postings_fn
+
+        for tech, similar in tech_similarity.items():
+            for rank, other in enumerate(similar):
+                self._add_edge(tech.lower(), other, max(1.0 - CURATED_WEIGHT_STEP * rank, CURATED_MIN_WEIGHT))
+
+        alias_sets = {tech: {alias.lower() for alias in aliases} for tech, aliases in tech_mappings.items()}
+        techs = list(alias_sets)
+        for i, tech in enumerate(techs):
+            for other in techs[i + 1:]:
+                shared = alias_sets[tech] & alias_sets[other]
+                if shared:
+                    overlap = len(shared) / len(alias_sets[tech] | alias_sets[other])
+                    if overlap >= ALIAS_MIN_OVERLAP:
+                        self._add_edge(tech, other, overlap)
+                        self._add_edge(other, tech, overlap)
+
+        # Every known tech gets a precomputed neighbourhood; semantic neighbours are only needed
+        # where no curated list exists (same precedence as the query-time fallback)
+        known = sorted(set(self.edges) | set(tech_mappings) | {other for targets in self.edges.values() for other in targets})
+        uncurated = [tech for tech in known if tech.lower() not in self._curated]
+        embedding_neighbours = neighbours_fn(uncurated) if neighbours_fn and uncurated else {}
+        self.embedding_neighbours: Dict[str, List[Tuple[str, float]]] = embedding_neighbours  # Kept for the index bundle
+        self._semantic = {tech: [name for name, _ in neighbours] for tech, neighbours in embedding_neighbours.items() if neighbours}
+        for tech, neighbours in embedding_neighbours.items():
+            for other, score in neighbours:
+                self._add_edge(tech, other, score)
+
+        self.neighbourhoods: Dict[str, TechNeighbourhood] = {}
+        for tech in known:
+            entry = self.build_neighbourhood(tech, *self._resolve(tech))
+            entry.neighbours = self._multi_hop(tech)
+            self.neighbourhoods[tech] = entry
+
+    def _add_edge(self, source: str, target: str, weight: float):
+        if source == target:
+            return
+        targets = self.edges.setdefault(source, {})
+        targets[target] = max(weight, targets.get(target, 0.0))
+
+    def _resolve(self, tech: str) -> Tuple[List[str], str]:
+        """The suggestion list the hybrid fallback gives: curated, then semantic, then broad"""
+        if tech.lower() in self._curated:
+            return self._curated[tech.lower()], "curated"
+        if tech in self._semantic:
+            return self._semantic[tech], "semantic"
+        broad = broad_category_fallback(tech)
+        return (broad, "broad") if broad else ([], "none")
+
+    def build_neighbourhood(self, tech: str, similar: List[str], source: str) -> TechNeighbourhood:
+        """Neighbourhood with item postings (also used for terms resolved at query time)"""
+        postings = self.postings_fn(similar) if self.postings_fn and similar else {}
+        return TechNeighbourhood(tech, list(similar), source, postings=postings)
+
+    def _multi_hop(self, tech: str) -> List[Tuple[str, float]]:
+        """Best path score to every node within MAX_HOPS (weights multiplied, decayed per hop)"""
+        best: Dict[str, float] = {}
+        frontier = {tech: 1.0}
+        for hop in range(MAX_HOPS):
+            decay = HOP_DECAY ** hop
+            next_frontier: Dict[str, float] = {}
+            for node, score in frontier.items():
+                for other, weight in self.edges.get(node, {}).items():
+                    path_score = score * weight * decay
+                    if other != tech and path_score > best.get(other, 0.0):
+                        best[other] = path_score
+                        next_frontier[other] = score * weight
+            frontier = next_frontier
+        ranked = sorted(best.items(), key=lambda entry: (-entry[1], entry[0]))
+        return [(other, round(score, 4)) for other, score in ranked[:MAX_NEIGHBOURS]]
+
+    def lookup(self, tech: str) -> Optional[TechNeighbourhood]:
+        """Precomputed neighbourhood of a tech (None for terms the graph has never seen)"""
+        entry = self.neighbourhoods.get(tech)
+        if entry is None and tech.lower() in self._curated:
+            entry = self.neighbourhoods.get(tech.lower())
+        return entry
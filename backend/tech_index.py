@@ -0,0 +1,219 @@
+"""
+Tech Index - Inverted index from technology filters to resume items
+Every item's searchable text is lowercased once, and each filter (canonical tech or any
+other term) resolves to one bitset per section, so filter_by_technology is a bitwise
+union over the filters plus a bit test per item. Canonical techs are indexed up front;
+other terms are resolved on first use and cached. The canonical postings come from one
+Aho-Corasick pass per item over every tech name and alias, not a scan per tech.
+"""
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from item_locator import ItemLocator
+from tech_matcher import AhoCorasick
+
+# Lazily-resolved (non-canonical) filters kept per index
+MAX_CACHED_FILTERS = 4096
+
+
+class ItemFields:
+    """The lowercased fields filter_by_technology looks at, computed once per item"""
+    __slots__ = ("techs", "keywords", "text")
+
+    def __init__(self, item: Dict):
+        self.techs = [tech.lower() for tech in item.get("technologies", [])]
+        self.keywords = [keyword.lower() for keyword in item.get("keywords", [])]
+        self.text = " ".join([
+            item.get("title", ""),
+            item.get("company", ""),
+            item.get("description", ""),
+            " ".join(item.get("highlights", []))
+        ]).lower()
+
+
+def item_matches_filter(fields: ItemFields, tech_filter: str, tech_mappings: Dict[str, List[str]]) -> bool:
+    """Whether one item matches one technology filter (the rules filter_by_technology applies)"""
+    tech_lower = tech_filter.lower()
+
+    # SPECIAL HANDLING: For very short terms (≤3 chars), use word boundaries to avoid substring matches
+    # This prevents "go" from matching "MongoDB", "Django", etc.
+    if len(tech_filter) <= 3:
+        word_pattern = re.compile(r'\b' + re.escape(tech_lower) + r'\b')
+        return (any(word_pattern.search(tech) for tech in fields.techs)
+                or any(word_pattern.search(keyword) for keyword in fields.keywords)
+                or word_pattern.search(fields.text) is not None)
+
+    # Normal substring matching for longer terms: technologies, then keywords
+    if any(tech_lower in tech for tech in fields.techs):
+        return True
+    if any(tech_lower in keyword for keyword in fields.keywords):
+        return True
+    # Text content match using tech mappings - BUT ONLY if specific tech found
+    if tech_filter in tech_mappings:
+        mapped_keywords = [keyword.lower() for keyword in tech_mappings[tech_filter]]
+        if tech_filter == "database":
+            # For database category, require SPECIFIC database tech match (text or technologies)
+            if any(keyword in fields.text or any(keyword in tech for tech in fields.techs) for keyword in mapped_keywords):
+                return True
+        elif any(keyword in fields.text for keyword in mapped_keywords):
+            return True
+    # Direct text match (for specific tech names)
+    return tech_lower in fields.text
+
+
+class TechItemIndex:
+    """Per-section bitsets of the items each technology filter matches"""
+
+    def __init__(self, sections: Dict[str, object], tech_mappings: Dict[str, List[str]],
+                 postings: Optional[Dict[str, Dict[str, int]]] = None):
+        """postings: prebuilt canonical postings (from the index bundle) instead of the alias scan"""
+        self.tech_mappings = tech_mappings
+        self.locator = ItemLocator(sections)
+        self.sections: Dict[str, List[Dict]] = self.locator.sections
+        self._fields: Dict[str, List[ItemFields]] = {
+            name: [ItemFields(item) for item in items] for name, items in self.sections.items()
+        }
+
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = dict(postings) if postings is not None else self._build_canonical_postings()
+        self._canonical_count = len(self._postings)
+        self.stats = {"lookups": 0, "indexed_items": 0, "unindexed_items": 0}
+
+    def _build_canonical_postings(self) -> Dict[str, Dict[str, int]]:
+        """Postings for every tech_mappings key, from the alias hits found in each item"""
+        postings = {tech: {name: 0 for name in self.sections} for tech in self.tech_mappings}
+        # Short names only match as whole words; longer ones match as substrings (plus their aliases)
+        # (a tech with an empty name or alias matches everything, so it is resolved the slow way)
+        direct_techs = [tech for tech, keywords in self.tech_mappings.items() if not tech or not all(keywords)]
+        for tech in direct_techs:
+            postings[tech] = self._build_posting(tech)
+        short_techs = [tech for tech in self.tech_mappings if len(tech) <= 3 and tech not in direct_techs]
+        long_techs = [tech for tech in self.tech_mappings if len(tech) > 3 and tech not in direct_techs]
+        word_automaton = AhoCorasick(tech.lower() for tech in short_techs)
+        substring_automaton = AhoCorasick(
+            [tech.lower() for tech in long_techs]
+            + [keyword.lower() for tech in long_techs for keyword in self.tech_mappings[tech]]
+        )
+        pattern_ids = {pattern: i for i, pattern in enumerate(substring_automaton.patterns)}
+        word_techs: Dict[int, List[str]] = {}
+        for tech in short_techs:
+            word_techs.setdefault(word_automaton.patterns.index(tech.lower()), []).append(tech)
+        # pattern -> long techs it can make match, so each item only checks plausible techs
+        pattern_techs: Dict[int, Set[str]] = {}
+        for tech in long_techs:
+            for pattern in [tech.lower()] + [keyword.lower() for keyword in self.tech_mappings[tech]]:
+                pattern_techs.setdefault(pattern_ids[pattern], set()).add(tech)
+
+        def substring_hits(strings: Iterable[str]) -> Set[int]:
+            return {index for string in strings for index, _ in substring_automaton.iter_matches(string)}
+
+        for name, fields_list in self._fields.items():
+            for position, fields in enumerate(fields_list):
+                bit = 1 << position
+                strings = fields.techs + fields.keywords + [fields.text]
+                for index in set().union(*(word_automaton.find_whole_words(string) for string in strings)):
+                    for tech in word_techs[index]:
+                        postings[tech][name] |= bit
+
+                tech_hits = substring_hits(fields.techs)
+                keyword_hits = substring_hits(fields.keywords)
+                text_hits = substring_hits([fields.text])
+                candidates = set()
+                for index in tech_hits | keyword_hits | text_hits:
+                    candidates |= pattern_techs[index]
+                for tech in candidates:
+                    own = pattern_ids[tech.lower()]
+                    aliases = [pattern_ids[keyword.lower()] for keyword in self.tech_mappings[tech]]
+                    if tech == "database":
+                        alias_hit = any(alias in text_hits or alias in tech_hits for alias in aliases)
+                    else:
+                        alias_hit = any(alias in text_hits for alias in aliases)
+                    if own in tech_hits or own in keyword_hits or alias_hit or own in text_hits:
+                        postings[tech][name] |= bit
+        return postings
+
+    def to_bundle(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Canonical postings as CSR arrays (tech i -> item rows, numbered across sections)"""
+        from index_bundle import bitsets_to_csr
+        canonical = {tech: self._postings[tech] for tech in self.tech_mappings}
+        sizes = {name: len(items) for name, items in self.sections.items()}
+        techs, offsets, rows = bitsets_to_csr(canonical, sizes)
+        return {"offsets": offsets, "rows": rows}, {"techs": techs, "sections": sizes}
+
+    @classmethod
+    def from_bundle(cls, sections: Dict[str, object], tech_mappings: Dict[str, List[str]],
+                    arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> "TechItemIndex":
+        """Index with canonical postings read from the bundle"""
+        from index_bundle import csr_to_bitsets
+        sizes = {name: len(items) for name, items in ItemLocator(sections).sections.items()}
+        if meta["sections"] != sizes:
+            raise ValueError(f"Bundle tech postings cover sections {meta['sections']}, data has {sizes}")
+        return cls(sections, tech_mappings, postings=csr_to_bitsets(meta["techs"], arrays["offsets"], arrays["rows"], sizes))
+
+    def _build_posting(self, tech_filter: str) -> Dict[str, int]:
+        posting = {}
+        for name, fields_list in self._fields.items():
+            bits = 0
+            for position, fields in enumerate(fields_list):
+                if item_matches_filter(fields, tech_filter, self.tech_mappings):
+                    bits |= 1 << position
+            posting[name] = bits
+        return posting
+
+    def posting(self, tech_filter: str) -> Dict[str, int]:
+        """Section -> bitset of items matching a filter (resolved and cached on first use)"""
+        posting = self._postings.get(tech_filter)
+        if posting is None:
+            posting = self._build_posting(tech_filter)
+            with self._lock:
+                if len(self._postings) - self._canonical_count < MAX_CACHED_FILTERS:
+                    self._postings[tech_filter] = posting
+        return posting
+
+    def union(self, tech_filters: Iterable[str]) -> Dict[str, int]:
+        """Section -> bitset of items matching ANY of the filters"""
+        combined = {name: 0 for name in self.sections}
+        for tech_filter in tech_filters:
+            for name, bits in self.posting(tech_filter).items():
+                combined[name] |= bits
+        return combined
+
+    @staticmethod
+    def _set_bits(bits: int) -> Iterable[int]:
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length() - 1
+            bits ^= lowest
+
+    def items_at(self, section: str, bits: int) -> List[Dict]:
+        """Items of a section whose bits are set, in section order"""
+        items = self.sections.get(section, [])
+        return [items[position] for position in self._set_bits(bits)]
+
+    def filter(self, items: List[Dict], tech_filters: List[str]) -> List[Dict]:
+        """Items matching any filter, in input order (items not in the index are checked directly)"""
+        combined = self.union(tech_filters)
+        self.stats["lookups"] += 1
+        # Whole section passed in (the common case): read the matches straight off the bitset
+        name = self.locator.section_of(items)
+        if name is not None:
+            self.stats["indexed_items"] += len(items)
+            return [items[position] for position in self._set_bits(combined[name])]
+
+        filtered_items = []
+        for item in items:
+            location = self.locator.locate(item)
+            if location is not None:
+                self.stats["indexed_items"] += 1
+                name, position = location
+                if combined[name] >> position & 1:
+                    filtered_items.append(item)
+            else:
+                self.stats["unindexed_items"] += 1
+                fields = ItemFields(item)
+                if any(item_matches_filter(fields, tech_filter, self.tech_mappings) for tech_filter in tech_filters):
+                    filtered_items.append(item)
+        return filtered_items
@@ -0,0 +1,150 @@
+"""
+Tech Matcher - One-pass technology detection for queries
+An Aho-Corasick automaton over every tech_mappings alias finds all alias hits in a
+single scan; each hit is then checked with the same word-boundary rule as regex \\b.
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# Context-aware detection for ambiguous terms (e.g., "Go", "R", "C")
+# These are common words but in specific contexts they refer to programming languages
+CONTEXT_TECH_PATTERNS = {
+    "go": [
+        r'\b(in|using|with|knowledge of|experience in|worked with|built with|coded in|programming in)\s+go\b',
+        r'\bgolang\b'
+    ],
+    "r": [
+        r'\b(in|using|with|knowledge of|experience in|worked with)\s+r\b',
+        r'\br\s+(programming|language|statistical)\b',
+        r'\brstudio\b'
+    ],
+    "c": [
+        r'\b(in|using|with|knowledge of|experience in|worked with|coded in)\s+c\b',
+        r'\bc\s+(programming|language)\b',
+        r'\bc\+\+\b'  # If they mention C++, they might mean C too
+    ],
+    "java": [
+        r'\b(in|using|with|knowledge of|experience in|experience|worked with|coded in|programming in)\s+java\b',
+        r'\bjava\s+(programming|development|language|experience|projects?|work)\b',
+        r'\bjava\s+\w+\b'  # Java followed by any word (Java developer, Java projects, etc.)
+    ],
+    "rust": [
+        r'\b(in|using|with|knowledge of|experience in|experience|worked with|coded in)\s+rust\b',
+        r'\brust\s+(programming|language|projects?|work)\b',
+        r'\b(his|her|their)\s+rust\s+\w+\b',  # His Rust projects
+        r'\brust\s+\w+\b'  # Rust followed by any word
+    ]
+}
+
+
+def is_word_char(ch: str) -> bool:
+    """Same definition of a word character as the re module uses for \\b and \\w"""
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher: all occurrences of all patterns in one pass"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        seen = set()
+        for pattern in patterns:
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                self._insert(pattern, len(self.patterns))
+                self.patterns.append(pattern)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, index: int):
+        node = 0
+        for ch in pattern:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0) if node else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (pattern_index, end_position) for every occurrence, overlaps included"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for position, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for index in out[node]:
+                    yield index, position + 1
+
+    def find_whole_words(self, text: str) -> Set[int]:
+        """Indices of patterns that occur with a word boundary on both ends (like \\bpattern\\b)"""
+        found = set()
+        length = len(text)
+        for index, end in self.iter_matches(text):
+            if index in found:
+                continue
+            pattern = self.patterns[index]
+            start = end - len(pattern)
+            left_is_word = start > 0 and is_word_char(text[start - 1])
+            right_is_word = end < length and is_word_char(text[end])
+            # \b holds where word-ness changes, so the neighbour must differ from the pattern's edge
+            if left_is_word != is_word_char(pattern[0]) and right_is_word != is_word_char(pattern[-1]):
+                found.add(index)
+        return found
+
+
+class TechMatcher:
+    """Canonical tech detection built once from tech_mappings and the context patterns"""
+
+    def __init__(self, tech_mappings: Dict[str, List[str]], context_patterns: Dict[str, List[str]] = None):
+        context_patterns = CONTEXT_TECH_PATTERNS if context_patterns is None else context_patterns
+        self.tech_order = list(tech_mappings.keys())
+
+        # alias (lowercased) -> canonical techs that list it
+        alias_techs: Dict[str, List[str]] = {}
+        for tech, keywords in tech_mappings.items():
+            for keyword in keywords:
+                techs = alias_techs.setdefault(keyword.lower(), [])
+                if tech not in techs:
+                    techs.append(tech)
+
+        self.automaton = AhoCorasick(alias_techs.keys())
+        self.pattern_techs: List[List[str]] = [alias_techs[pattern] for pattern in self.automaton.patterns]
+
+        # One combined regex per ambiguous tech
+        self.context_regexes: List[Tuple[str, "re.Pattern"]] = [
+            (tech, re.compile("|".join(f"(?:{pattern})" for pattern in patterns)))
+            for tech, patterns in context_patterns.items()
+        ]
+
+    def match_context(self, query_lower: str) -> List[str]:
+        """Ambiguous techs (go, r, c, ...) detected from their context, in declaration order"""
+        return [tech for tech, regex in self.context_regexes if regex.search(query_lower)]
+
+    def match_aliases(self, query_lower: str) -> List[str]:
+        """Canonical techs with an alias in the query, in tech_mappings order"""
+        hits: Set[str] = set()
+        for index in self.automaton.find_whole_words(query_lower):
+            hits.update(self.pattern_techs[index])
+        return [tech for tech in self.tech_order if tech in hits]
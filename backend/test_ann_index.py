@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the IVF approximate nearest-neighbour index (no models needed)
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import rag_service
+from ann_index import IVFIndex
+from bench_ann_index import clustered_corpus, recall_at_k
+from test_embedding_cache import CountingEncoder, RESUME_DATA
+from vector_index import VectorIndex
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The RAG model is replaced below
+
+
+def test_recall_filters_and_persistence():
+    """High recall vs the exact scan, section filters honoured, save/load gives identical answers"""
+    embeddings, sections, queries = clustered_corpus(4000, dim=64, n_topics=60, n_queries=50)
+    exact = VectorIndex(embeddings, sections)
+    ivf = IVFIndex.build(embeddings, sections, n_probe=8, exact_threshold=0)
+    exact_hits = exact.search_batch(queries, top_k=10, min_score=-1.0)
+    assert recall_at_k(exact_hits, ivf.search_batch(queries, top_k=10, min_score=-1.0)) > 0.9
+    assert recall_at_k(exact_hits, ivf.search_batch(queries, top_k=10, min_score=-1.0, n_probe=len(ivf.centroids))) == 1.0
+
+    for row, _ in ivf.search(queries[0], top_k=10, min_score=-1.0, sections=["blog"]):
+        assert sections[row] == "blog"
+    assert ivf.search(queries[0], sections=["talks"]) == []
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = os.path.join(cache_dir, "ivf.npz")
+        ivf.save(path)
+        loaded = IVFIndex.load(path)
+        assert loaded.search_batch(queries, top_k=10) == ivf.search_batch(queries, top_k=10)
+    print("✅ IVF recall, section filters and persistence")
+
+
+def test_restrictive_section_filter_probes_more_lists():
+    """A rare section still gets top_k hits above the exact threshold, not just what n_probe lists hold"""
+    embeddings, sections, queries = clustered_corpus(4000, dim=64, n_topics=60, n_queries=20)
+    rng = np.random.default_rng(3)
+    rare = set(rng.choice(len(sections), 25, replace=False).tolist())
+    sections = ["talks" if row in rare else section for row, section in enumerate(sections)]
+    ivf = IVFIndex.build(embeddings, sections, n_probe=2)
+    assert len(ivf) > ivf.exact_threshold
+    for hits in ivf.search_batch(queries, top_k=10, min_score=-1.0, sections=["talks"]):
+        assert len(hits) == 10 and all(sections[row] == "talks" for row, _ in hits)
+    assert len(ivf.search(queries[0], top_k=100, min_score=-1.0, sections=["talks"])) == 25
+    print("✅ Restrictive section filters widen the probe instead of returning short results")
+
+
+def test_incremental_insert_and_small_corpus():
+    """Inserted vectors are searchable without re-clustering; small corpora stay exact"""
+    embeddings, sections, queries = clustered_corpus(3000, dim=64, n_topics=60, n_queries=20)
+    ivf = IVFIndex.build(embeddings[:2000], sections[:2000], exact_threshold=0)
+    centroids = ivf.centroids.copy()
+    ivf.add(embeddings[2000:], sections[2000:])
+    assert np.array_equal(ivf.centroids, centroids) and len(ivf) == 3000
+    for row in (2000, 2500, 2999):
+        assert ivf.search(embeddings[row], top_k=1)[0][0] == row
+
+    small = IVFIndex.build(embeddings[:500], sections[:500])  # Below IVF_EXACT_THRESHOLD
+    exact = VectorIndex(embeddings[:500], sections[:500])
+    assert [[row for row, _ in hits] for hits in small.search_batch(queries, top_k=5)] == \
+        [[row for row, _ in hits] for hits in exact.search_batch(queries, top_k=5)]
+    print("✅ Incremental insertion and exact fallback for small corpora")
+
+
+def test_rag_ivf_mode():
+    """ivf mode persists the index, reloads it on the next start and indexes added items"""
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            exact = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            ivf = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir, index_mode="ivf")
+            assert isinstance(ivf.index, IVFIndex)
+            assert ivf.semantic_search("python backend", min_score=0) == exact.semantic_search("python backend", min_score=0)
+
+            reloaded = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir, index_mode="ivf")
+            assert np.array_equal(reloaded.index.vectors, ivf.index.vectors)
+
+            post = {"title": "Zig compiler internals", "technologies": ["Zig"], "description": "A blog post"}
+            ivf.add_items("blog", [post])
+            assert ivf.semantic_search("Zig compiler internals", top_k=1, section_filter=["blog"])[0][0] is post
+            assert [name for name in os.listdir(cache_dir) if name.startswith("ivf_")] == [os.path.basename(ivf._ivf_path())]
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ ResumeRAG ivf mode")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_recall_filters_and_persistence()
+        test_restrictive_section_filter_probes_more_lists()
+        test_incremental_insert_and_small_corpus()
+        test_rag_ivf_mode()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for API server request handling (fake embedding model, no LLM key needed)
+"""
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import model_registry
+import rag_service
+import resume_query_processor
+from rate_limiter import Budget, RateLimiter
+from test_embedding_batcher import CallRecorder
+from test_embedding_cache import RESUME_DATA
+
+api_server = pytest.importorskip("api_server", reason="API server dependencies (audio/TTS/database) not installed")
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def app_client(monkeypatch, tmp_path):
+    """TestClient over the real app with a fake embedding model and a fresh query processor"""
+    monkeypatch.setenv("INDEX_CACHE_DIR", str(tmp_path))
+    model = CallRecorder()
+    monkeypatch.setattr(model_registry, "get_embedding_model", lambda backend=None: model)
+    monkeypatch.setattr(rag_service, "get_embedding_model", lambda backend=None: model)
+    processor = resume_query_processor.ResumeQueryProcessor(RESUME_DATA, use_index_bundle=False)
+    monkeypatch.setattr(resume_query_processor, "_processor_instance", processor)
+    with TestClient(api_server.app) as client:
+        yield client, processor
+
+
+def test_smart_query_embeddings_are_micro_batched(app_client):
+    """The processor runs off the event loop, so concurrent queries share encode calls"""
+    client, processor = app_client
+    # Unknown techs force a semantic-neighbour lookup (one query embedding per request)
+    processor.extract_technologies = lambda query: [query.split()[0]]
+    before = dict(client.get("/api/embeddings/stats").json()["batchers"][0])
+
+    questions = [f"zyglang{i} projects" for i in range(8)]
+    with ThreadPoolExecutor(len(questions)) as pool:
+        responses = list(pool.map(lambda text: client.post("/smart/query", json={"text": text}), questions))
+    assert all(response.status_code == 200 for response in responses)
+
+    after = client.get("/api/embeddings/stats").json()["batchers"][0]
+    assert after["requests"] - before["requests"] == len(questions)
+    assert after["batches"] > before["batches"]
+    assert after["direct_calls"] == before["direct_calls"]
+    print(f"✅ {len(questions)} concurrent queries in {after['batches'] - before['batches']} batched encode calls")
+
+
+def test_rate_limited_responses_carry_cors_headers(monkeypatch):
+    """CORS wraps the rate limiter, so the browser can read the 429 / rate-limit reply"""
+    monkeypatch.setattr(api_server, "rate_limiter", RateLimiter([
+        Budget("text", capacity=0, refill_per_second=0.001),
+        Budget("voice", capacity=0, refill_per_second=0.001),
+        Budget("llm_tokens", capacity=100, refill_per_second=0.001),
+    ]))
+    client = TestClient(api_server.app)
+    headers = {"Origin": "http://localhost:3000", "x-user-id": "cors-test"}
+    limited = client.post("/test/transcribe", headers=headers)
+    assert limited.status_code == 429 and "Retry-After" in limited.headers
+    assert limited.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+    limited_text = client.post("/smart/query", headers=headers, json={"text": "hi"})
+    assert limited_text.json()["item_type"] == "rate_limit"
+    assert limited_text.headers["access-control-allow-origin"] == "http://localhost:3000"
+    print("✅ Rate-limited voice and text replies include Access-Control-Allow-Origin")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for chunk-level RAG search with item-level pooling (no models needed)
+"""
+import sys
+import os
+import contextlib
+import io
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import rag_service
+from chunk_index import ChunkIndex, item_chunks
+from test_embedding_cache import CountingEncoder, RESUME_DATA
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The RAG model is replaced below
+
+
+def test_pooling_matches_per_item_loop():
+    rng = np.random.default_rng(3)
+    parents = np.array([0, 0, 0, 2, 5, 5], dtype=np.int64)
+    scores = rng.uniform(-1, 1, size=(4, len(parents))).astype(np.float32)
+    pooled, items, _ = ChunkIndex.pool(scores, parents, "max")
+    assert items.tolist() == [0, 2, 5]
+    assert np.allclose(pooled, [[row[parents == item].max() for item in (0, 2, 5)] for row in scores])
+
+    soft, _, _ = ChunkIndex.pool(scores, parents, "softmax", temperature=0.1)
+    for row, soft_row in zip(scores, soft):
+        for item, value in zip((0, 2, 5), soft_row):
+            group = row[parents == item]
+            weights = np.exp(group / 0.1)
+            assert value == pytest.approx(float((weights * group).sum() / weights.sum()), abs=1e-5)
+            assert group.mean() - 1e-6 <= value <= group.max() + 1e-6
+    with pytest.raises(ValueError):
+        ChunkIndex.pool(scores, parents, "mean")
+    print("✅ Max and softmax pooling match a per-item loop")
+
+
+def test_item_chunks_cover_every_bullet():
+    with open(RESUME_DATA) as f:
+        experience = json.load(f)["experience"][0]
+    chunks = item_chunks(experience, parent=7)
+    ids = [chunk.chunk_id for chunk, _ in chunks]
+    assert len(ids) == len(set(ids)) and all(chunk.parent == 7 for chunk, _ in chunks)
+    highlights = [chunk for chunk, _ in chunks if chunk.kind == "highlight"]
+    assert [chunk.text for chunk in highlights] == experience["highlights"]
+    assert highlights[1].chunk_id == f"{experience['id']}#highlight-1"
+    assert chunks[1][1].startswith(f"{experience['role']} at {experience['company']}: ")
+    print(f"✅ {len(chunks)} chunks for {experience['id']}")
+
+
+def test_chunk_search_returns_matching_snippets():
+    """A detail that only appears in a late bullet finds its item, citing that bullet"""
+    with open(RESUME_DATA) as f:
+        experience = json.load(f)["experience"][0]
+    detail = experience["highlights"][-1]
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            rag = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            assert len(rag.chunk_index) > len(rag.items)
+
+            for pooling in ("max", "softmax"):
+                hit = rag.chunk_search(detail, top_k=3, min_score=0.0, pooling=pooling)[0]
+                assert hit.item["id"] == experience["id"]
+                assert hit.chunks[0]["chunk_id"] == f"{experience['id']}#highlight-{len(experience['highlights']) - 1}"
+                assert hit.chunks[0]["text"] == detail and len(hit.chunks) <= 3
+
+            hybrid = rag.hybrid_search(detail, top_k=1)[0]
+            assert hybrid.item is hit.item and hybrid.breakdown()["chunk_ids"][0] == hit.chunks[0]["chunk_id"]
+            assert all(h.section == "publications" for h in rag.chunk_search(detail, min_score=0.0, section_filter=["publications"]))
+
+            # Cached chunk embeddings are reused on restart
+            encoder = CountingEncoder()
+            rag_service.get_embedding_model = lambda backend=None: encoder
+            rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            assert encoder.texts == []
+
+            disabled = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir, chunk_index=False)
+            with pytest.raises(RuntimeError):
+                disabled.chunk_search(detail)
+            assert disabled.hybrid_search(detail, top_k=1)[0].chunks == []
+
+            # Quantization doesn't reach the chunk index: hybrid results are unchanged and a warning says so
+            with contextlib.redirect_stdout(io.StringIO()) as log:
+                quantized = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir, quantization="int8")
+            assert "only apply to semantic_search" in log.getvalue()
+            assert [h.breakdown() for h in quantized.hybrid_search(detail, top_k=5)] == \
+                   [h.breakdown() for h in rag.hybrid_search(detail, top_k=5)]
+            with contextlib.redirect_stdout(io.StringIO()) as log:
+                rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir, quantization="int8", chunk_index=False)
+            assert "only apply to semantic_search" not in log.getvalue()
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ Chunk search cites the matching bullet")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_pooling_matches_per_item_loop()
+        test_item_chunks_cover_every_bullet()
+        test_chunk_search_returns_matching_snippets()
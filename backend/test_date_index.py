@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-parsed date interval index (no models needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from resume_query_processor import ResumeQueryProcessor
+from bench_date_index import MODIFIERS, date_workload, legacy_filter_by_date, synthetic_corpus
+from date_index import DATE_SORT_KEYS, DateIndex
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # Only resume data is needed
+
+with embedding_model_blocked():
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+
+def test_same_items_as_regex_parsing():
+    """Every modifier/year combination keeps the old items, for sections, copies and foreign items"""
+    sections = [processor.resume_data[name] for name in ("projects", "experience", "publications", "blog", "education")]
+    tagged = [processor._tag_items(items, "experience") for items in sections]
+    mixed = [item for items in tagged for item in items] + [{"id": "new", "dates": "Jan. 2021 – Feb. 2022"}, {"date": "2030"}]
+    for modifier in MODIFIERS:
+        for years in ([2023], [2024, 2025], [2020, 2021, 2022], [2019]):
+            for items in sections + tagged + [mixed]:
+                filters = {"years": [str(year) for year in years], "date_modifier": modifier}
+                assert processor.filter_by_date(items, filters) == legacy_filter_by_date(items, years, modifier), (years, modifier)
+    print("✅ Resume data filtered identically")
+
+def test_synthetic_corpus_and_sorts():
+    """Interval masks and prebuilt date views agree with the old code on a generated corpus"""
+    corpus = synthetic_corpus(300)
+    index = DateIndex(corpus)
+    for years, modifier in date_workload():
+        for items in corpus.values():
+            assert index.filter(items, years, modifier) == legacy_filter_by_date(items, years, modifier), (years, modifier)
+    for key_name, key in DATE_SORT_KEYS.items():
+        for items in corpus.values():
+            subset = items[::-3] + [{"id": "unseen", "date": "Dec. 2099"}] * (key_name == "date")
+            for candidate in (items, items[5:40], subset):
+                assert index.sort(candidate, key_name) == sorted(candidate, key=key, reverse=True), key_name
+    print("✅ Synthetic corpus filtered and sorted identically")
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_same_items_as_regex_parsing()
+        test_synthetic_corpus_and_sorts()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for MMR card selection (no models needed)
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import rag_service
+from diversity import DiversitySelector, mmr_select, relevance_scores
+from test_embedding_cache import CountingEncoder, RESUME_DATA
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The RAG model is replaced below
+
+
+def reference_mmr(relevance, vectors, k, lambda_):
+    """Textbook MMR with full re-scoring at every step"""
+    picked = []
+    while len(picked) < k:
+        best, best_score = None, -np.inf
+        for i in range(len(relevance)):
+            if i in picked:
+                continue
+            penalty = max((float(vectors[i] @ vectors[j]) for j in picked), default=0.0)
+            score = lambda_ * relevance[i] - (1 - lambda_) * penalty if picked else relevance[i]
+            if score > best_score:
+                best, best_score = i, score
+        picked.append(best)
+    return picked
+
+
+def test_mmr_matches_reference_and_respects_quotas():
+    rng = np.random.default_rng(5)
+    vectors = rng.normal(size=(40, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    similarity = vectors @ vectors.T
+    relevance = rng.uniform(size=40).astype(np.float32)
+    candidates = rng.permutation(40)[:25]
+    sections = ["projects"] * 25
+    for lambda_ in (1.0, 0.7, 0.3):
+        picked = mmr_select(relevance[candidates], similarity, candidates, sections, 6, lambda_)
+        assert picked == reference_mmr(relevance[candidates], vectors[candidates], 6, lambda_)
+
+    # Near-duplicate of the top card is skipped in favour of something different
+    duplicates = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    assert mmr_select(np.array([1.0, 0.95, 0.6]), duplicates @ duplicates.T, np.arange(3), ["a"] * 3, 2, 0.5) == [0, 2]
+
+    # Quotas cap a section until nothing else is left
+    sections = ["projects"] * 5 + ["experience"]
+    picked = mmr_select(np.linspace(1, 0.5, 6), np.zeros((6, 6)), np.arange(6), sections, 4, 1.0, default_quota=2)
+    assert picked == [0, 1, 5, 2]
+    assert mmr_select(np.linspace(1, 0.5, 6), np.zeros((6, 6)), np.arange(6), sections, 3, 1.0,
+                      quotas={"projects": 1}) == [0, 5, 1]
+    print("✅ Vectorized MMR matches the reference and honours quotas")
+
+
+def test_selector_uses_rag_item_embeddings():
+    """Selector vectors come from the RAG item cache; cards spread across sections"""
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            data_path = os.path.join(data_dir, "resume_data.json")
+            shutil.copy(RESUME_DATA, data_path)
+            rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            rag_service.ResumeRAG(data_path)
+
+            with open(data_path) as f:
+                resume_data = json.load(f)
+            encoder = CountingEncoder()
+            processor = SimpleNamespace(semantic_model=encoder, resume_data=resume_data, resume_data_path=data_path)
+            selector = DiversitySelector.from_processor(processor)
+            assert encoder.texts == [] and len(selector.rows) == len(selector.similarity) - 1
+
+            items = [dict(item, content_source="projects") for item in resume_data["projects"]] + \
+                    [dict(item, content_source="experience") for item in resume_data["experience"][:1]]
+            chosen = selector.select(items, 4)
+            assert len(chosen) == 4 and len({item["id"] for item in chosen}) == 4
+            assert [item["content_source"] for item in chosen].count("projects") <= 3 and chosen[0] is items[0]
+            assert any(item["content_source"] == "experience" for item in chosen)
+            assert DiversitySelector().select(items, 4)[:2] == items[:2]  # No vectors: relevance + quotas
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ DiversitySelector reuses cached item embeddings")
+
+
+def test_rrf_scale_scores_are_normalized():
+    """RRF rag_scores (<= ~0.033) must not be swamped by the similarity penalty"""
+    assert np.allclose(relevance_scores([{"rag_score": 0.2}, {"rag_score": 0.9}, {"rag_score": 0.55}]), [0.0, 1.0, 0.5])
+    assert relevance_scores([{"rag_score": 0.016}] * 3).tolist() == [1.0, 1.0, 1.0]
+    vectors = np.array([[1.0, 0.0, 0.0], [0.99, 0.14, 0.0], [0.5, 0.0, 0.87], [0.0, 1.0, 0.0]], dtype=np.float32)
+    items = [{"id": str(i), "content_source": "projects", "rag_score": score}
+             for i, score in enumerate([1 / 61, 1 / 62, 1 / 63, 1 / 120])]
+    selector = DiversitySelector(vectors, [("projects", str(i)) for i in range(4)])
+    # Near-duplicate "1" is skipped for the related, almost as relevant "2" - not the weak, unrelated "3"
+    assert [item["id"] for item in selector.select(items, 2, lambda_=0.7, default_quota=2)] == ["0", "2"]
+    print("✅ RRF-scale relevance is min-max normalized before MMR")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_mmr_matches_reference_and_respects_quotas()
+        test_selector_uses_rag_item_embeddings()
+        test_rrf_scale_scores_are_normalized()
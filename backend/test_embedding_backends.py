@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for the alternate embedding backends (torch-int8 / ONNX)
+Parity runs on a tiny randomly initialised MiniLM-shaped model built offline;
+skipped when torch / sentence-transformers / onnxruntime are not installed.
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+from embedding_backends import load_embedding_backend, mean_pool
+from model_registry import embedding_model_id
+
+DOCUMENTS = ["Built a RAG chatbot with FastAPI and sentence transformers",
+             "Robotics research on motion planning in ROS",
+             "Data pipelines with Spark and Airflow at a startup",
+             "React frontend with TypeScript", "kubernetes"]
+QUERIES = ["machine learning projects", "what frontend work has he done", "spark"]
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(
+    {word for text in DOCUMENTS + QUERIES for word in text.lower().split()})
+
+
+def build_tiny_model(directory: str):
+    """2-layer, 32-dim BERT + mean pooling + normalize (same pipeline as all-MiniLM-L6-v2)"""
+    import torch
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+    from sentence_transformers import SentenceTransformer, models
+
+    torch.manual_seed(0)
+    os.makedirs(directory, exist_ok=True)
+    vocab_path = os.path.join(directory, "vocab.txt")
+    with open(vocab_path, "w") as f:
+        f.write("\n".join(VOCAB))
+    BertTokenizerFast(vocab_file=vocab_path).save_pretrained(directory)
+    BertModel(BertConfig(vocab_size=len(VOCAB), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+                         intermediate_size=64, max_position_embeddings=64)).save_pretrained(directory)
+    transformer = models.Transformer(directory, max_seq_length=32)
+    return SentenceTransformer(modules=[transformer, models.Pooling(32, "mean"), models.Normalize()], device="cpu")
+
+
+def cosine_scores(model) -> np.ndarray:
+    queries = np.asarray(model.encode(QUERIES), dtype=np.float32)
+    documents = np.asarray(model.encode(DOCUMENTS), dtype=np.float32)
+    return queries @ documents.T
+
+
+def test_mean_pool_ignores_padding():
+    tokens = np.array([[[1.0, 2.0], [3.0, 4.0], [100.0, 100.0]]], dtype=np.float32)
+    assert np.allclose(mean_pool(tokens, np.array([[1, 1, 0]])), [[2.0, 3.0]])
+    assert "+" not in embedding_model_id("torch")  # torch keeps the pre-backend cache key
+    assert embedding_model_id("onnx") == embedding_model_id("torch") + "+onnx"
+    print("✅ Mean pooling matches the masked average")
+
+
+def test_backend_cosine_parity():
+    """Every backend ranks and scores like the torch model"""
+    pytest.importorskip("torch")
+    pytest.importorskip("sentence_transformers")
+    backends = [("torch-int8", 0.05)]
+    try:
+        import onnxruntime  # noqa: F401
+        backends += [("onnx", 1e-4), ("onnx-int8", 0.05)]
+    except ImportError:
+        print("💡 onnxruntime not installed - ONNX parity skipped")
+
+    with tempfile.TemporaryDirectory() as directory:
+        model = build_tiny_model(os.path.join(directory, "model"))
+        reference = cosine_scores(model)
+        for backend, tolerance in backends:
+            encoder = load_embedding_backend(model, backend, "tiny-minilm", export_dir=os.path.join(directory, "onnx"))
+            scores = cosine_scores(encoder)
+            single = np.asarray(encoder.encode(QUERIES[0]))
+            assert single.shape == (32,) and np.allclose(single, encoder.encode(QUERIES)[0], atol=1e-3)
+            assert np.abs(scores - reference).max() <= tolerance, backend
+            assert (scores.argmax(axis=1) == reference.argmax(axis=1)).all(), backend
+            print(f"✅ {backend}: max cosine drift {np.abs(scores - reference).max():.2e}")
+
+
+if __name__ == "__main__":
+    test_mean_pool_ignores_padding()
+    test_backend_cosine_parity()
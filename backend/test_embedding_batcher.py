@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-request embedding micro-batcher (no models needed)
+"""
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import embedding_batcher
+from embedding_batcher import EmbeddingBatcher, get_embedding_batcher
+from test_embedding_cache import CountingEncoder
+
+
+class CallRecorder(CountingEncoder):
+    """Records the size of every encode call"""
+    def __init__(self, fail=False):
+        super().__init__()
+        self.batches = []
+        self.fail = fail
+
+    def encode(self, texts, show_progress_bar=False):
+        if self.fail:
+            raise RuntimeError("model exploded")
+        self.batches.append(1 if isinstance(texts, str) else len(texts))
+        return super().encode(texts, show_progress_bar)
+
+
+def test_concurrent_requests_share_encode_calls():
+    """Concurrent callers get their own rows from a few batched calls, capped at max_batch_size"""
+    model = CallRecorder()
+    texts = [f"query number {i}" for i in range(50)]
+
+    async def run():
+        batcher = EmbeddingBatcher(model, max_batch_size=16, max_wait_ms=20)
+        single = await asyncio.gather(*(batcher.embed(text) for text in texts))
+        many = await batcher.embed_many(texts[:3])
+        oversized = await batcher.embed_many(texts[:40])
+        await batcher.close()
+        return single, many, oversized, batcher.describe()
+
+    single, many, oversized, stats = asyncio.run(run())
+    expected = CountingEncoder().encode(texts)
+    assert all(np.array_equal(vector, expected[i]) for i, vector in enumerate(single))
+    assert np.array_equal(many, expected[:3]) and np.array_equal(oversized, expected[:40])
+    assert model.batches == [16, 16, 16, 2, 3, 40]
+    assert stats["requests"] == 52 and stats["max_batch"] == 40
+    print(f"✅ 52 requests in {len(model.batches)} encode calls: {stats}")
+
+
+def test_errors_reach_every_caller():
+    async def run():
+        batcher = EmbeddingBatcher(CallRecorder(fail=True), max_wait_ms=5)
+        results = await asyncio.gather(*(batcher.embed(f"q{i}") for i in range(4)), return_exceptions=True)
+        await batcher.close()
+        return results
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+    print("✅ Model errors propagate to every waiting caller")
+
+
+def test_worker_thread_encode_goes_through_loop():
+    """With batching enabled, encode() from worker threads is batched; on-loop calls stay direct"""
+    model = CallRecorder()
+    batcher = get_embedding_batcher(model)
+    assert get_embedding_batcher(model) is batcher
+
+    async def run():
+        embedding_batcher.enable_embedding_batching()
+        try:
+            vectors = await asyncio.gather(*(asyncio.to_thread(batcher.encode, [f"text {i}"]) for i in range(8)))
+            on_loop = batcher.encode("direct")
+        finally:
+            await embedding_batcher.disable_embedding_batching()
+        return vectors, on_loop
+
+    vectors, on_loop = asyncio.run(run())
+    assert all(vector.shape == (1, 64) for vector in vectors) and on_loop.shape == (64,)
+    assert batcher.stats["direct_calls"] == 1 and batcher.stats["batches"] < 8 and sum(model.batches) == 9
+    assert batcher.encode(["after shutdown"]).shape == (1, 64) and batcher.stats["direct_calls"] == 2
+    print(f"✅ Worker-thread encodes batched: {batcher.describe()}")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_encode_calls()
+    test_errors_reach_every_caller()
+    test_worker_thread_encode_goes_through_loop()
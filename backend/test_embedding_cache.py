@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent content-hash embedding cache (no models needed)
+"""
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import rag_service
+from embedding_cache import EmbeddingCache
+from test_tech_embeddings import TrigramEncoder
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The RAG model is replaced below
+
+RESUME_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json")
+
+
+class CountingEncoder(TrigramEncoder):
+    """Records how many texts were encoded"""
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+
+    def encode(self, texts, show_progress_bar=False):
+        if isinstance(texts, str):  # Single query, like SentenceTransformer.encode(str)
+            return super().encode([texts], show_progress_bar)[0]
+        self.texts.extend(texts)
+        return super().encode(texts, show_progress_bar)
+
+
+def test_only_changed_texts_reencoded():
+    """Unchanged texts come from disk; new/changed ones are encoded; other models never share rows"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        texts = ["python | fastapi", "react | typescript", "pytorch | vision"]
+        first = EmbeddingCache(cache_dir, "fake@1").encode(texts, TrigramEncoder().encode)
+
+        encoder = CountingEncoder()
+        cache = EmbeddingCache(cache_dir, "fake@1")
+        again = cache.encode(texts, encoder.encode)
+        assert encoder.texts == [] and not cache.stats["written"] and np.array_equal(first, again)
+
+        changed = ["python | fastapi", "react | nextjs", "pytorch | vision", "python | fastapi"]
+        matrix = cache.encode(changed, encoder.encode)
+        assert encoder.texts == ["react | nextjs"] and cache.stats == {"cached": 3, "encoded": 1, "written": True}
+        assert np.array_equal(matrix, TrigramEncoder().encode(changed))
+        assert len(os.listdir(cache_dir)) == 2  # Manifest + current matrix (the old matrix is removed)
+        with open(cache.manifest_path) as f:
+            assert len(json.load(f)["hashes"]) == 3
+
+        other = CountingEncoder()
+        EmbeddingCache(cache_dir, "fake@2").encode(texts, other.encode)
+        assert other.texts == texts
+    print("✅ Only new or changed texts re-encoded")
+
+
+def test_rag_startup_uses_cache():
+    """Second ResumeRAG start encodes nothing and searches identically"""
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            cold = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            warm = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            assert warm.model.texts == [] and warm.embedding_cache.stats["cached"] == len(warm.items)
+            assert np.array_equal(cold.embeddings, warm.embeddings)
+            assert cold.semantic_search("python backend") == warm.semantic_search("python backend")
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ RAG warm start loaded every embedding from disk")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_only_changed_texts_reencoded()
+        test_rag_startup_uses_cache()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared query embedding LRU (no models needed)
+"""
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import rag_service
+from embedding_service import QueryEmbeddingCache, get_query_embedding_cache, normalize_query
+from tech_embeddings import TechEmbeddingIndex
+from test_embedding_cache import CountingEncoder, RESUME_DATA
+from test_tech_embeddings import VOCABULARY
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The RAG model is replaced below
+
+
+def test_lru_bounds_and_stats():
+    """Normalized keys, one encode call for the misses of a batch, LRU eviction and byte accounting"""
+    encoder = CountingEncoder()
+    cache = QueryEmbeddingCache(max_entries=3)
+    first = cache.encode_many(encoder, ["Python APIs", "react", "python   apis"])
+    assert encoder.texts == ["python apis", "react"] and np.array_equal(first[0], first[2])
+    first[0] += 1  # Callers get copies
+    assert first.dtype == np.float32 and not np.array_equal(cache.encode(encoder, "PYTHON APIS"), first[0])
+    cache.encode_many(encoder, ["rust", "go", "zig"])
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 2 and stats["encode_calls"] == 2
+    assert stats["memory_bytes"] == 3 * first[0].nbytes and stats["hits"] == 1 and stats["hit_rate"] == round(1 / 6, 3)
+    assert normalize_query("  What   did\the BUILD ") == "what did he build"
+    assert not np.array_equal(cache.encode(encoder, "rust", model_id="other@1"), np.zeros(64)) and len(cache) == 3
+
+    threads = [threading.Thread(target=lambda: [cache.encode(encoder, f"q{i % 7}") for i in range(200)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 3 and cache.stats()["memory_bytes"] == 3 * first[0].nbytes
+    print(f"✅ LRU stats: {cache.stats()}")
+
+
+def test_shared_by_rag_and_tech_matching():
+    """A query embedded by RAG search is reused by semantic tech matching (and vice versa)"""
+    original = rag_service.get_embedding_model
+    shared = get_query_embedding_cache()
+    shared.clear()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            encoder = CountingEncoder()
+            rag_service.get_embedding_model = lambda backend=None: encoder
+            rag = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            tech = TechEmbeddingIndex(VOCABULARY, encoder, model_id=rag.embedding_cache.model_id, query_cache=shared)
+            encoder.texts.clear()
+
+            first = rag.semantic_search("Machine Learning", min_score=0)
+            tech.most_similar("machine learning")
+            assert rag.semantic_search("machine  learning", min_score=0) == first
+            assert encoder.texts == ["machine learning"]
+            assert shared.stats()["hits"] >= 2
+    finally:
+        rag_service.get_embedding_model = original
+        shared.clear()
+    print("✅ One embedding shared by RAG and tech matching")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_lru_bounds_and_stats()
+        test_shared_by_rag_and_tech_matching()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for the entity alias index (no models needed)
+"""
+import sys
+import os
+import copy
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from resume_query_processor import ResumeQueryProcessor
+from bench_entity_index import ENTITY_QUESTIONS, legacy_detect, index_detect, synthetic_corpus
+from entity_index import EntityIndex, normalize_entity_name
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # Only resume data is needed
+
+with embedding_model_blocked():
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+
+def test_same_entities_as_per_item_scan():
+    """Index finds the same entity name and items, in order, as the old scan - without touching the data"""
+    before = copy.deepcopy(processor.resume_data)
+    questions = ENTITY_QUESTIONS + [question.upper() for question in ENTITY_QUESTIONS] + ["tell me about the the lab lab"]
+    for question in questions:
+        expected = legacy_detect(processor.resume_data, question)
+        result = processor._detect_specific_entity(question)
+        assert (result and (result["entity_name"], result["matched_items"])) == (expected or None), question
+    assert processor.resume_data == before
+    corpus = synthetic_corpus(processor.resume_data, 600)
+    index = EntityIndex(corpus)
+    for question in questions:
+        assert index_detect(index, question) == legacy_detect(corpus, question), question
+    print(f"✅ {len(questions)} questions detected identically")
+
+def test_asr_variants_and_abbreviations():
+    """Mishearings normalize; initialisms resolve when the words themselves don't match"""
+    assert normalize_entity_name("People Robot Slap") == "People robots lab"
+    result = processor._detect_specific_entity("what did he do at prl?")
+    assert [item["id"] for item in result["matched_items"]] == ["people-robots-lab"]
+    assert result["match_scores"] == [1]
+    assert "rag" not in processor.entity_index.aliases  # Tech vocabulary never becomes an alias
+    print(f"✅ Aliases: {processor.entity_index.aliases}")
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_same_entities_as_per_item_scan()
+        test_asr_variants_and_abbreviations()
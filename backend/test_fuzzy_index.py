@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the prebuilt fuzzy tech index (no models needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fuzzy_index import FUZZYWUZZY_AVAILABLE
+from resume_query_processor import ResumeQueryProcessor
+from bench_fuzzy_index import MISSPELLED_TERMS, legacy_best_match, noisy_terms
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # Only tech_mappings is needed
+
+with embedding_model_blocked():
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+terms = list(processor.fuzzy_keyword_tech.keys())
+
+def test_same_matches_as_full_scan():
+    """Index returns exactly what scanning every alias returns, at both thresholds"""
+    texts = MISSPELLED_TERMS + noisy_terms(terms, count=500, seed=3) + ["", "c++", "node.js", "ÄI"]
+    for text in texts:
+        for min_score in (80, 82):
+            assert processor.fuzzy_index.best_match(text, min_score) == legacy_best_match(terms, text, min_score), text
+    try:
+        from fuzzywuzzy import fuzz
+        from fuzzywuzzy.process import extractOne
+    except ImportError:
+        print(f"✅ {len(texts)} lookups identical to the full scan (fuzzywuzzy not installed)")
+        return
+    for text in texts:
+        best, score = extractOne(text, terms, scorer=fuzz.ratio)
+        expected = (best, score) if score >= 82 else None
+        assert processor.fuzzy_index.best_match(text, 82) == expected, text
+    print(f"✅ {len(texts)} lookups identical to fuzzywuzzy.extractOne")
+
+def test_fuzzy_fallback_in_extract_technologies():
+    """Misspelled and misheard techs still resolve; exact matches skip the fuzzy pass"""
+    alias, tech, score = processor.match_fuzzy_tech("pytorh")
+    assert (alias, score) == ("pytorch", 92) and tech == processor.fuzzy_keyword_tech["pytorch"]
+    assert processor.match_fuzzy_tech("nitigya") is None
+    assert "react" in processor.extract_technologies("projects with react")
+    if FUZZYWUZZY_AVAILABLE:
+        assert tech in processor.extract_technologies("any pytorh projects")
+    print("✅ Fuzzy fallback resolves misspellings")
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_same_matches_as_full_scan()
+        test_fuzzy_fallback_in_extract_technologies()
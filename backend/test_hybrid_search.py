@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for BM25 + dense hybrid retrieval (no models needed)
+"""
+import sys
+import os
+import math
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import rag_service
+from bm25_index import BM25Index, tokenize
+from test_embedding_cache import CountingEncoder, RESUME_DATA
+from test_embedding_batcher import CallRecorder
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The RAG model is replaced below
+
+
+def brute_force_bm25(texts, query, k1=1.2, b=0.75):
+    docs = [tokenize(text) for text in texts]
+    avg_length = sum(map(len, docs)) / len(docs)
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in other for other in docs)
+            if df:
+                tf = doc.count(term)
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avg_length))
+        scores.append(score)
+    return np.asarray(scores)
+
+
+def test_bm25_matches_reference():
+    texts = ["Python FastAPI backend", "DuckDB analytics in Python", "React + Node.js frontend",
+             "", "python python python", "Built with C++ and scikit-learn"]
+    index = BM25Index(texts)
+    for query in ["python duckdb", "node.js c++", "scikit-learn", "unknown words", "python"]:
+        assert np.allclose(index.scores(query), brute_force_bm25(texts, query), atol=1e-5), query
+    assert index.scores_batch(["python", "react"]).shape == (2, len(texts))
+    assert index.matched_terms("python duckdb", 1) == ["python", "duckdb"] and index.matched_terms("duckdb", 0) == []
+    assert not BM25Index([]).scores("anything").size
+    print("✅ BM25 scores match the brute-force formula")
+
+
+def test_bm25_generic_terms_do_not_anchor_matches():
+    texts = ["Work experience: Python backend", "Projects using Go", "Elixir side project", "python python data"]
+    index = BM25Index(texts)
+    assert np.allclose(index.scores("experience with python"), brute_force_bm25(texts, "experience with python"), atol=1e-5)
+    assert not index.scores("any experience with cobol", anchored=True).any()
+    assert not index.scores("projects using rust", anchored=True).any()
+    anchored = index.scores("projects using elixir", anchored=True)
+    assert np.flatnonzero(anchored).tolist() == [2] and anchored[2] == pytest.approx(index.scores("projects using elixir")[2])
+    assert np.allclose(BM25Index(texts, min_idf=10.0).scores("python elixir", anchored=True), 0.0)
+    print("✅ Generic / low-IDF terms score but never anchor a lexical match")
+
+
+def test_unknown_tech_questions_return_nothing_lexical():
+    """Questions about techs the resume lacks must not return cards matched on 'experience' / 'projects'"""
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            rag = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            for question in ("any experience with COBOL", "projects using Elixir", "have you worked on Haskell projects",
+                             "what work experience do you have using Fortran"):
+                assert rag.hybrid_search(question, top_k=5, min_dense_score=0.99) == [], question
+            hits = rag.hybrid_search("projects using dbscan", top_k=5, min_dense_score=0.99)
+            assert hits and all("dbscan" in hit.matched_terms for hit in hits)
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ Unknown-tech questions get no lexical matches from generic words")
+
+
+def test_hybrid_search_finds_exact_terms():
+    """A rare exact term is retrieved even when its dense score is below the threshold"""
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            rag = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            query = "anything using dbscan clustering"
+            dense = rag.semantic_search(query, top_k=5, min_score=0.99)
+            hits = rag.hybrid_search(query, top_k=5, min_dense_score=0.99)
+            assert not dense and hits and "dbscan" in hits[0].matched_terms
+            assert hits[0].dense_score is None and hits[0].bm25_rank == 1
+            assert hits[0].score == pytest.approx(1.0 / (rag_service.HYBRID_RRF_K + 1))
+
+            weighted = rag.hybrid_search(query, top_k=5, fusion="weighted", dense_weight=0.5, min_dense_score=0.0)
+            assert all(0.0 <= hit.score <= 1.0 for hit in weighted)
+            assert [hit.score for hit in weighted] == sorted((hit.score for hit in weighted), reverse=True)
+            assert set(weighted[0].breakdown()) >= {"dense_score", "bm25_score", "dense_rank", "bm25_rank", "matched_terms"}
+
+            only_pubs = rag.hybrid_search("python", section_filter=["publications"], min_dense_score=0.0)
+            assert only_pubs and all(hit.section == "publications" for hit in only_pubs)
+            batch = rag.hybrid_search_batch([query, "python"], top_k=5, min_dense_score=0.99)
+            assert [hit.breakdown() for hit in batch[0]] == [hit.breakdown() for hit in hits]
+
+            post = {"title": "Zig compiler internals", "technologies": ["Zig"], "description": "A blog post"}
+            rag.add_items("blog", [post])
+            assert rag.hybrid_search("zig", top_k=1, min_dense_score=0.99)[0].item is post
+            with pytest.raises(ValueError):
+                rag.hybrid_search(query, fusion="max")
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ Hybrid search: exact-term recall, both fusions, section filters, breakdowns")
+
+
+def test_query_expansion_is_one_batch_with_attribution():
+    """Question + expansion terms: one encode call, weighted-max dense score, per-term attribution"""
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            model = CallRecorder()
+            rag_service.get_embedding_model = lambda backend=None: model
+            rag = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            model.batches.clear()
+            with open(RESUME_DATA) as f:
+                bullet = json.load(f)["experience"][0]["highlights"][-1]
+            question = "kotlin mobile apps"
+            terms = ["Kotlin", "kotlin", "DBSCAN", bullet]
+            hits = rag.hybrid_search(question, top_k=5, expansions=terms, min_dense_score=0.0, expansion_weight=0.9)
+            assert model.batches == [4]  # Question + 3 distinct terms, one call
+            assert hits[0].best_term == bullet and hits[0].chunks[0]["text"] == bullet
+            for hit in hits:
+                if hit.dense_score is None:
+                    continue
+                weighted = {term: score * (1.0 if term == question else 0.9) for term, score in hit.term_scores.items()}
+                assert hit.best_term == max(weighted, key=weighted.get)
+                assert hit.dense_score == pytest.approx(weighted[hit.best_term])
+                assert set(hit.term_scores) <= {question, "Kotlin", "DBSCAN", bullet}
+            lexical = rag.hybrid_search(question, expansions=["DBSCAN"], min_dense_score=0.99)
+            assert lexical and lexical[0].matched_terms == ["dbscan"]  # BM25 sees the expansion terms too
+            assert rag.hybrid_search(question, top_k=5, min_dense_score=0.0)[0].best_term == question
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ Expanded query: one encode call, attributed scores")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_bm25_matches_reference()
+        test_bm25_generic_terms_do_not_anchor_matches()
+        test_unknown_tech_questions_return_nothing_lexical()
+        test_hybrid_search_finds_exact_terms()
+        test_query_expansion_is_one_batch_with_attribution()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the memory-mapped index bundle built by build_index.py (no models needed)
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import model_registry
+import rag_service
+from build_index import build_index
+from index_bundle import BundlePart, bitsets_to_csr, csr_to_bitsets, load_index_bundle, write_bundle
+from resume_query_processor import ResumeQueryProcessor
+from test_embedding_cache import CountingEncoder, RESUME_DATA
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The embedding model is replaced below
+
+
+def test_bitsets_round_trip_through_csr():
+    postings = {"python": {"projects": 0b1011, "experience": 0}, "go": {"projects": 0, "experience": 0b100}, "none": {}}
+    sizes = {"projects": 4, "experience": 3}
+    keys, offsets, rows = bitsets_to_csr(postings, sizes)
+    assert keys == ["python", "go", "none"] and offsets.tolist() == [0, 3, 4, 4] and rows.tolist() == [0, 1, 3, 6]
+    restored = csr_to_bitsets(keys, offsets, rows, sizes)
+    assert restored["python"] == postings["python"] and restored["go"] == postings["go"]
+    assert restored["none"] == {"projects": 0, "experience": 0}
+    print("✅ Bitset postings survive the CSR round trip")
+
+
+def test_bundle_loads_without_encoding():
+    """A worker started on a built bundle encodes nothing, maps its matrices and answers identically"""
+    originals = (model_registry.get_embedding_model, rag_service.get_embedding_model)
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            data_path = os.path.join(data_dir, "resume_data.json")
+            shutil.copy(RESUME_DATA, data_path)
+            cache_dir = os.path.join(data_dir, ".index_cache")
+            model_registry.get_embedding_model = rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            bundle = build_index(data_path)
+            assert not bundle.verify() and {"fuzzy", "tech_postings", "dates", "tech_vocabulary", "tech_neighbours",
+                                           "rag_vectors", "rag_chunks", "bm25", "cards"} <= set(bundle.manifest["parts"])
+            fresh = ResumeQueryProcessor(data_path, use_index_bundle=False)
+            fresh_rag = rag_service.ResumeRAG(data_path, use_index_bundle=False)
+
+            # Only the bundle is left: every embedding has to come from it
+            for name in os.listdir(cache_dir):
+                if name != "bundle":
+                    os.remove(os.path.join(cache_dir, name))
+            encoder = CountingEncoder()
+            model_registry.get_embedding_model = rag_service.get_embedding_model = lambda backend=None: encoder
+            processor = ResumeQueryProcessor(data_path)
+            rag = rag_service.ResumeRAG(data_path)
+            assert encoder.texts == []
+            assert isinstance(rag.index.matrix, np.memmap) and isinstance(rag.chunk_index.matrix, np.memmap)
+            assert isinstance(processor.tech_embeddings.matrix, np.memmap) and processor.index_bundle is rag.index_bundle
+
+            assert processor.match_fuzzy_tech("pytorh") == fresh.match_fuzzy_tech("pytorh")
+            projects = processor.resume_data["projects"]
+            assert processor.filter_by_technology(projects, ["python", "react"]) == fresh.filter_by_technology(projects, ["python", "react"])
+            dates = fresh.extract_date_filters("projects from 2024")
+            assert [item["id"] for item in processor.filter_by_date(projects, dates)] == \
+                   [item["id"] for item in fresh.filter_by_date(projects, dates)]
+            assert {tech: entry.similar for tech, entry in processor.tech_graph.neighbourhoods.items()} == \
+                   {tech: entry.similar for tech, entry in fresh.tech_graph.neighbourhoods.items()}
+            for question in ("machine learning projects", "duckdb pipelines"):
+                expected = fresh_rag.hybrid_search(question, top_k=5)
+                hits = rag.hybrid_search(question, top_k=5)
+                assert [hit.item["id"] for hit in hits] == [hit.item["id"] for hit in expected]
+                assert np.allclose([hit.score for hit in hits], [hit.score for hit in expected])
+            assert json.loads(rag.index_bundle.card_json("projects", projects[0]["id"])) == projects[0]
+
+            # Edited resume data: the bundle is ignored until rebuilt
+            with open(data_path, "a") as f:
+                f.write("\n")
+            assert load_index_bundle(data_path) is None
+    finally:
+        model_registry.get_embedding_model, rag_service.get_embedding_model = originals
+    print("✅ Bundled processor and RAG start without encoding and match a fresh build")
+
+
+def test_rebuild_prunes_only_bundle_arrays():
+    """A bundle written into the shared index cache leaves the embedding caches alone"""
+    with tempfile.TemporaryDirectory() as out_dir:
+        foreign = ["embeddings_3f2a.npy", "rag_vectors_0123456789abcdef.npy", "tech_vocabulary_6831c97eb47b9179.npy"]
+        for name in foreign:
+            np.save(os.path.join(out_dir, name), np.zeros(2))
+        orphan = "cards.data_0123456789ab.npy"  # Left by an interrupted build
+        np.save(os.path.join(out_dir, orphan), np.zeros(2))
+
+        first = write_bundle(out_dir, {"cards": BundlePart("k1", {"data": np.arange(3)})}, "src", "model")
+        old_file = first["arrays"]["cards.data"]["file"]
+        second = write_bundle(out_dir, {"cards": BundlePart("k2", {"data": np.arange(4)})}, "src", "model")
+        remaining = set(os.listdir(out_dir))
+        assert set(foreign) <= remaining
+        assert orphan not in remaining and old_file not in remaining
+        assert second["arrays"]["cards.data"]["file"] in remaining
+    print("✅ Rebuilding a bundle prunes its old arrays and keeps other .npy caches")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_bitsets_round_trip_through_csr()
+        test_bundle_loads_without_encoding()
+        test_rebuild_prunes_only_bundle_arrays()
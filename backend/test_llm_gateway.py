@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled LLM gateway (fake Groq endpoint, no API key or network needed)
+"""
+import sys
+import os
+import asyncio
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import llm_gateway
+from llm_gateway import LLMGateway
+
+def _completion_body(text):
+    return {
+        "id": "test", "object": "chat.completion", "created": 0, "model": "test-model",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8},
+    }
+
+def _make_gateway(delay, max_concurrency=8, timeout=5.0, tracker=None):
+    """Gateway whose HTTP calls go to an in-process fake endpoint"""
+    tracker = tracker if tracker is not None else {"active": 0, "peak": 0, "cancelled": 0}
+
+    async def handler(request):
+        tracker["active"] += 1
+        tracker["peak"] = max(tracker["peak"], tracker["active"])
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            tracker["cancelled"] += 1
+            raise
+        finally:
+            tracker["active"] -= 1
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        return httpx.Response(200, json=_completion_body(f"echo: {prompt}"))
+
+    gateway = LLMGateway(api_key="test-key", max_concurrency=max_concurrency, timeout=timeout,
+                         transport=httpx.MockTransport(handler))
+    return gateway, tracker
+
+def test_complete_returns_text_and_tokens():
+    """A completion returns stripped text and the token count"""
+    gateway, _ = _make_gateway(delay=0)
+    reply = asyncio.run(gateway.complete([{"role": "user", "content": "hi"}]))
+    assert reply.text == "echo: hi"
+    assert reply.tokens_used == 8
+    print(f"✅ Reply: {reply}")
+
+def test_timeout_cancels_request():
+    """A slow LLM call is cancelled at the timeout and other work keeps running"""
+    gateway, tracker = _make_gateway(delay=2.0)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.time()
+        try:
+            await gateway.complete([{"role": "user", "content": "slow"}], timeout=0.2)
+        except asyncio.TimeoutError:
+            elapsed = time.time() - start
+        else:
+            raise AssertionError("Expected a timeout")
+        tick_task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(run())
+    assert elapsed < 1.0
+    assert tracker["cancelled"] == 1
+    assert ticks > 5, "event loop was blocked during the LLM call"
+    print(f"✅ Timed out after {elapsed:.2f}s, loop stayed responsive ({ticks} ticks)")
+
+def test_concurrency_cap():
+    """No more than max_concurrency calls reach the API at once"""
+    gateway, tracker = _make_gateway(delay=0.05, max_concurrency=3)
+
+    async def run():
+        return await asyncio.gather(*[
+            gateway.complete([{"role": "user", "content": str(i)}]) for i in range(12)
+        ])
+
+    replies = asyncio.run(run())
+    assert len(replies) == 12
+    assert tracker["peak"] == 3
+    print(f"✅ Peak concurrency {tracker['peak']} for 12 calls")
+
+def test_new_event_loop_closes_old_client():
+    """Moving to another event loop closes the client bound to the old one"""
+    gateway, _ = _make_gateway(delay=0)
+    asyncio.run(gateway.complete([{"role": "user", "content": "first"}]))
+    first = gateway._async_client
+    reply = asyncio.run(gateway.complete([{"role": "user", "content": "second"}]))
+    assert reply.text == "echo: second" and gateway._async_client is not first
+    assert first.is_closed() and not gateway._async_client.is_closed()
+    asyncio.run(gateway.aclose())
+    print("✅ Rebinding to a new loop closes the previous client")
+
+def test_shutdown_without_gateway_creates_none():
+    """Closing at shutdown doesn't build a gateway (which would need GROQ_API_KEY) just to close it"""
+    original = llm_gateway._gateway
+    try:
+        llm_gateway._gateway = None
+        asyncio.run(llm_gateway.close_llm_gateway())
+        assert llm_gateway._gateway is None
+        gateway, _ = _make_gateway(delay=0)
+        llm_gateway._gateway = gateway
+        asyncio.run(gateway.complete([{"role": "user", "content": "hi"}]))
+        client = gateway._async_client
+        asyncio.run(llm_gateway.close_llm_gateway())
+        assert client.is_closed() and gateway._async_client is None
+    finally:
+        llm_gateway._gateway = original
+    print("✅ Shutdown closes an existing gateway only")
+
+if __name__ == "__main__":
+    test_complete_returns_text_and_tokens()
+    test_timeout_cancels_request()
+    test_concurrency_cap()
+    test_new_event_loop_closes_old_client()
+    test_shutdown_without_gateway_creates_none()
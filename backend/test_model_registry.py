@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared model registry (no real models needed)
+"""
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from model_registry import ModelRegistry
+
+def test_model_loaded_once():
+    """Concurrent callers should trigger exactly one load per (name, version)"""
+    registry = ModelRegistry()
+    load_calls = []
+
+    def slow_loader():
+        load_calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry.register("dummy", "v1", slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("dummy", "v1"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(load_calls) == 1
+    assert all(result is results[0] for result in results)
+    print("✅ Model loaded once for 8 concurrent callers")
+
+def test_versions_are_separate():
+    """Different versions of the same model are separate entries with their own stats"""
+    registry = ModelRegistry()
+    registry.register("dummy", "v1", lambda: "model-v1")
+    registry.register("dummy", "v2", lambda: "model-v2")
+
+    assert registry.get("dummy", "v1") == "model-v1"
+    assert registry.get("dummy", "v2") == "model-v2"
+    stats = registry.stats()
+    assert sorted(entry["version"] for entry in stats) == ["v1", "v2"]
+    assert all("load_time_ms" in entry and "memory_mb" in entry for entry in stats)
+    print(f"✅ Stats: {stats}")
+
+def test_unknown_model():
+    """Asking for an unregistered model is an error"""
+    registry = ModelRegistry()
+    try:
+        registry.get("missing", "v1")
+    except KeyError:
+        print("✅ Unknown model rejected")
+        return
+    raise AssertionError("Expected KeyError for unregistered model")
+
+if __name__ == "__main__":
+    test_model_loaded_once()
+    test_versions_are_separate()
+    test_unknown_model()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for int8 / float16 quantized RAG vector storage (no models needed)
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+import rag_service
+from bench_ann_index import clustered_corpus
+from quantized_index import QuantizedVectorIndex, quantize_int8
+from test_embedding_cache import CountingEncoder, RESUME_DATA
+from vector_index import VectorIndex
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # The RAG model is replaced below
+
+
+def test_recall_and_memory():
+    """Rescored int8/float16 search matches the float32 ranking at a fraction of the memory"""
+    embeddings, sections, queries = clustered_corpus(3000, dim=128, n_topics=80, n_queries=40)
+    exact = VectorIndex(embeddings, sections)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for mode, min_compression in (("int8", 3.5), ("float16", 1.9)):
+            index = QuantizedVectorIndex(embeddings, sections, mode, full_precision_path=os.path.join(cache_dir, f"{mode}.npy"))
+            stats = index.memory_stats()
+            assert stats["full_precision"] == "mmap" and stats["compression"] >= min_compression, stats
+            assert index.measure_recall(queries, top_k=10) >= 0.99
+            for hits, exact_hits in zip(index.search_batch(queries, top_k=5), exact.search_batch(queries, top_k=5)):
+                assert [row for row, _ in hits] == [row for row, _ in exact_hits]
+                assert np.allclose([score for _, score in hits], [score for _, score in exact_hits], atol=1e-5)
+            filtered = index.search(queries[0], top_k=5, min_score=-1.0, sections=["blog"])
+            assert len(filtered) == 5 and all(sections[row] == "blog" for row, _ in filtered)
+
+    no_rescore = QuantizedVectorIndex(embeddings, sections, "int8", rescore_factor=0)
+    assert no_rescore.memory_stats()["full_precision"] == "none"
+    codes, scales = quantize_int8(exact.matrix)
+    assert np.abs(codes * scales[:, None] - exact.matrix).max() <= scales.max() / 2 + 1e-6
+    print(f"✅ Quantized recall and memory: {stats}")
+
+
+def test_rag_quantization_per_instance():
+    """quantization is chosen per ResumeRAG instance and gives the float32 results"""
+    original = rag_service.get_embedding_model
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rag_service.get_embedding_model = lambda backend=None: CountingEncoder()
+            plain = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir)
+            quantized = rag_service.ResumeRAG(RESUME_DATA, cache_dir=cache_dir, quantization="int8")
+            assert isinstance(quantized.index, QuantizedVectorIndex) and not isinstance(plain.index, QuantizedVectorIndex)
+            assert quantized.embeddings is None
+            for query in ("python backend", "robotics research", "machine learning"):
+                expected = plain.semantic_search(query, min_score=0)
+                results = quantized.semantic_search(query, min_score=0)
+                assert [item for item, _ in results] == [item for item, _ in expected]
+            # Bundling a quantized instance still writes the float32 rows
+            bundled = quantized.index_bundle_parts()["rag_vectors"].arrays
+            assert bundled["matrix"].dtype == np.float32
+            assert np.allclose(bundled["matrix"], plain.index.matrix, atol=1e-6)
+            assert np.array_equal(bundled["row_ids"], plain.index.row_ids)
+    finally:
+        rag_service.get_embedding_model = original
+    print("✅ ResumeRAG int8 mode")
+
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_recall_and_memory()
+        test_rag_quantization_per_instance()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test script for the precompiled query rule engine (no models needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from resume_query_processor import ResumeQueryProcessor
+from bench_query_rules import BENCH_QUERIES, legacy_classify, engine_classify
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # Rules don't need the embedding model
+
+with embedding_model_blocked():
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+
+def test_same_decisions_as_per_pattern_search():
+    """Engine gives the same intent/highlights/follow-up/very-general answers as the old checks"""
+    queries = BENCH_QUERIES + [query.upper() for query in BENCH_QUERIES] + ["ſhow me éverything", "İn that role?"]
+    for query in queries:
+        expected = legacy_classify(processor.intent_patterns, processor.highlights_patterns, query)
+        assert engine_classify(processor, query) == expected, query
+    print(f"✅ {len(queries)} queries classified identically")
+
+def test_rule_families_reported():
+    """classify() reports every family that fired"""
+    rules = processor.rule_engine.classify("tell me more about the second project")
+    assert "followup" in rules
+    assert rules.intent_scores == {"projects": 1}
+    assert "greeting" not in processor.rule_engine.classify("tell me more").fired
+    assert processor.extract_intent("hello") == "greeting"
+    print(f"✅ Fired: {sorted(rules.fired)}")
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_same_decisions_as_per_pattern_search()
+        test_rule_families_reported()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the token-bucket rate limiter (no server needed)
+"""
+import sys
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rate_limiter import Budget, InMemoryBackend, RateLimiter, SQLiteBackend, client_ip, rate_limit_keys
+
+def _limiter(backend=None):
+    return RateLimiter([
+        Budget("text", capacity=3, refill_per_second=10, ip_multiplier=2),
+        Budget("voice", capacity=1, refill_per_second=0.01),
+        Budget("llm_tokens", capacity=100, refill_per_second=0.01),
+    ], backend=backend)
+
+def test_burst_then_refill():
+    """A bucket allows its burst, blocks, then refills over time"""
+    limiter = _limiter()
+    keys = rate_limit_keys(user_id="alice")
+    assert all(limiter.check("text", keys).allowed for _ in range(3))
+    blocked = limiter.check("text", keys)
+    assert not blocked.allowed and blocked.retry_after_s > 0
+    time.sleep(0.15)
+    assert limiter.check("text", keys).allowed
+    print("✅ Burst, block and refill")
+
+def test_new_user_ids_share_ip_bucket():
+    """Minting fresh user ids does not get around the per-IP bucket"""
+    limiter = _limiter()
+    results = [limiter.check("text", rate_limit_keys("1.2.3.4", f"user-{i}")).allowed for i in range(10)]
+    assert results.count(True) == 6  # capacity 3 x ip_multiplier 2
+    print(f"✅ IP bucket held: {results}")
+
+def test_spoofed_forwarded_for_shares_ip_bucket():
+    """Rotating X-Forwarded-For, user and session ids still drains the one IP bucket the proxy saw"""
+    limiter = _limiter()
+    results = []
+    for i in range(10):
+        request = SimpleNamespace(headers={"x-forwarded-for": f"10.0.0.{i}, 203.0.113.7"}, client=SimpleNamespace(host="10.1.1.1"))
+        results.append(limiter.check("text", rate_limit_keys(client_ip(request, 1), f"user-{i}", f"session-{i}")).allowed)
+    assert results.count(True) == 6  # capacity 3 x ip_multiplier 2
+    two_proxies = SimpleNamespace(headers={"x-forwarded-for": "6.6.6.6, 203.0.113.7, 10.0.0.2"}, client=None)
+    assert client_ip(two_proxies, 2) == "203.0.113.7"
+    direct = SimpleNamespace(headers={}, client=SimpleNamespace(host="198.51.100.4"))
+    assert client_ip(direct, 1) == "198.51.100.4"
+    assert client_ip(SimpleNamespace(headers={"x-forwarded-for": "6.6.6.6"}, client=SimpleNamespace(host="198.51.100.4")), 0) == "198.51.100.4"
+    print(f"✅ Spoofed X-Forwarded-For held to one IP bucket: {results}")
+
+def test_budgets_are_separate():
+    """Voice and LLM-token budgets don't draw from the text budget"""
+    limiter = _limiter()
+    keys = rate_limit_keys(user_id="bob")
+    assert limiter.check("voice", keys).allowed
+    assert not limiter.check("voice", keys).allowed
+    assert limiter.check("text", keys).allowed
+
+    limiter.charge("llm_tokens", keys, 150)  # spend may overdraw
+    spent = limiter.peek("llm_tokens", keys)
+    assert not spent.allowed and spent.remaining < 0
+    print("✅ Budgets independent, LLM spend tracked")
+
+def test_idle_keys_expire():
+    """Buckets that have fully refilled are dropped from memory"""
+    backend = InMemoryBackend()
+    limiter = _limiter(backend)
+    for i in range(5):
+        limiter.check("text", rate_limit_keys(user_id=f"user-{i}"))
+    assert backend.size() == 5
+    time.sleep(0.35)  # 3 tokens at 10/s -> full after 0.3s
+    limiter.check("text", rate_limit_keys(user_id="late"))
+    assert backend.size() == 1
+    print("✅ Idle buckets expired")
+
+def test_sqlite_backend_shared_between_workers():
+    """Two limiters on the same SQLite file (e.g. two uvicorn workers) share buckets"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "limits.sqlite3")
+        worker_a, worker_b = _limiter(SQLiteBackend(path)), _limiter(SQLiteBackend(path))
+        keys = rate_limit_keys(user_id="carol")
+        assert worker_a.check("voice", keys).allowed
+        assert not worker_b.check("voice", keys).allowed
+        assert worker_b.stats()["tracked_buckets"] == 1
+    print("✅ SQLite buckets shared")
+
+if __name__ == "__main__":
+    test_burst_then_refill()
+    test_new_user_ids_share_ip_bucket()
+    test_spoofed_forwarded_for_shares_ip_bucket()
+    test_budgets_are_separate()
+    test_idle_keys_expire()
+    test_sqlite_backend_shared_between_workers()
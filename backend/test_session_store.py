@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the conversation session store (no LLM needed)
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from session_store import SessionStore
+
+class FakeConversation:
+    def __init__(self):
+        self.chat_history = [{"role": "system", "content": "prompt"}]
+
+def test_hit_and_miss():
+    """Known ids are reused, unknown ids are created (or replaced)"""
+    store = SessionStore(FakeConversation, ttl_seconds=60, max_entries=10)
+    session_id, conversation = store.get_or_create("abc")
+    assert session_id == "abc"
+    assert store.get_or_create("abc")[1] is conversation
+
+    new_id, _ = store.get_or_create("unknown", keep_unknown_id=False)
+    assert new_id != "unknown" and new_id in store
+
+    stats = store.stats()
+    assert stats["hits"] == 1 and stats["created"] == 2
+    print(f"✅ Stats: {stats}")
+
+def test_lru_eviction_by_entries():
+    """Least recently used session goes first when the entry budget is exceeded"""
+    store = SessionStore(FakeConversation, ttl_seconds=60, max_entries=2)
+    store.create("a")
+    store.create("b")
+    store.get("a")  # "b" is now the least recently used
+    store.create("c")
+
+    assert "a" in store and "c" in store and "b" not in store
+    assert store.stats()["evicted"] == 1
+    print("✅ LRU session evicted")
+
+def test_byte_budget():
+    """Sessions with large chat histories are evicted to stay within the byte budget"""
+    store = SessionStore(FakeConversation, ttl_seconds=60, max_entries=100, max_bytes=50_000)
+    _, first = store.create("big")
+    first.chat_history.append({"role": "user", "content": "x" * 60_000})
+    store.create("small")
+    store.get("small")  # "big" is now the least recently used
+    store.reap_expired()  # re-measures every session and enforces the budget
+
+    assert "big" not in store and "small" in store
+    assert store.stats()["total_bytes"] <= 50_000
+    print("✅ Byte budget enforced")
+
+def test_ttl_expiry_and_reaper():
+    """Idle sessions expire and are removed by the background reaper"""
+    store = SessionStore(FakeConversation, ttl_seconds=0.1, max_entries=10, reap_interval_seconds=0.05)
+    store.create("idle")
+    store.start_background_reaper()
+    try:
+        time.sleep(0.4)
+        assert len(store) == 0
+        assert store.stats()["expired"] == 1
+    finally:
+        store.stop_background_reaper()
+    print("✅ Idle session reaped")
+
+if __name__ == "__main__":
+    test_hit_and_miss()
+    test_lru_eviction_by_entries()
+    test_byte_budget()
+    test_ttl_expiry_and_reaper()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the precomputed tech vocabulary embedding matrix (no models needed)
+"""
+import sys
+import os
+import tempfile
+import zlib
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from tech_embeddings import TechEmbeddingIndex
+
+VOCABULARY = ["python", "pytorch", "tensorflow", "react", "javascript", "typescript", "postgresql",
+              "mongodb", "docker", "kubernetes", "fastapi", "flask", "machine learning", "deep learning"]
+
+
+class TrigramEncoder:
+    """Deterministic stand-in for MiniLM: hashed character trigram counts"""
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, show_progress_bar=False):
+        self.calls += 1
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            padded = f"  {text.lower()} "
+            for i in range(len(padded) - 2):
+                vectors[row, zlib.crc32(padded[i:i + 3].encode()) % 64] += 1
+        return vectors
+
+
+def reference_similar(encoder, vocabulary, tech, top_k=3):
+    """The old implementation: re-encode everything, cosine, argsort"""
+    query = encoder.encode([tech]).astype(np.float64)[0]
+    matrix = encoder.encode(vocabulary).astype(np.float64)
+    similarities = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    similar_indices = similarities.argsort()[-top_k:][::-1]
+    return [vocabulary[i] for i in similar_indices if similarities[i] > 0.3]
+
+
+def test_same_neighbours_as_full_cosine():
+    """Matrix-vector + argpartition ranks exactly like cosine_similarity + argsort"""
+    encoder = TrigramEncoder()
+    index = TechEmbeddingIndex(VOCABULARY, encoder)
+    for tech in ["pytorh", "tensor flow", "react native", "postgres", "kubectl", "golang", "nextjs"]:
+        for top_k in (1, 3, 5):
+            names = [name for name, _ in index.most_similar(tech, top_k=top_k)]
+            assert names == reference_similar(encoder, VOCABULARY, tech, top_k), (tech, top_k)
+    assert index.matrix.dtype == np.float32 and index.matrix.flags["C_CONTIGUOUS"]
+    assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0, atol=1e-5)
+    print("✅ Neighbours identical to the full cosine scan")
+
+
+def test_persisted_matrix_and_lru():
+    """Second start loads the .npy instead of encoding; repeated unknown terms hit the LRU"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first = TechEmbeddingIndex(VOCABULARY, TrigramEncoder(), model_id="fake@1", cache_dir=cache_dir)
+        encoder = TrigramEncoder()
+        second = TechEmbeddingIndex(VOCABULARY, encoder, model_id="fake@1", cache_dir=cache_dir)
+        assert second.stats["loaded_from_disk"] and encoder.calls == 0
+        assert np.array_equal(first.matrix, second.matrix)
+        other_model = TechEmbeddingIndex(VOCABULARY, TrigramEncoder(), model_id="fake@2", cache_dir=cache_dir)
+        assert not other_model.stats["loaded_from_disk"]
+
+        lru = TechEmbeddingIndex(VOCABULARY, encoder, model_id="fake@1", cache_dir=cache_dir, lru_size=2)
+        for term in ["golang", "golang", "rust", "zig", "golang"]:
+            lru.most_similar(term)
+        assert lru.query_cache.stats()["hits"] == 1 and encoder.calls == 4 and len(lru.query_cache) == 2
+    print("✅ Matrix persisted and unknown terms cached")
+
+
+if __name__ == "__main__":
+    test_same_neighbours_as_full_cosine()
+    test_persisted_matrix_and_lru()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled tech similarity graph (no models needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from resume_query_processor import ResumeQueryProcessor
+from tech_graph import TechSimilarityGraph, broad_category_fallback
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # Only resume data is needed
+
+with embedding_model_blocked():
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+
+def legacy_similar(tech):
+    """The old get_similar_technologies_hybrid without a model: curated list, then broad categories"""
+    if tech.lower() in processor.tech_similarity:
+        return processor.tech_similarity[tech.lower()]
+    return broad_category_fallback(tech)
+
+def test_same_suggestions_and_postings():
+    """Precomputed neighbourhoods give the old suggestions and exactly the items filter_by_technology finds"""
+    terms = sorted(processor.tech_similarity) + sorted(processor.tech_mappings) + \
+        ["React", "frontend stuff", "nosql db", "golang", "AI agents", "cobol"]
+    for tech in terms:
+        neighbourhood = processor.get_tech_neighbourhood(tech)
+        assert neighbourhood.similar == legacy_similar(tech), tech
+        for section, items in processor.resume_data.items():
+            if not isinstance(items, list):
+                continue
+            expected = processor.filter_by_technology(items, neighbourhood.similar) if neighbourhood.similar else []
+            assert processor.tech_index.items_at(section, neighbourhood.postings.get(section, 0)) == expected, (tech, section)
+    print(f"✅ {len(terms)} techs: suggestions and postings identical")
+
+def test_weighted_edges_and_multi_hop():
+    """Curated rank, shared aliases and embedding neighbours all become weighted edges"""
+    graph = TechSimilarityGraph(
+        {"react": ["javascript", "frontend"], "javascript": ["typescript"]},
+        {"react": ["react", "jsx"], "nextjs": ["next", "jsx"], "golang": ["go"]},
+        neighbours_fn=lambda terms: {term: [("rust", 0.8)] if term == "golang" else [] for term in terms},
+    )
+    assert graph.edges["react"]["javascript"] == 1.0 and graph.edges["react"]["frontend"] == 0.9
+    assert graph.edges["react"]["nextjs"] == graph.edges["nextjs"]["react"] == 1 / 3
+    assert graph.lookup("golang").source == "semantic" and graph.lookup("golang").similar == ["rust"]
+    assert graph.lookup("React").similar == ["javascript", "frontend"]
+    assert dict(graph.lookup("react").neighbours)["typescript"] == 0.5  # 1.0 * 1.0 * HOP_DECAY
+    assert [other for other, _ in graph.lookup("react").neighbours][:3] == ["javascript", "frontend", "typescript"]
+    assert graph.lookup("unheard-of") is None
+    print("✅ Weighted edges and multi-hop neighbourhoods")
+
+def test_rag_expansion_uses_ranked_neighbours():
+    """RAG fallback expansions follow the multi-hop scores, reaching past the curated list"""
+    go = processor.get_tech_neighbourhood("go")
+    assert go.similar == ["python", "backend"]
+    ranked = [other for other, _ in go.neighbours]
+    assert ranked[:2] == go.similar and len(ranked) > 2  # 2-hop neighbours of python/backend
+    assert processor.rag_expansion_terms("go", go) == ["go"] + ranked[:processor.RAG_EXPANSION_NEIGHBOURS]
+    assert processor.rag_expansion_terms("nosql db", processor.get_tech_neighbourhood("nosql db")) == ["nosql db", "database", "mongodb"]
+    assert processor.rag_expansion_terms("cobol", processor.get_tech_neighbourhood("cobol")) == ["cobol"]
+    print("✅ RAG expansion terms come from the ranked multi-hop neighbourhood")
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_same_suggestions_and_postings()
+        test_weighted_edges_and_multi_hop()
+        test_rag_expansion_uses_ranked_neighbours()
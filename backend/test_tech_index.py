@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script for the inverted tech -> item index (no models needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from resume_query_processor import ResumeQueryProcessor
+from bench_tech_index import filter_workload, legacy_filter, synthetic_corpus
+from tech_index import TechItemIndex
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # Only tech_mappings is needed
+
+with embedding_model_blocked():
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+
+def test_same_items_as_per_item_loops():
+    """Every canonical tech plus odd filters give the old results, for sections, copies and mixes"""
+    filters = [[tech] for tech in processor.tech_mappings] + [["Go"], ["PyTorch"], ["c++"], ["nitigya"], ["x"], ["go", "database"]]
+    sections = [processor.resume_data[name] for name in ("projects", "experience", "publications", "blog", "education")]
+    tagged = [processor._tag_items(items, "projects") for items in sections]
+    mixed = [item for items in tagged for item in items] + [{"id": "foreign", "title": "Go service", "technologies": ["Redis"]}]
+    for tech_filters in filters:
+        for items in sections + tagged + [mixed]:
+            assert processor.filter_by_technology(items, tech_filters) == legacy_filter(processor.tech_mappings, items, tech_filters), tech_filters
+    print(f"✅ {len(filters)} filters matched identically")
+
+def test_synthetic_corpus():
+    """Canonical postings built from alias hits agree with the old loops on a generated corpus"""
+    corpus = synthetic_corpus(processor.tech_mappings, 200)
+    index = TechItemIndex(corpus, processor.tech_mappings)
+    for tech_filters in filter_workload(processor.tech_mappings, count=60):
+        for items in corpus.values():
+            assert index.filter(items, tech_filters) == legacy_filter(processor.tech_mappings, items, tech_filters), tech_filters
+    print("✅ Synthetic corpus matched identically")
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_same_items_as_per_item_loops()
+        test_synthetic_corpus()
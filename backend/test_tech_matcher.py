@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script for the Aho-Corasick tech matcher (no models needed)
+"""
+import sys
+import os
+import random
+import re
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from tech_matcher import AhoCorasick, TechMatcher
+from bench_tech_matcher import REALISTIC_QUERIES, adversarial_queries, legacy_exact_pass, matcher_exact_pass
+from conftest import embedding_model_blocked
+
+pytestmark = pytest.mark.usefixtures("no_embedding_model")  # Only tech_mappings is needed
+
+def test_whole_word_matches_regex_boundaries():
+    """find_whole_words agrees with re.search(r'\\bword\\b') - including aliases with symbols"""
+    patterns = ["c++", "c", "go", "node.js", ".net", "ci/cd", "a", "aa", "_init", "ré", "x y"]
+    automaton = AhoCorasick(patterns)
+    alphabet = ["c", "+", "g", "o", " ", ".", "n", "e", "t", "a", "_", "i", "/", "d", "é", "r", "x", "y", "s", "j"]
+    rng = random.Random(0)
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+        expected = {i for i, p in enumerate(automaton.patterns) if re.search(r'\b' + re.escape(p) + r'\b', text)}
+        assert automaton.find_whole_words(text) == expected, text
+    print("✅ Word boundaries identical to regex on 3000 random strings")
+
+def test_same_techs_as_per_alias_search():
+    """Matcher finds the same canonical techs, in the same order, as the old loop"""
+    from resume_query_processor import ResumeQueryProcessor
+    processor = ResumeQueryProcessor(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_data.json"))
+    matcher = TechMatcher(processor.tech_mappings)
+    queries = [query.lower() for query in REALISTIC_QUERIES] + adversarial_queries(processor.tech_mappings)
+    for query in queries:
+        assert matcher_exact_pass(matcher, query) == legacy_exact_pass(processor.tech_mappings, query), query[:80]
+    print(f"✅ {len(queries)} queries matched identically")
+
+if __name__ == "__main__":
+    with embedding_model_blocked():
+        test_whole_word_matches_regex_boundaries()
+        test_same_techs_as_per_alias_search()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test script for VAD model loading (no real model or network needed)
+"""
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+vad_service = pytest.importorskip("vad_service", reason="torch / soundfile not installed")
+
+def test_failed_load_is_not_retried_per_request():
+    """An offline torch.hub load fails once, then VAD is skipped until the retry time passes"""
+    calls = []
+
+    def failing_loader():
+        calls.append(1)
+        raise OSError("torch.hub offline")
+
+    original = (vad_service.get_vad_model, vad_service._vad_retry_at)
+    try:
+        vad_service.get_vad_model = failing_loader
+        vad_service._vad_retry_at = 0.0
+        silence = np.zeros(vad_service.SAMPLE_RATE, dtype=np.float32)
+        for _ in range(5):
+            assert vad_service.analyze_audio_data(silence) is True  # Speech assumed without VAD
+        assert len(calls) == 1
+
+        model = object()
+        vad_service.get_vad_model = lambda: (model, None)
+        assert vad_service.load_vad_model() is None  # Still backing off
+        vad_service._vad_retry_at = 0.0  # Retry time reached
+        assert vad_service.load_vad_model() is model
+    finally:
+        vad_service.get_vad_model, vad_service._vad_retry_at = original
+    print("✅ Failed VAD load backs off instead of retrying every request")
+
+if __name__ == "__main__":
+    test_failed_load_is_not_retried_per_request()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the normalized, section-partitioned RAG vector index (no models needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from vector_index import VectorIndex
+
+SECTIONS = ["projects", "experience", "publications", "education"]
+
+
+def legacy_search(embeddings, sections, query, top_k, min_score, section_filter=None):
+    """The old semantic_search ranking: cosine, full argsort, 2x over-fetch, filter afterwards"""
+    similarities = np.dot(embeddings, query) / (np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query))
+    results = []
+    for idx in np.argsort(similarities)[::-1][:top_k * 2]:
+        if similarities[idx] < min_score or (section_filter and sections[idx] not in section_filter):
+            continue
+        results.append(int(idx))
+        if len(results) >= top_k:
+            break
+    return results
+
+
+def corpus(size=400, dim=32, seed=3):
+    rng = np.random.default_rng(seed)
+    sections = [SECTIONS[i] for i in rng.choice(4, size=size, p=[0.6, 0.3, 0.08, 0.02])]
+    return rng.normal(size=(size, dim)).astype(np.float32), sections, rng.normal(size=(20, dim)).astype(np.float32)
+
+
+def test_same_ranking_without_filter():
+    """Unfiltered results match the old argsort path, for single and batched queries"""
+    embeddings, sections, queries = corpus()
+    index = VectorIndex(embeddings, sections)
+    batched = index.search_batch(queries, top_k=8, min_score=0.1)
+    for query, batch_hits in zip(queries, batched):
+        hits = index.search(query, top_k=8, min_score=0.1)
+        assert [row for row, _ in hits] == [row for row, _ in batch_hits]
+        assert np.allclose([score for _, score in hits], [score for _, score in batch_hits], atol=1e-6)
+        assert [row for row, _ in hits] == legacy_search(embeddings, sections, query, 8, 0.1)
+        cosine = embeddings @ query / (np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query))
+        assert all(abs(score - cosine[row]) < 1e-5 for row, score in hits)
+    assert index.matrix.dtype == np.float32 and index.matrix.flags["C_CONTIGUOUS"]
+    print("✅ Same ranking as the full cosine scan")
+
+
+def test_restrictive_filter_returns_top_k():
+    """A rare-section filter still fills top_k (the old over-fetch could come back short)"""
+    embeddings, sections, queries = corpus()
+    index = VectorIndex(embeddings, sections)
+    wanted = ["publications", "education"]
+    rows = [row for row, section in enumerate(sections) if section in wanted]
+    short = 0
+    for query in queries:
+        hits = index.search(query, top_k=5, min_score=-1.0, sections=wanted)
+        cosine = embeddings[rows] @ query / (np.linalg.norm(embeddings[rows], axis=1) * np.linalg.norm(query))
+        assert [row for row, _ in hits] == [rows[i] for i in np.argsort(-cosine, kind="stable")[:5]]
+        short += len(legacy_search(embeddings, sections, query, 5, -1.0, wanted)) < 5
+    assert short > 0 and index.search(queries[0], sections=["talks"]) == []
+    print(f"✅ Filtered queries return full top_k (old path came back short on {short}/{len(queries)})")
+
+
+if __name__ == "__main__":
+    test_same_ranking_without_filter()
+    test_restrictive_filter_returns_top_k()
@@ -3,21 +3,7 @@ import os
 import tempfile
 import soundfile as sf
 import numpy as np
-from faster_whisper import WhisperModel
-
-# Global model instance (lazy loaded)
-_whisper_model = None
-
-def get_whisper_model():
-    """Lazy load Whisper model to save memory on startup"""
-    global _whisper_model
-    if _whisper_model is None:
-        # Use smaller models for production deployment
-        model_size = "tiny" if os.environ.get("ENVIRONMENT") == "production" else "base"
-        print(f"Loading Whisper model ({model_size})...")
-        _whisper_model = WhisperModel(model_size, device="cpu", compute_type="int8")
-        print("Whisper model loaded successfully")
-    return _whisper_model
+from model_registry import get_whisper_model  # Lazy loaded once per process (tiny in production)
 
 def transcribe_audio(audio_np):
     """Transcribe audio data to text"""
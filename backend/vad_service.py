@@ -1,10 +1,12 @@
 # vad_service.py
+import os
+import time
 import torch
-import torch.hub
 import numpy as np
 import queue
 import threading
 import soundfile as sf
+from model_registry import get_vad_model
 
 # Optional import for live microphone (not needed for web deployment)
 try:
@@ -21,20 +23,26 @@ SAMPLE_RATE = 16000
 BLOCK_DURATION = 0.25  # seconds
 VAD_THRESHOLD = 0.5
 VAD_SILENCE_CHUNKS = 5  # Number of silent chunks to consider speech ended
-
-print("Loading Silero VAD...")
-try:
-    vad_model, utils = torch.hub.load("snakers4/silero-vad", "silero_vad", trust_repo=True)
-    print("VAD model loaded successfully")
-    VAD_MODEL_LOADED = True
-except Exception as e:
-    print(f"Warning: Failed to load VAD model: {e}")
-    print("VAD analysis will be skipped")
-    vad_model = None
-    utils = None
-    VAD_MODEL_LOADED = False
+VAD_LOAD_RETRY_S = float(os.getenv("VAD_LOAD_RETRY_S", "300"))  # After a failed load, skip VAD this long before retrying
 
 audio_queue = queue.Queue()
+_vad_retry_at = 0.0  # time.monotonic() before which a failed load isn't retried
+
+def load_vad_model():
+    """Get the shared Silero VAD model from the model registry (None if it can't be loaded).
+    A failed load (e.g. torch.hub offline) is remembered for VAD_LOAD_RETRY_S, so requests
+    don't each hit the network again."""
+    global _vad_retry_at
+    if time.monotonic() < _vad_retry_at:
+        return None
+    try:
+        model, _ = get_vad_model()
+        return model
+    except Exception as e:
+        _vad_retry_at = time.monotonic() + VAD_LOAD_RETRY_S
+        print(f"Warning: Failed to load VAD model: {e}")
+        print(f"VAD analysis will be skipped (next load attempt in {VAD_LOAD_RETRY_S:.0f}s)")
+        return None
 
 def audio_callback(indata, frames, time, status):
     """Callback for sounddevice to capture audio"""
@@ -47,6 +55,10 @@ def record_until_silence():
     if not SOUNDDEVICE_AVAILABLE:
         raise RuntimeError("sounddevice not available - cannot record from microphone. Use file upload instead.")
     
+    vad_model = load_vad_model()
+    if vad_model is None:
+        raise RuntimeError("VAD model not available - cannot detect end of speech")
+    
     silence_count = 0
     recording = []
     started = False
@@ -96,7 +108,8 @@ def record_until_silence():
 # Test function
 def analyze_audio_data(audio_data, sample_rate=SAMPLE_RATE):
     """Analyze audio data for voice activity (for frontend integration)"""
-    if not VAD_MODEL_LOADED:
+    vad_model = load_vad_model()
+    if vad_model is None:
         print("VAD model not loaded, skipping analysis")
         return True  # Assume speech present if VAD unavailable
     
@@ -0,0 +1,93 @@
+"""
+Vector Index - Pre-normalized, section-partitioned embedding matrix for RAG search
+Rows are L2-normalized once into a contiguous float32 matrix and grouped by section, so
+every section is a contiguous slice. A query (or a batch of queries) is one matrix
+product over the requested sections plus argpartition for the top-k.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from tech_embeddings import l2_normalize
+
+SearchHit = Tuple[int, float]  # (row in the original item order, cosine score)
+
+
+class VectorIndex:
+    """Exact cosine search restricted to any subset of sections"""
+
+    def __init__(self, embeddings: np.ndarray, sections: List[str]):
+        """embeddings[i] belongs to sections[i]"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(sections):
+            raise ValueError(f"Expected one embedding row per item, got {embeddings.shape} for {len(sections)} items")
+
+        # Stable grouping keeps the original item order inside each section
+        section_order = list(dict.fromkeys(sections))
+        rank = {section: i for i, section in enumerate(section_order)}
+        order = sorted(range(len(sections)), key=lambda row: rank[sections[row]])
+        self.row_ids = np.asarray(order, dtype=np.int64)
+        self.matrix = l2_normalize(embeddings[self.row_ids]) if len(order) else np.zeros((0, embeddings.shape[1]), dtype=np.float32)
+        self.dim = int(embeddings.shape[1])
+
+        self.ranges: Dict[str, Tuple[int, int]] = {}
+        start = 0
+        for section in section_order:
+            end = start + sum(1 for name in sections if name == section)
+            self.ranges[section] = (start, end)
+            start = end
+
+    def to_bundle(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """(arrays, metadata) for the index bundle"""
+        return {"matrix": self.matrix, "row_ids": self.row_ids}, {"ranges": {name: list(span) for name, span in self.ranges.items()}}
+
+    @classmethod
+    def from_bundle(cls, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> "VectorIndex":
+        """Index over already normalized, section-grouped rows (the matrix stays memory-mapped)"""
+        matrix = arrays["matrix"]
+        index = cls(np.zeros((0, matrix.shape[1]), dtype=np.float32), [])
+        index.matrix = matrix
+        index.row_ids = np.asarray(arrays["row_ids"], dtype=np.int64)
+        index.ranges = {name: (int(start), int(end)) for name, (start, end) in meta["ranges"].items()}
+        return index
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def _slices(self, sections: Optional[Iterable[str]]) -> List[Tuple[int, int]]:
+        """Row ranges to score ([] section filter = everything, like the old search)"""
+        if not sections:
+            return [(0, len(self))]
+        wanted = set(sections)
+        return [span for section, span in self.ranges.items() if section in wanted and span[1] > span[0]]
+
+    def search(self, query: np.ndarray, top_k: int = 10, min_score: float = 0.3,
+               sections: Optional[Iterable[str]] = None) -> List[SearchHit]:
+        """Top-k rows for one query vector, best first"""
+        return self.search_batch(np.asarray(query)[None, :], top_k, min_score, sections)[0]
+
+    def search_batch(self, queries: np.ndarray, top_k: int = 10, min_score: float = 0.3,
+                     sections: Optional[Iterable[str]] = None) -> List[List[SearchHit]]:
+        """Top-k rows for each query vector (one matrix product for the whole batch)"""
+        queries = l2_normalize(np.atleast_2d(queries))
+        spans = self._slices(sections)
+        if not spans or top_k <= 0 or len(self) == 0:
+            return [[] for _ in range(len(queries))]
+        scores, ids = self._score(queries, spans)
+        return [self._top_hits(row_scores, ids, top_k, min_score) for row_scores in scores]
+
+    def _score(self, queries: np.ndarray, spans: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine of each (normalized) query against the rows in spans, plus those rows' item ids"""
+        if len(spans) == 1:
+            start, end = spans[0]
+            return queries @ self.matrix[start:end].T, self.row_ids[start:end]
+        candidates = np.concatenate([self.matrix[start:end] for start, end in spans])
+        return queries @ candidates.T, np.concatenate([self.row_ids[start:end] for start, end in spans])
+
+    @staticmethod
+    def _top_hits(scores: np.ndarray, ids: np.ndarray, top_k: int, min_score: float) -> List[SearchHit]:
+        """Best top_k (id, score) pairs above min_score: score desc, then item order"""
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        ranked = top[np.lexsort((ids[top], -scores[top]))]
+        return [(int(ids[i]), float(scores[i])) for i in ranked if scores[i] >= min_score]